@@ -0,0 +1,350 @@
+"""Forward-mode automatic differentiation with dual and hyper-dual numbers
+
+A dual number x + x' e (e**2 = 0) carries the exact derivative along with the value,
+so f(Dual(x, 1)) gives f(x) and f'(x) in one evaluation of f, without truncation or cancellation errors.
+The derivative part may be a tuple (one component per seed),
+so that a whole gradient is obtained in one pass, see `gradient`.
+A hyper-dual number x + x1 e1 + x2 e2 + x12 e1 e2 (e1**2 = e2**2 = 0) carries the second derivative as well.
+
+f should be written with the arithmetic operators and the functions of this module
+(sqrt, exp, log, sin, ...) instead of those of `math`, which fall back to `math` for plain numbers.
+Functions of `math` raise TypeError on dual numbers instead of silently dropping the derivatives.
+"""
+import math
+from numbers import Number
+from typing import Any, Callable, List, Sequence, Tuple, Union
+
+class Dual:
+    """Dual number value + grad * e, where grad is a tuple of derivatives with respect to the seeds"""
+    __slots__ = ("value", "grad")
+
+    def __init__(self, value: Number, grad: Union[Number, Sequence[Number]] = 0.):
+        """
+        Args:
+            value (Number): the real part
+            grad (Number | Sequence[Number], optional): the derivative(s). Defaults to 0..
+        """
+        self.value = value
+        self.grad = (grad,) if isinstance(grad, Number) else tuple(grad)
+
+    @property
+    def derivative(self) -> Number:
+        """The derivative with respect to the first seed"""
+        return self.grad[0]
+
+    def __repr__(self):
+        if len(self.grad) == 1:
+            return "Dual({}, {})".format(self.value, self.grad[0])
+        return "Dual({}, {})".format(self.value, self.grad)
+
+    def _chain(self, f0: Callable, f1: Callable, f2: Callable) -> "Dual":
+        v = self.value
+        d = f1(v)
+        return Dual(f0(v), tuple(d * g for g in self.grad))
+
+    def _grads(self, other: "Dual") -> Tuple[tuple, tuple]:
+        """The gradients of self and other with a common length. 
+            A 1-component gradient (e.g. of a constant Dual(c)) is padded with zeros.
+
+        Raises:
+            ValueError: raised when the gradients have different lengths, neither of which is 1.
+        """
+        g, h = self.grad, other.grad
+        if len(g) != len(h):
+            if len(g) == 1:
+                g += (0.,) * (len(h) - 1)
+            elif len(h) == 1:
+                h += (0.,) * (len(g) - 1)
+            else:
+                raise ValueError("Gradients of lengths {} and {} cannot be combined.".format(len(g), len(h)))
+        return g, h
+
+    def __add__(self, other):
+        if isinstance(other, Dual):
+            return Dual(self.value + other.value, tuple(g + h for g, h in zip(*self._grads(other))))
+        if isinstance(other, HyperDual):
+            return NotImplemented
+        return Dual(self.value + other, self.grad)
+
+    def __radd__(self, other):
+        return Dual(other + self.value, self.grad)
+
+    def __sub__(self, other):
+        if isinstance(other, Dual):
+            return Dual(self.value - other.value, tuple(g - h for g, h in zip(*self._grads(other))))
+        if isinstance(other, HyperDual):
+            return NotImplemented
+        return Dual(self.value - other, self.grad)
+
+    def __rsub__(self, other):
+        return Dual(other - self.value, tuple(-g for g in self.grad))
+
+    def __mul__(self, other):
+        if isinstance(other, Dual):
+            a, b = self.value, other.value
+            return Dual(a * b, tuple(g * b + a * h for g, h in zip(*self._grads(other))))
+        if isinstance(other, HyperDual):
+            return NotImplemented
+        return Dual(self.value * other, tuple(g * other for g in self.grad))
+
+    def __rmul__(self, other):
+        return Dual(other * self.value, tuple(other * g for g in self.grad))
+
+    def __truediv__(self, other):
+        if isinstance(other, Dual):
+            a, b = self.value, other.value
+            return Dual(a / b, tuple((g * b - a * h) / b**2 for g, h in zip(*self._grads(other))))
+        if isinstance(other, HyperDual):
+            return NotImplemented
+        return Dual(self.value / other, tuple(g / other for g in self.grad))
+
+    def __rtruediv__(self, other):
+        b = self.value
+        return Dual(other / b, tuple(-other * g / b**2 for g in self.grad))
+
+    def __pow__(self, p):
+        if isinstance(p, Dual):
+            return exp(p * log(self))
+        if isinstance(p, HyperDual):
+            return NotImplemented
+        if p == 0:
+            return Dual(self.value ** 0, tuple(0. for _ in self.grad))
+        v = self.value
+        d = p * v ** (p - 1)
+        return Dual(v ** p, tuple(d * g for g in self.grad))
+
+    def __rpow__(self, a):
+        a_v = a ** self.value
+        d = a_v * math.log(a)
+        return Dual(a_v, tuple(d * g for g in self.grad))
+
+    def __neg__(self):
+        return Dual(-self.value, tuple(-g for g in self.grad))
+
+    def __pos__(self):
+        return self
+
+    def __abs__(self):
+        return -self if self.value < 0 else self
+
+    def __bool__(self):
+        return bool(self.value)
+
+    def __eq__(self, other):
+        return self.value == _value(other)
+
+    def __ne__(self, other):
+        return self.value != _value(other)
+
+    def __lt__(self, other):
+        return self.value < _value(other)
+
+    def __le__(self, other):
+        return self.value <= _value(other)
+
+    def __gt__(self, other):
+        return self.value > _value(other)
+
+    def __ge__(self, other):
+        return self.value >= _value(other)
+
+    def __hash__(self):
+        return hash(self.value)
+
+class HyperDual:
+    """Hyper-dual number real + eps1 e1 + eps2 e2 + eps12 e1 e2, where e1**2 = e2**2 = 0.
+        Seeded with HyperDual(x, 1, 1, 0), f gives f(x), f'(x) (in eps1 and eps2) and f''(x) (in eps12).
+
+    Reference:
+    J. A. Fike and J. J. Alonso, The development of hyper-dual numbers for exact second-derivative calculations,
+    AIAA 2011-886 (2011).
+    """
+    __slots__ = ("real", "eps1", "eps2", "eps12")
+
+    def __init__(self, real: Number, eps1: Number = 0., eps2: Number = 0., eps12: Number = 0.):
+        self.real = real
+        self.eps1 = eps1
+        self.eps2 = eps2
+        self.eps12 = eps12
+
+    def __repr__(self):
+        return "HyperDual({}, {}, {}, {})".format(self.real, self.eps1, self.eps2, self.eps12)
+
+    def _chain(self, f0: Callable, f1: Callable, f2: Callable) -> "HyperDual":
+        v = self.real
+        d1 = f1(v)
+        return HyperDual(f0(v), d1 * self.eps1, d1 * self.eps2, d1 * self.eps12 + f2(v) * self.eps1 * self.eps2)
+
+    @staticmethod
+    def _lift(other) -> "HyperDual":
+        if isinstance(other, HyperDual):
+            return other
+        if isinstance(other, Dual):
+            raise TypeError("Cannot mix Dual and HyperDual.")
+        return HyperDual(other)
+
+    def __add__(self, other):
+        other = HyperDual._lift(other)
+        return HyperDual(self.real + other.real, self.eps1 + other.eps1,
+                         self.eps2 + other.eps2, self.eps12 + other.eps12)
+
+    def __radd__(self, other):
+        return self + other
+
+    def __sub__(self, other):
+        return self + (-HyperDual._lift(other))
+
+    def __rsub__(self, other):
+        return (-self) + other
+
+    def __mul__(self, other):
+        o = HyperDual._lift(other)
+        return HyperDual(
+            self.real * o.real,
+            self.real * o.eps1 + self.eps1 * o.real,
+            self.real * o.eps2 + self.eps2 * o.real,
+            self.real * o.eps12 + self.eps1 * o.eps2 + self.eps2 * o.eps1 + self.eps12 * o.real)
+
+    def __rmul__(self, other):
+        return self * other
+
+    def _reciprocal(self) -> "HyperDual":
+        return self._chain(lambda v: 1 / v, lambda v: -1 / v**2, lambda v: 2 / v**3)
+
+    def __truediv__(self, other):
+        if not isinstance(other, (HyperDual, Dual)):
+            return HyperDual(self.real / other, self.eps1 / other, self.eps2 / other, self.eps12 / other)
+        return self * HyperDual._lift(other)._reciprocal()
+
+    def __rtruediv__(self, other):
+        return self._reciprocal() * other
+
+    def __pow__(self, p):
+        if isinstance(p, (HyperDual, Dual)):
+            return exp(p * log(self))
+        if p == 0:
+            return HyperDual(self.real ** 0)
+        return self._chain(lambda v: v ** p, lambda v: p * v ** (p - 1), lambda v: p * (p - 1) * v ** (p - 2))
+
+    def __rpow__(self, a):
+        log_a = math.log(a)
+        return self._chain(lambda v: a ** v, lambda v: a ** v * log_a, lambda v: a ** v * log_a**2)
+
+    def __neg__(self):
+        return HyperDual(-self.real, -self.eps1, -self.eps2, -self.eps12)
+
+    def __pos__(self):
+        return self
+
+    def __abs__(self):
+        return -self if self.real < 0 else self
+
+    def __bool__(self):
+        return bool(self.real)
+
+    def __eq__(self, other):
+        return self.real == _value(other)
+
+    def __ne__(self, other):
+        return self.real != _value(other)
+
+    def __lt__(self, other):
+        return self.real < _value(other)
+
+    def __le__(self, other):
+        return self.real <= _value(other)
+
+    def __gt__(self, other):
+        return self.real > _value(other)
+
+    def __ge__(self, other):
+        return self.real >= _value(other)
+
+    def __hash__(self):
+        return hash(self.real)
+
+# Dual numbers take the scalar branches of the other modules (e.g. `isinstance(y, Number)` in ODE)
+Number.register(Dual)
+Number.register(HyperDual)
+
+def _value(x: Any) -> Number:
+    """The real part of a (hyper-)dual number, or the number itself"""
+    if isinstance(x, Dual):
+        return x.value
+    if isinstance(x, HyperDual):
+        return x.real
+    return x
+
+def _lift(f0: Callable, f1: Callable, f2: Callable, doc: str) -> Callable:
+    def func(x):
+        if isinstance(x, (Dual, HyperDual)):
+            return x._chain(f0, f1, f2)
+        return f0(x)
+    func.__doc__ = doc
+    return func
+
+sqrt = _lift(math.sqrt, lambda v: 0.5 / math.sqrt(v), lambda v: -0.25 / v**1.5, "Square root")
+exp = _lift(math.exp, math.exp, math.exp, "Exponential")
+log = _lift(math.log, lambda v: 1 / v, lambda v: -1 / v**2, "Natural logarithm")
+sin = _lift(math.sin, math.cos, lambda v: -math.sin(v), "Sine")
+cos = _lift(math.cos, lambda v: -math.sin(v), lambda v: -math.cos(v), "Cosine")
+tan = _lift(math.tan, lambda v: 1 / math.cos(v)**2, lambda v: 2 * math.tan(v) / math.cos(v)**2, "Tangent")
+asin = _lift(math.asin, lambda v: 1 / math.sqrt(1 - v*v), lambda v: v / (1 - v*v)**1.5, "Arc sine")
+acos = _lift(math.acos, lambda v: -1 / math.sqrt(1 - v*v), lambda v: -v / (1 - v*v)**1.5, "Arc cosine")
+atan = _lift(math.atan, lambda v: 1 / (1 + v*v), lambda v: -2 * v / (1 + v*v)**2, "Arc tangent")
+sinh = _lift(math.sinh, math.cosh, math.sinh, "Hyperbolic sine")
+cosh = _lift(math.cosh, math.sinh, math.cosh, "Hyperbolic cosine")
+tanh = _lift(math.tanh, lambda v: 1 - math.tanh(v)**2,
+             lambda v: -2 * math.tanh(v) * (1 - math.tanh(v)**2), "Hyperbolic tangent")
+
+def derivative(f: Callable[[Any], Any], x: Number, n: int = 1, args: tuple = (), **kwargs) -> Tuple[Number, ...]:
+    """Exact derivatives of f at x with one evaluation of f.
+
+    Args:
+        f (Callable): a scalar function written with the functions of this module
+        x (Number): the point
+        n (int, optional): 1 for (f(x), f'(x)) with a dual number,
+            2 for (f(x), f'(x), f''(x)) with a hyper-dual number. Defaults to 1.
+        args, **kwargs: to be passed to f
+
+    Returns:
+        Tuple[Number, ...]: f(x) and its derivatives
+    """
+    if n == 1:
+        y = f(Dual(x, 1.), *args, **kwargs)
+        if isinstance(y, Dual):
+            return y.value, y.grad[0]
+        return y, 0.
+    elif n == 2:
+        y = f(HyperDual(x, 1., 1., 0.), *args, **kwargs)
+        if isinstance(y, HyperDual):
+            return y.real, y.eps1, y.eps12
+        return y, 0., 0.
+    raise ValueError("Only n = 1 or 2 is supported.")
+
+def gradient(f: Callable[[List[Any]], Any], x: Sequence[Number], args: tuple = (), **kwargs
+        ) -> Tuple[Union[Number, List[Number]], Union[List[Number], List[List[Number]]]]:
+    """Exact gradient of f at x in one evaluation of f, seeding every component at once.
+        If f is a vector (list) function, the gradients of all components, i.e. the Jacobian, are returned.
+
+    Args:
+        f (Callable): f(x) with x a list
+        x (Sequence[Number]): the point
+        args, **kwargs: to be passed to f
+
+    Returns:
+        Tuple: (f(x), gradient), or (F(x), Jacobian) for a vector function
+    """
+    n = len(x)
+    seeds = [Dual(x_j, tuple(1. if k == j else 0. for k in range(n))) for j, x_j in enumerate(x)]
+    y = f(seeds, *args, **kwargs)
+
+    def split(y_i):
+        if isinstance(y_i, Dual):   # a constant Dual(c) has a 1-component gradient
+            return y_i.value, list(y_i.grad) + [0.] * (n - len(y_i.grad))
+        return y_i, [0.] * n
+
+    if isinstance(y, Number):
+        return split(y)
+    values, grads = zip(*(split(y_i) for y_i in y))
+    return list(values), list(grads)
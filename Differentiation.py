@@ -1,7 +1,74 @@
-from numbers import Number
-from typing import Any, Callable, List, Optional, TypeVar
-from .LinearAlgebra import Matrix, concatenate, zeros, matrixify
-from math import factorial
+from array import array
+from itertools import chain
+from numbers import Number, Rational
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Sequence, Tuple, TypeVar, Union
+from fractions import Fraction
+from functools import lru_cache
+from .LinearAlgebra import Matrix
+from ._const import _EPS
+from .Profiling import instrumented
+
+def _Fornberg_weights(stencil: Tuple[Number, ...], n: int, x0: Number = 0) -> Tuple[Tuple[float, ...], ...]:
+    """Fornberg weights, see `finite_diff_weights`. 
+    Rational stencils are computed exactly with fractions."""
+    if all(isinstance(x, Rational) for x in stencil + (x0,)):
+        xs = [Fraction(x) for x in stencil]
+        x0 = Fraction(x0)
+    else:
+        xs = list(stencil)
+    N = len(xs)
+    # c[j][k]: weight of f(xs[j]) for the k-th derivative using the nodes xs[0], ..., xs[i]
+    c = [[0] * (n + 1) for _ in range(N)]
+    c[0][0] = 1
+    c1 = 1
+    c4 = xs[0] - x0
+    for i in range(1, N):
+        mn = min(i, n)
+        c2 = 1
+        c5 = c4
+        c4 = xs[i] - x0
+        for j in range(i):
+            c3 = xs[i] - xs[j]
+            c2 *= c3
+            if j == i - 1:
+                for k in range(mn, 0, -1):
+                    c[i][k] = c1 * (k * c[i-1][k-1] - c5 * c[i-1][k]) / c2
+                c[i][0] = -c1 * c5 * c[i-1][0] / c2
+            for k in range(mn, 0, -1):
+                c[j][k] = (c4 * c[j][k] - k * c[j][k-1]) / c3
+            c[j][0] = c4 * c[j][0] / c3
+        c1 = c2
+    return tuple(tuple(float(c[j][k]) for j in range(N)) for k in range(n + 1))
+
+_finite_diff_weights = lru_cache(maxsize=256)(_Fornberg_weights)
+
+def finite_diff_weights(stencil: Sequence[Number], n: int = 1, x0: Number = 0) -> List[List[float]]:
+    """Finite difference weights of all derivative orders 0, ..., n at x0 on an arbitrary stencil 
+        (one-sided, non-uniform, ...) with Fornberg's algorithm in O(n * N^2), so that
+        f^(k)(x0) ~= sum(weights[k][j] * f(stencil[j]) for j in range(N)).
+    Results are kept in a LRU cache keyed by (stencil, n, x0).
+
+    Args:
+        stencil (Sequence[Number]): N distinct points
+        n (int, optional): the highest derivative order. Defaults to 1.
+        x0 (Number, optional): where the derivatives are approximated. Defaults to 0.
+
+    Raises:
+        ValueError: raised when the stencil has less than n + 1 points or the points are not distinct.
+
+    Returns:
+        List[List[float]]: weights[k][j] for k in range(n + 1), j in range(N)
+
+    Reference: 
+    B. Fornberg, Generation of finite difference formulas on arbitrarily spaced grids, 
+    Math. Comp. 51, 699-706 (1988).
+    """
+    stencil = tuple(stencil)
+    if len(stencil) < n + 1:
+        raise ValueError("Number of points must be at least the derivative order + 1.")
+    if len(set(stencil)) != len(stencil):
+        raise ValueError("The points of the stencil must be distinct.")
+    return [list(weights) for weights in _finite_diff_weights(stencil, n, x0)]
 
 def central_diff_weights(Np: int, ndiv: int = 1) -> List[float]:
     if Np < ndiv + 1:
@@ -10,31 +77,43 @@ def central_diff_weights(Np: int, ndiv: int = 1) -> List[float]:
         raise ValueError("The number of points must be odd.")
     
     n_h = Np // 2 
-    x = Matrix(list(range(-n_h, n_h + 1)), shape=Np) # A column vector: -n_h, -n_h + 1, ..., n_h
-    X = zeros(Np) + 1.
-    for k in range(1, Np):
-        X = concatenate(X, matrixify(lambda x: x**k)(x))
-    # Now each row of X is like [1, x_i, x_i**2, ..., x_i**(N_p - 1)], 
-    # where x_i = -n_h + i
-    weights = factorial(ndiv) * X.inverse()[ndiv]
-    weights = weights.elements[0]
-    return weights
-
-
-def diff_f(f: Callable[[Number, Optional[Any]], Number], dx: float = 1.0, n: int = 1, order: int = 3, args: tuple = (), **kwargs) -> Callable[[float], float]:
-    if order < n + 1:
-        raise ValueError("'order' (the number of points used to compute the derivative), " + "must be at least the derivative order 'n' + 1.")
-    if order % 2 == 0:
-        raise ValueError("'order' (the number of points used to compute the derivative) " + "must be odd.")
-    f_prime = None
-    weights = central_diff_weights(order, n)
+    weights = _finite_diff_weights(tuple(range(-n_h, n_h + 1)), ndiv)[ndiv]
+    return list(weights)
+
+
+@instrumented
+def diff_f(f: Callable[[Number, Optional[Any]], Number], dx: float = 1.0, n: int = 1, order: int = 3, args: tuple = (), 
+        stencil: Optional[Sequence[Number]] = None, **kwargs) -> Callable[[float], float]:
+    """Return the n-th derivative function of f with finite differences:
+        f^(n)(x0) ~= sum(w_j * f(x0 + s_j * dx)) / dx**n
+
+    Args:
+        f (Callable): the function to be differentiated
+        dx (float, optional): the step. Defaults to 1.0.
+        n (int, optional): the derivative order. Defaults to 1.
+        order (int, optional): the number of points of the central stencil, must be odd. Defaults to 3.
+        args (tuple, optional): args to be passed to f. Defaults to ().
+        stencil (Sequence[Number], optional): the offsets s_j in units of dx, e.g. [0, 1, 2] for a forward difference. 
+            If given, `order` is ignored. Defaults to None, i.e. the central stencil of `order` points.
+        **kwargs: to be passed to f.
+
+    Returns:
+        Callable[[float], float]: the derivative function
+    """
+    if stencil is None:
+        if order < n + 1:
+            raise ValueError("'order' (the number of points used to compute the derivative), " + "must be at least the derivative order 'n' + 1.")
+        if order % 2 == 0:
+            raise ValueError("'order' (the number of points used to compute the derivative) " + "must be odd.")
+        n_h = order // 2
+        stencil = range(-n_h, n_h + 1)
+    weights = finite_diff_weights(stencil, n)[n]
+    terms = [(s * dx, w / dx ** n) for s, w in zip(stencil, weights) if w != 0]
 
     def f_prime(x0: float) -> float:
         f_diff = 0.
-        n_h = order // 2
-        for i, w in enumerate(weights):
-            f_diff += w * f(x0 + (i - n_h) * dx, *args, **kwargs)
-        f_diff /= dx ** n
+        for offset, w in terms:
+            f_diff += w * f(x0 + offset, *args, **kwargs)
         return f_diff
 
     return f_prime
@@ -44,4 +123,356 @@ def diff(
     x0: float, dx: float = 1.0, n: int = 1, order: int = 3, 
     args = (), **kwargs) -> float:
     f_diff = diff_f(f, dx, n, order, args, **kwargs)(x0)
-    return f_diff
\ No newline at end of file
+    return f_diff
+
+def diff_adaptive(
+    f: Callable[[Number, Optional[Any]], Number], 
+    x0: float, h: Optional[float] = None, n: int = 1, 
+    TOL: float = 0, Nmax: int = 10, 
+    args = (), **kwargs) -> Tuple[float, float]:
+    """Compute the n-th derivative of f at x0 adaptively with Richardson extrapolation 
+        of central differences with steps h, h/2, h/4, ..., in a Neville tableau.
+    Since the steps are halved, the points of the wider stencils (n > 2) are reused across the levels.
+    The iteration stops when the error estimate reaches TOL, 
+    or when it stops improving (round-off errors begin to dominate).
+    f is evaluated on [x0 - k h, x0 + k h] with k = ceil(n / 2), where it must be defined.
+
+    Args:
+        f (Callable[[Number, Optional[Any]], Number]): the function to be differentiated
+        x0 (float): where to differentiate
+        h (float, optional): the initial (largest) step. Defaults to None, i.e. 0.1 * max(1, |x0|), 
+            capped to |x0| / 2k for x0 != 0, so that the stencil does not reach 0 (e.g. the boundary of sqrt or log).
+        n (int, optional): the derivative order. Defaults to 1.
+        TOL (float, optional): tolerant absolute error. Defaults to 0.
+        Nmax (int, optional): max number of levels. Defaults to 10.
+        args, **kwargs: to be passed to f
+
+    Returns:
+        Tuple[float, float]: the derivative and its error estimate
+
+    Reference: 
+    W. H. Press et al., Numerical Recipes (3rd ed.), section 5.7 (dfridr)
+    """
+    n_h = n // 2 + (n % 2)  # the smallest central stencil for the n-th derivative
+    if h is None:
+        h = 0.1 * max(1., abs(x0))
+        if x0 != 0:
+            h = min(h, abs(x0) / (2 * n_h))
+    stencil = tuple(range(-n_h, n_h + 1))
+    weights = _finite_diff_weights(stencil, n)[n]
+    terms = [(s, w) for s, w in zip(stencil, weights) if w != 0]
+    SAFE = 2.
+
+    f_values = {}
+    def f_at(k: int, i: int) -> Number:
+        # the value at x0 + k * h / 2**i, keyed in the lowest terms
+        while k % 2 == 0 and i > 0:
+            k //= 2
+            i -= 1
+        if k == 0:
+            i = 0
+        try:
+            return f_values[(k, i)]
+        except KeyError:
+            y = f(x0 + k * h / 2**i, *args, **kwargs)
+            f_values[(k, i)] = y
+            return y
+
+    error = float("inf")
+    result = None
+    T_last = []
+    for i in range(Nmax):
+        h_i = h / 2**i
+        T = [sum(w * f_at(s, i) for s, w in terms) / h_i**n]
+        for j in range(1, i + 1):
+            factor = 4**j
+            T.append(T[j-1] + (T[j-1] - T_last[j-1]) / (factor - 1))
+            error_ij = max(abs(T[j] - T[j-1]), abs(T[j] - T_last[j-1]))
+            if error_ij <= error:
+                error = error_ij
+                result = T[j]
+        if result is None:
+            result = T[0]
+        if error <= TOL:
+            break
+        if i > 0 and abs(T[i] - T_last[i-1]) >= SAFE * error:
+            break
+        T_last = T
+    return result, error
+
+
+def color_columns(sparsity: "Union[Matrix, List[List[Any]]]") -> List[List[int]]:
+    """Group structurally orthogonal columns of a sparsity pattern (Curtis-Powell-Reid), 
+        i.e. columns in the same group have no nonzero element in a common row, 
+        with a greedy colouring of the column intersection graph (largest degree first).
+    A banded pattern with bandwidth b gets 2b + 1 groups.
+
+    Args:
+        sparsity (Matrix | List[List[Any]]): (m, n) pattern, nonzero (truthy) where the element may be nonzero
+
+    Returns:
+        List[List[int]]: the column indices of each group
+    """
+    rows = sparsity.elements if isinstance(sparsity, Matrix) else sparsity
+    n = len(rows[0]) if rows else 0
+    neighbours = [set() for _ in range(n)]  # columns sharing a nonzero row
+    for row in rows:
+        cols = [j for j, element in enumerate(row) if element]
+        for j in cols:
+            neighbours[j].update(cols)
+    for j in range(n):
+        neighbours[j].discard(j)
+
+    colors = [-1] * n
+    groups = []
+    for j in sorted(range(n), key=lambda j: -len(neighbours[j])):
+        used = {colors[k] for k in neighbours[j]}
+        color = 0
+        while color in used:
+            color += 1
+        colors[j] = color
+        if color == len(groups):
+            groups.append([])
+        groups[color].append(j)
+    return groups
+
+def _default_steps(x: Sequence[Number], power: float) -> List[float]:
+    return [_EPS**power * max(1., abs(x_j)) for x_j in x]
+
+def jacobian(
+    F: Callable[[List[Number], Optional[Any]], Union[List[Number], Number]], 
+    x: Sequence[Number], dx: Union[Number, Sequence[Number], None] = None, 
+    sparsity: "Union[Matrix, List[List[Any]], None]" = None, method: str = "forward", 
+    F0: Union[List[Number], Number, None] = None, 
+    args: tuple = (), **kwargs) -> Matrix:
+    """Jacobian J[i][j] = dF_i/dx_j of a vector function with finite differences.
+
+    The base value F(x) is evaluated once and shared, 
+    and each group of structurally orthogonal columns (see `color_columns`) is perturbed at once, 
+    so the cost is 1 + (number of groups) evaluations of F for "forward", 2 * (number of groups) for "central". 
+    Without sparsity each column is a group.
+
+    Args:
+        F (Callable): the vector (list) function, or a scalar function for its gradient (1, n)
+        x (Sequence[Number]): the point
+        dx (Number | Sequence[Number], optional): steps. Defaults to None, i.e. 
+            sqrt(EPS) * max(1, |x_j|) for "forward" and EPS**(1/3) * max(1, |x_j|) for "central".
+        sparsity (Matrix | List[List[Any]], optional): (m, n) sparsity pattern of J. Defaults to None.
+        method (str, optional): "forward" or "central". Defaults to "forward".
+        F0 (List[Number] | Number, optional): F(x) if already known. Defaults to None.
+        args, **kwargs: to be passed to F
+
+    Returns:
+        Matrix: the (m, n) Jacobian
+    """
+    x = list(x)
+    n = len(x)
+    method = method.lower()
+    if method not in ["forward", "central"]:
+        raise ValueError("Unknown method: {}. Must be one of {}".format(method, ["forward", "central"]))
+    if dx is None:
+        dx = _default_steps(x, 1/2 if method == "forward" else 1/3)
+    elif isinstance(dx, Number):
+        dx = [dx] * n
+
+    def F_list(x):
+        y = F(x, *args, **kwargs)
+        return [y] if isinstance(y, Number) else list(y)
+
+    if method == "forward":
+        F0 = F_list(x) if F0 is None else ([F0] if isinstance(F0, Number) else list(F0))
+    if sparsity is None:
+        groups = [[j] for j in range(n)]
+        nonzero_rows = None
+    else:
+        groups = color_columns(sparsity)
+        rows = sparsity.elements if isinstance(sparsity, Matrix) else sparsity
+        nonzero_rows = [[i for i, row in enumerate(rows) if row[j]] for j in range(n)]
+
+    J = None
+    for group in groups:
+        x_p = x.copy()
+        for j in group:
+            x_p[j] += dx[j]
+        F_p = F_list(x_p)
+        if method == "forward":
+            F_m = F0
+            h = dx
+        else:
+            x_m = x.copy()
+            for j in group:
+                x_m[j] -= dx[j]
+            F_m = F_list(x_m)
+            h = [2 * dx_j for dx_j in dx]
+        if J is None:
+            J = [[0.] * n for _ in range(len(F_p))]
+        for j in group:
+            rows = range(len(F_p)) if nonzero_rows is None else nonzero_rows[j]
+            for i in rows:
+                J[i][j] = (F_p[i] - F_m[i]) / h[j]
+    if J is None:   # n == 0, the number of rows is the size of F(x)
+        if F0 is None:
+            F0 = F_list(x)
+        J = [[] for _ in ([F0] if isinstance(F0, Number) else F0)]
+    return Matrix(J)
+
+def hessian(
+    f: Callable[[List[Number], Optional[Any]], Number], 
+    x: Sequence[Number], dx: Union[Number, Sequence[Number], None] = None, 
+    sparsity: "Union[Matrix, List[List[Any]], None]" = None, 
+    f0: Optional[Number] = None, 
+    args: tuple = (), **kwargs) -> Matrix:
+    """Hessian H[i][j] = d^2 f/dx_i dx_j of a scalar function with forward differences:
+        H[i][j] ~= (f(x + h_i e_i + h_j e_j) - f(x + h_i e_i) - f(x + h_j e_j) + f(x)) / (h_i h_j)
+    f(x) and each f(x + h_i e_i) are evaluated once and shared by all the elements, 
+    so the cost is 1 + n + (number of nonzero elements in the upper triangle) evaluations.
+
+    Args:
+        f (Callable): the scalar function
+        x (Sequence[Number]): the point
+        dx (Number | Sequence[Number], optional): steps. Defaults to None, i.e. EPS**(1/3) * max(1, |x_j|).
+        sparsity (Matrix | List[List[Any]], optional): (n, n) sparsity pattern of H, 
+            elements out of the pattern are not evaluated. Defaults to None.
+        f0 (Number, optional): f(x) if already known. Defaults to None.
+        args, **kwargs: to be passed to f
+
+    Returns:
+        Matrix: the symmetric (n, n) Hessian
+    """
+    x = list(x)
+    n = len(x)
+    if dx is None:
+        dx = _default_steps(x, 1/3)
+    elif isinstance(dx, Number):
+        dx = [dx] * n
+    if sparsity is not None and isinstance(sparsity, Matrix):
+        sparsity = sparsity.elements
+    if f0 is None:
+        f0 = f(x, *args, **kwargs)
+
+    f_i = []
+    for i in range(n):
+        x_p = x.copy()
+        x_p[i] += dx[i]
+        f_i.append(f(x_p, *args, **kwargs))
+    H = [[0.] * n for _ in range(n)]
+    for i in range(n):
+        for j in range(i, n):
+            if sparsity is not None and not (sparsity[i][j] or sparsity[j][i]):
+                continue
+            x_p = x.copy()
+            x_p[i] += dx[i]
+            x_p[j] += dx[j]
+            H[i][j] = H[j][i] = (f(x_p, *args, **kwargs) - f_i[i] - f_i[j] + f0) / (dx[i] * dx[j])
+    return Matrix(H)
+
+
+def _check_sample_order(n: int, order: int) -> int:
+    if order < n + 1:
+        raise ValueError("'order' (the number of points used to compute the derivative), " + "must be at least the derivative order 'n' + 1.")
+    if order % 2 == 0:
+        raise ValueError("'order' (the number of points used to compute the derivative) " + "must be odd.")
+    return order // 2
+
+def _diff_sample_uniform(ys: Sequence[Number], i: int, start: int, n: int, order: int) -> float:
+    """The n-th derivative (in units of the step) at ys[i] with the `order` samples from ys[start]"""
+    weights = _finite_diff_weights(tuple(range(start - i, start - i + order)), n)[n]
+    return sum(w * ys[start + k] for k, w in enumerate(weights) if w != 0)
+
+def diff_samples(ys: Sequence[Number], dx: Number = 1.0, n: int = 1, order: int = 3, 
+        xs: Optional[Sequence[Number]] = None) -> array:
+    """The n-th derivative of sampled data ys, on a uniform grid with step dx or on a non-uniform grid xs.
+
+    On a uniform grid, the interior is a single convolution pass with the cached central weights of `order` points, 
+    and the n_h = order // 2 samples at each boundary use one-sided stencils of `order` points.
+    On a non-uniform grid, the weights of the `order` nearest samples are computed for each point.
+
+    Args:
+        ys (Sequence[Number]): the samples
+        dx (Number, optional): the step of the uniform grid. Defaults to 1.0.
+        n (int, optional): the derivative order. Defaults to 1.
+        order (int, optional): the number of points of the stencils, must be odd. Defaults to 3.
+        xs (Sequence[Number], optional): the strictly increasing points of a non-uniform grid, 
+            if given, dx is ignored. Defaults to None.
+
+    Raises:
+        ValueError: raised when there are less than `order` samples, or the lengths of xs and ys are different.
+
+    Returns:
+        array: the derivatives, as a compact `array("d")`
+    """
+    n_h = _check_sample_order(n, order)
+    N = len(ys)
+    if N < order:
+        raise ValueError("At least 'order' = {} samples are required.".format(order))
+    output = array("d", bytes(8 * N))
+    if xs is None:
+        scale = dx ** n
+        interior = _finite_diff_weights(tuple(range(-n_h, n_h + 1)), n)[n]
+        terms = [(k - n_h, w) for k, w in enumerate(interior) if w != 0]
+        for i in range(n_h, N - n_h):
+            output[i] = sum(w * ys[i + k] for k, w in terms) / scale
+        for i in chain(range(n_h), range(N - n_h, N)):
+            start = min(max(i - n_h, 0), N - order)
+            output[i] = _diff_sample_uniform(ys, i, start, n, order) / scale
+    else:
+        if len(xs) != N:
+            raise ValueError("xs and ys should be of same length.")
+        for i in range(N):
+            start = min(max(i - n_h, 0), N - order)
+            stencil = tuple(xs[j] - xs[i] for j in range(start, start + order))
+            weights = _Fornberg_weights(stencil, n)[n]
+            output[i] = sum(w * ys[start + k] for k, w in enumerate(weights))
+    return output
+
+def diff_samples_stream(chunks: Iterable[Sequence[Number]], dx: Number = 1.0, n: int = 1, order: int = 3
+        ) -> Iterator[array]:
+    """Differentiate an arbitrarily long series on a uniform grid chunk by chunk with bounded memory, 
+        giving the same results as `diff_samples` on the whole series.
+    Only the last `order` samples are carried over between the chunks, 
+    so a derivative is yielded as soon as the samples it depends on have arrived 
+    (i.e. n_h = order // 2 samples behind the input), and the last ones are yielded when the input ends.
+
+    Args:
+        chunks (Iterable[Sequence[Number]]): the samples, chunk by chunk
+        dx (Number, optional): the step. Defaults to 1.0.
+        n (int, optional): the derivative order. Defaults to 1.
+        order (int, optional): the number of points of the stencils, must be odd. Defaults to 3.
+
+    Raises:
+        ValueError: raised when there are less than `order` samples in total.
+
+    Yields:
+        array: the derivatives of the samples received so far, as `array("d")`
+    """
+    n_h = _check_sample_order(n, order)
+    scale = dx ** n
+    buffer = []     # the samples from the global index `offset`
+    offset = 0
+    emitted = 0     # the global index of the next derivative
+    for chunk in chunks:
+        buffer.extend(chunk)
+        known = offset + len(buffer)
+        if known < order:
+            continue
+        output = array("d")
+        while emitted + n_h < known:
+            start = max(emitted - n_h, 0)
+            output.append(_diff_sample_uniform(buffer, emitted - offset, start - offset, n, order) / scale)
+            emitted += 1
+        if output:
+            yield output
+        drop = max(emitted - order, 0) - offset
+        if drop > 0:
+            del buffer[:drop]
+            offset += drop
+
+    N = offset + len(buffer)
+    if N < order:
+        raise ValueError("At least 'order' = {} samples are required.".format(order))
+    output = array("d")
+    while emitted < N:
+        output.append(_diff_sample_uniform(buffer, emitted - offset, N - order - offset, n, order) / scale)
+        emitted += 1
+    if output:
+        yield output
@@ -1,17 +1,37 @@
 """Numerical integrations"""
-from typing import Callable, Iterable, List, Union, Optional
-from .Interpolation import interpolate_Lagrange
-from .Polynomial import polynomial_integrate
+from array import array
+from typing import Callable, Iterable, List, NamedTuple, Sequence, Tuple, Union, Optional
+from .Polynomial import Polynomial, polynomial_integrate
+from ._const import _EPS
+from ._util import _pairwise_sum
+from .Profiling import instrumented, record
 from numbers import Integral, Number
+from fractions import Fraction
+from functools import lru_cache
+from heapq import heappop, heappush
+from math import copysign, cos, cosh, exp, fsum, gamma, hypot, inf, isfinite, isinf, nan, pi, sinh, sqrt
+from itertools import islice
+import os
+import pickle
 
 SUPPORTED_METHODS = (
     "Romberg",
     "Newton-Cotes",
     "midpoint",
     "trapezoid",
-    "Simpson"
+    "Simpson",
+    "adaptive",
+    "Gauss",
+    "double-exponential"
     )
 
+class QuadResult(NamedTuple):
+    """Result of the adaptive integrators: (value, error, n_evals)"""
+    value: Number
+    error: float
+    n_evals: int
+
+@instrumented
 def quad(f: Callable[[Number], Number], a: Number, b: Number, method: str = "Romberg", *args, **kwargs) -> Number:
     """Numerical integration of f in [a, b]. This is just a user interface to specific methods.
 
@@ -20,14 +40,22 @@ def quad(f: Callable[[Number], Number], a: Number, b: Number, method: str = "Rom
         a (Number): the starting point of the integration
         b (Number): the end point of the integration
         method (str, optional): Integration methods, must be one of 
-            ["Romberg", "Newton-Cotes", "trapezoid", "midpoint", "trapezoid", "Simpson"]. 
-        Defaults to "Romberg".
-        *args, **kwargs: args to be passed to the corresponding functions for methods
+            ["Romberg", "Newton-Cotes", "trapezoid", "midpoint", "trapezoid", "Simpson", "adaptive", "Gauss", 
+            "double-exponential"]. Defaults to "Romberg". 
+            Semi-infinite and infinite ranges are always integrated by "double-exponential".
+        *args, **kwargs: args to be passed to the corresponding functions for methods, 
+            e.g. vectorized=True if f takes a list of points and returns their values, 
+            so that f is called once per batch of points instead of once per point.
 
     Returns:
-        Number: The integration result.
+        Number: The integration result. 
+            For "adaptive" and "double-exponential", a QuadResult (value, error, n_evals), 
+            see `Gauss_Kronrod` and `double_exponential`.
     """
     method = method.lower()
+    if isinf(a) or isinf(b) or method in ["double-exponential", "double exponential", "double_exponential", 
+            "tanh-sinh", "de"]:
+        return double_exponential(f, a, b, *args, **kwargs)
     if method == "romberg":
         return Romberg(f, a, b, *args, **kwargs)
     elif method in ["newton cotes", "newton-cotes", "newton_cotes"]:
@@ -35,16 +63,67 @@ def quad(f: Callable[[Number], Number], a: Number, b: Number, method: str = "Rom
     elif method in ["midpoint", "mid-point", "mid point"]:
         return midpoint(f, a, b, *args, **kwargs)
     elif method == "trapezoid":
-        return trapezoid(f, a, b, *kwargs, **kwargs)
+        return trapezoid(f, a, b, *args, **kwargs)
     elif method == "simpson":
         return Simpson(f, a, b, *args, **kwargs)
+    elif method in ["adaptive", "gauss-kronrod", "gauss_kronrod", "gauss kronrod"]:
+        return Gauss_Kronrod(f, a, b, *args, **kwargs)
+    elif method in ["gauss", "gauss-legendre", "gauss_legendre", "gauss legendre"]:
+        return Gauss_Legendre(f, a, b, *args, **kwargs)
     else:
         raise ValueError("Unkown method: {}. Must be one of the {}".format(method, SUPPORTED_METHODS))
 
 
 
+@lru_cache(maxsize=None)
+def _Newton_Cotes_weights(n: int) -> Tuple[float, ...]:
+    """Weights of the closed Newton-Cotes rule with n + 1 equally spaced points in [0, 1], 
+        computed exactly with fractions (by integrating the Lagrange basis polynomials) once per n."""
+    if n < 1:
+        raise ValueError("n must be positive.")
+    ps = [Fraction(k, n) for k in range(n + 1)]
+    weights = []
+    for k, p_k in enumerate(ps):
+        L_k = Polynomial([Fraction(1)])
+        for j, p_j in enumerate(ps):
+            if j != k:
+                L_k *= Polynomial([-p_j / (p_k - p_j), 1 / (p_k - p_j)])
+        weights.append(polynomial_integrate(L_k)(1))
+    return tuple(float(w) for w in weights)
+
+def _Newton_Cotes_partition(f: Callable[[Number], Number], partition: List[Number], n: int, 
+        vectorized: bool = False) -> Number:
+    """Composite Newton-Cotes rule in the given partition, 
+        the value at each panel boundary is evaluated once and shared by the adjacent panels."""
+    weights = _Newton_Cotes_weights(n)
+    if vectorized:  # xs: x_0, (n - 1 interior points), x_1, ..., x_{N-1}, (n - 1 interior points), x_N
+        xs = []
+        for x_l, x_r in zip(partition, islice(partition, 1, None)):
+            dx = x_r - x_l
+            xs.append(x_l)
+            xs.extend(x_l + k * dx / n for k in range(1, n))
+        xs.append(partition[-1])
+        ys = f(xs)
+        panels = []
+        for i, (x_l, x_r) in enumerate(zip(partition, islice(partition, 1, None))):
+            base = i * n
+            panels.append((x_r - x_l) * sum(w * ys[base + k] for k, w in enumerate(weights)))
+        return _pairwise_sum(panels)
+
+    quad = 0
+    y_left = f(partition[0])
+    for x_l, x_r in zip(partition, islice(partition, 1, None)):
+        dx = x_r - x_l
+        y_right = f(x_r)
+        panel = weights[0] * y_left + weights[-1] * y_right
+        for k in range(1, n):
+            panel += weights[k] * f(x_l + k * dx / n)
+        quad += panel * dx
+        y_left = y_right
+    return quad
+
 def Newton_Cotes(f: Callable[[Number], Number], a: Number, b: Number, n: int = 2, 
-        spaces: Union[list, Integral] = 10) -> Number:
+        spaces: Union[list, Integral] = 10, vectorized: bool = False) -> Number:
     """Using Newton-Cotes method to calculate the integration of a function f between a and b, with N equally spaced or given spaces.
 
     Args:
@@ -53,30 +132,18 @@ def Newton_Cotes(f: Callable[[Number], Number], a: Number, b: Number, n: int = 2
         b (Number): the end point of the integration
         n (int, optional): The number of samples points in every space. Defaults to 2.
         spaces (Union[list, Integral]): A collection of the divied points, if a integer is given, equally space the inteval. Defaults to 10.
+        vectorized (bool, optional): if f takes a list of points and returns their values, 
+            then f is called once with all the points. Defaults to False.
 
     Returns:
         Number: The integration result
     """
     if isinstance(spaces, Integral):
-        return Newton_Cortes_equal_spaces(f, a, b, n, spaces)
-    
-    ps = [i/n for i in range(n + 1)]    # divide 1 by n
-    xs = spaces
-    quad = 0
-    for i in range(len(xs)):
-        if i != 0:
-            dx = xs[i] - xs[i - 1]
-            ys = [f(xs[i - 1] + p * dx) for p in ps]
-        else:
-            dx = xs[i] - a
-            ys = [f(a + p * dx) for p in ps]
-        
-        Lagrange_poly = interpolate_Lagrange(ps, ys)
-        quad += polynomial_integrate(Lagrange_poly)(1) * dx
-    return quad
+        return Newton_Cortes_equal_spaces(f, a, b, n, spaces, vectorized)
+    return _Newton_Cotes_partition(f, [a] + list(spaces), n, vectorized)
 
 def Newton_Cortes_equal_spaces(f: Callable[[Number], Number], a: Number, b: Number, n: int = 2, 
-        N: Integral = 10) -> Number:
+        N: Integral = 10, vectorized: bool = False) -> Number:
     """Using Newton-Cotes method to calculate the integration of a function f between a and b, with equal spaces.
 
     Args:
@@ -85,25 +152,16 @@ def Newton_Cortes_equal_spaces(f: Callable[[Number], Number], a: Number, b: Numb
         b (Number): the end point of the integration
         n (int, optional): The number of samples points in every space. Defaults to 2.
         N (Optional[list], optional): equally space the inteval into N parts. Defaults to 10.
+        vectorized (bool, optional): if f takes a list of points and returns their values, 
+            then f is called once with all the points. Defaults to False.
 
     Returns:
         Number: The integration result
     """
-    ps = [i/n for i in range(n + 1)]    # divide 1 by n
-    dx = (b - a) / N
-    xs = [dx * i for i in range(1, N + 1)]
-    quad = 0
-    for i in range(len(xs)):
-        if i != 0:
-            ys = [f(xs[i - 1] + p * dx) for p in ps]
-        else:
-            ys = [f(a + p * dx) for p in ps]
-        
-        Lagrange_poly = interpolate_Lagrange(ps, ys)
-        quad += polynomial_integrate(Lagrange_poly)(1) * dx
-    return quad
+    return _Newton_Cotes_partition(f, generate_partition(a, b, N), n, vectorized)
 
-def midpoint(f: Callable[[Number], Number], a: Number, b: Number, N: int = 10) -> Number:
+def midpoint(f: Callable[[Number], Number], a: Number, b: Number, N: int = 10, 
+        vectorized: bool = False) -> Number:
     """Use mid-point rule to calculate the numerical integration of function f in [a, b], with N-th order precision.
 
     Args:
@@ -111,15 +169,20 @@ def midpoint(f: Callable[[Number], Number], a: Number, b: Number, N: int = 10) -
         a (Number): the starting point
         b (Number): the end point
         N (int, optional): the algebraic precision. Defaults to 10.
+        vectorized (bool, optional): if f takes a list of points and returns their values, 
+            then f is called once with all the points. Defaults to False.
 
     Returns:
         Number: the integration result
     """
     dx = (b - a) / N
-    ys = (f(a + dx/2 + dx * i) for i in range(1, N))
+    if vectorized:
+        return _pairwise_sum(f([a + dx/2 + dx * i for i in range(N)])) * dx
+    ys = (f(a + dx/2 + dx * i) for i in range(N))
     return sum(ys) * dx
 
-def trapezoid(f: Callable[[Number], Number], a: Number, b: Number, N: int = 10) -> Number:
+def trapezoid(f: Callable[[Number], Number], a: Number, b: Number, N: int = 10, 
+        vectorized: bool = False) -> Number:
     """Use trapezoid rule to calculate the numerical integration of function f in [a, b], with N-th order precision.
 
     Args:
@@ -127,15 +190,21 @@ def trapezoid(f: Callable[[Number], Number], a: Number, b: Number, N: int = 10)
         a (Number): the starting point
         b (Number): the end point
         N (int, optional): the algebraic precision. Defaults to 10.
+        vectorized (bool, optional): if f takes a list of points and returns their values, 
+            then f is called once with all the points. Defaults to False.
 
     Returns:
         Number: the integration result
     """
     dx = (b - a) / N  
+    if vectorized:
+        ys = f([a + dx * i for i in range(N + 1)])
+        return dx/2 * (ys[0] + ys[N] + 2 * _pairwise_sum(ys, 1, N))
     ys = (f(a + dx * i) for i in range(1, N))
     return dx/2 * (f(a) + f(b) + 2 * sum(ys))
 
-def Simpson(f: Callable[[Number], Number], a: Number, b: Number, N: int = 10) -> Number:
+def Simpson(f: Callable[[Number], Number], a: Number, b: Number, N: int = 10, 
+        vectorized: bool = False) -> Number:
     """Use Simpson rule to calculate the numerical integration of function f in [a, b], with N-th order precision.
 
     Args:
@@ -143,16 +212,24 @@ def Simpson(f: Callable[[Number], Number], a: Number, b: Number, N: int = 10) ->
         a (Number): the starting point
         b (Number): the end point
         N (int, optional): the algebraic precision. Defaults to 10.
+        vectorized (bool, optional): if f takes a list of points and returns their values, 
+            then f is called once with all the points. Defaults to False.
 
     Returns:
         Number: the integration result
     """
     dx  = (b - a) / (2 * N)
+    if vectorized:  # xs: a, (odd points), (even points), b
+        xs = [a] + [a + dx * (2*i + 1) for i in range(N)] + [a + dx * 2*i for i in range(1, N)] + [b]
+        ys = f(xs)
+        return dx / 3 * (ys[0] + ys[2*N] + 4 * _pairwise_sum(ys, 1, N + 1) + 2 * _pairwise_sum(ys, N + 1, 2*N))
     ys_odd = (f(a + dx * (2*i + 1)) for i in range(N))
     ys_even = (f(a + dx * 2*i) for i in range(1, N))
     return dx / 3 * (f(a) + f(b) + 4 * sum(ys_odd) + 2 * sum(ys_even))
 
-def Romberg(f: Callable[[Number], Number], a: Number, b: Number, N: int = 10) -> Number:
+@instrumented
+def Romberg(f: Callable[[Number], Number], a: Number, b: Number, N: int = 10, 
+        vectorized: bool = False) -> Number:
     """Use Romberg method to calculate the numerical integration of function f in [a, b], with N-th order precision.
 
     Args:
@@ -160,16 +237,24 @@ def Romberg(f: Callable[[Number], Number], a: Number, b: Number, N: int = 10) ->
         a (Number): the starting point
         b (Number): the end point
         N (int, optional): the algebraic precision. Defaults to 10.
+        vectorized (bool, optional): if f takes a list of points and returns their values, 
+            then f is called once per level, with the new midpoints only. Defaults to False.
 
     Returns:
         Number: the integration result
     """
     h = [(b - a)/2**i for i in range(N)]
-    R_col = [(f(a) + f(b))/2 * h[0]]
+    if vectorized:
+        y_a, y_b = f([a, b])
+        R_col = [(y_a + y_b)/2 * h[0]]
+    else:
+        R_col = [(f(a) + f(b))/2 * h[0]]
     for i in range(N - 1):
-        R_new = R_col[i] / 2 + h[i+1] * sum(
-            f(a + (2*k + 1) * h[i+1]) for k in range(2**i)
-        )
+        if vectorized:
+            new_sum = _pairwise_sum(f([a + (2*k + 1) * h[i+1] for k in range(2**i)]))
+        else:
+            new_sum = sum(f(a + (2*k + 1) * h[i+1]) for k in range(2**i))
+        R_new = R_col[i] / 2 + h[i+1] * new_sum
         R_col.append(R_new)
 
     for j in range(1, N-1):
@@ -179,8 +264,711 @@ def Romberg(f: Callable[[Number], Number], a: Number, b: Number, N: int = 10) ->
             R_col_new.append(R_new)
         R_col = R_col_new
 
+    record("Romberg", iterations=N, matrix_size=(N, N))
     return R_col[0]
 
+# Gauss-Kronrod rules on [-1, 1] (from QUADPACK): 
+# the non-negative Kronrod nodes in decreasing order (the Gauss nodes are those with odd indices), 
+# the Kronrod weights and the Gauss weights of the Gauss nodes.
+_GAUSS_KRONROD_RULES = {
+    "G7K15": (
+        (0.991455371120812639206854697526329, 0.949107912342758524526189684047851,
+         0.864864423359769072789712788640926, 0.741531185599394439863864773280788,
+         0.586087235467691130294144845693013, 0.405845151377397166906606412076961,
+         0.207784955007898467600689403773245, 0.000000000000000000000000000000000),
+        (0.022935322010529224963732008058970, 0.063092092629978553290700663189204,
+         0.104790010322250183839876322541518, 0.140653259715525918745189590510238,
+         0.169004726639267902826583426598550, 0.190350578064785409913256402421014,
+         0.204432940075298892414161999234649, 0.209482141084727828012999174891714),
+        (0.129484966168869693270611432679082, 0.279705391489276667901467771423780,
+         0.381830050505118944950369775488975, 0.417959183673469387755102040816327)),
+    "G10K21": (
+        (0.995657163025808080735527280689003, 0.973906528517171720077964012084452,
+         0.930157491355708226001207180059508, 0.865063366688984510732096688423493,
+         0.780817726586416897063717578345042, 0.679409568299024406234327365114874,
+         0.562757134668604683339000099272694, 0.433395394129247190799265943165784,
+         0.294392862701460198131126603103866, 0.148874338981631210884826001129720,
+         0.000000000000000000000000000000000),
+        (0.011694638867371874278064396062192, 0.032558162307964727478818972459390,
+         0.054755896574351996031381300244580, 0.075039674810919952767043140916190,
+         0.093125454583697605535065465083366, 0.109387158802297641899210590325805,
+         0.123491976262065851077208703587318, 0.134709217311473325928054001771707,
+         0.142775938577060080797094273138717, 0.147739104901338491374841515972068,
+         0.149445554002916905664936468389821),
+        (0.066671344308688137593568809893332, 0.149451349150580593145776339657697,
+         0.219086362515982043995534934228163, 0.269266719309996355091226921569469,
+         0.295524224714752870173892994651338)),
+}
+
+def _Gauss_Kronrod_rule(f: Callable[[Number], Number], a: Number, b: Number, 
+        rule: tuple, vectorized: bool = False) -> Tuple[Number, float]:
+    """Apply a Gauss-Kronrod rule on [a, b], returns the Kronrod estimate and its error (as QUADPACK)"""
+    xgk, wgk, wg = rule
+    center = (a + b) / 2
+    half = (b - a) / 2
+    n = len(xgk)
+    # ys: (f(center - half * x), f(center + half * x)) for x in xgk[:-1]
+    if vectorized:
+        dxs = [half * x for x in islice(xgk, 0, n - 1)]
+        ys_all = f([center] + [center - dx for dx in dxs] + [center + dx for dx in dxs])
+        f_center = ys_all[0]
+        ys = list(zip(ys_all[1:n], ys_all[n:]))
+    else:
+        f_center = f(center)
+        ys = []
+        for x in islice(xgk, 0, n - 1):
+            dx = half * x
+            ys.append((f(center - dx), f(center + dx)))
+    result_K = wgk[-1] * f_center
+    result_G = wg[-1] * f_center if n % 2 == 0 else 0.
+    result_abs = abs(result_K)
+    for j, (y_l, y_r) in enumerate(ys):
+        result_K += wgk[j] * (y_l + y_r)
+        result_abs += wgk[j] * (abs(y_l) + abs(y_r))
+        if j % 2 == 1:
+            result_G += wg[j // 2] * (y_l + y_r)
+    mean = result_K / 2
+    result_asc = wgk[-1] * abs(f_center - mean) + sum(
+        w * (abs(y_l - mean) + abs(y_r - mean)) for w, (y_l, y_r) in zip(wgk, ys))
+
+    result_K *= half
+    result_abs *= abs(half)
+    result_asc *= abs(half)
+    error = abs((result_K - result_G * half))
+    if result_asc != 0 and error != 0:
+        error = result_asc * min(1., (200 * error / result_asc) ** 1.5)
+    if result_abs > 5e-293 / (50 * _EPS):
+        error = max(50 * _EPS * result_abs, error)
+    return result_K, error
+
+@instrumented
+def Gauss_Kronrod(f: Callable[[Number], Number], a: Number, b: Number, 
+        atol: float = 1.49e-8, rtol: float = 1.49e-8, max_evals: int = 10_000, 
+        rule: str = "G7K15", vectorized: bool = False) -> QuadResult:
+    """Globally adaptive integration of f in [a, b] with Gauss-Kronrod rules (G7-K15 or G10-K21).
+    The subintervals are kept in a heap keyed by their error estimates, 
+    and the worst one is always bisected, until the total error is below max(atol, rtol * |result|) 
+    or the evaluation budget is used up.
+
+    Args:
+        f (Callable[[Number], Number]): The function to be integrated
+        a (Number): the starting point
+        b (Number): the end point
+        atol (float, optional): absolute tolerance. Defaults to 1.49e-8.
+        rtol (float, optional): relative tolerance. Defaults to 1.49e-8.
+        max_evals (int, optional): max number of evaluations of f. Defaults to 10_000.
+        rule (str, optional): "G7K15" or "G10K21". Defaults to "G7K15".
+        vectorized (bool, optional): if f takes a list of points and returns their values, 
+            then f is called once per rule application. Defaults to False.
+
+    Returns:
+        QuadResult: (value, error, n_evals), the integration result, its estimated error 
+            (larger than the tolerance if the budget was used up) and the number of evaluations of f.
+    """
+    try:
+        rule_data = _GAUSS_KRONROD_RULES[rule.upper()]
+    except KeyError:
+        raise ValueError("Unknown rule: {}. Must be one of {}".format(rule, list(_GAUSS_KRONROD_RULES.keys())))
+    n_per_rule = 2 * len(rule_data[0]) - 1
+    if a == b:
+        return QuadResult(0., 0., 0)
+
+    value, error = _Gauss_Kronrod_rule(f, a, b, rule_data, vectorized)
+    n_evals = n_per_rule
+    heap = [(-error, a, b, value)]
+    total_value, total_error = value, error
+    while total_error > max(atol, rtol * abs(total_value)) and n_evals + 2 * n_per_rule <= max_evals:
+        neg_error, a_i, b_i, value_i = heappop(heap)
+        m_i = (a_i + b_i) / 2
+        value_l, error_l = _Gauss_Kronrod_rule(f, a_i, m_i, rule_data, vectorized)
+        value_r, error_r = _Gauss_Kronrod_rule(f, m_i, b_i, rule_data, vectorized)
+        n_evals += 2 * n_per_rule
+        heappush(heap, (-error_l, a_i, m_i, value_l))
+        heappush(heap, (-error_r, m_i, b_i, value_r))
+        total_value += value_l + value_r - value_i
+        total_error += error_l + error_r + neg_error
+    total_value = fsum(item[3] for item in heap)
+    total_error = fsum(-item[0] for item in heap)
+    record("Gauss_Kronrod", iterations=len(heap) - 1)     # the number of bisections
+    return QuadResult(total_value, total_error, n_evals)
+
+def _recurrence_Gauss(family: str, n: int, alpha: float, beta: float):
+    """Recurrence coefficients of the monic orthogonal polynomials p_{k+1} = (x - a_k) p_k - b_k p_{k-1}, 
+        as ([a_0, ..., a_{n-1}], [b_0 := 0, b_1, ..., b_{n-1}], mu_0 = integral of the weight function)"""
+    if family == "legendre":
+        a = [0.] * n
+        b = [0.] + [k**2 / (4 * k**2 - 1) for k in range(1, n)]
+        mu_0 = 2.
+    elif family == "laguerre":
+        a = [2*k + alpha + 1 for k in range(n)]
+        b = [0.] + [k * (k + alpha) for k in range(1, n)]
+        mu_0 = gamma(alpha + 1)
+    elif family == "hermite":
+        a = [0.] * n
+        b = [0.] + [k / 2 for k in range(1, n)]
+        mu_0 = sqrt(pi)
+    elif family == "jacobi":
+        ab = alpha + beta
+        a = [(beta - alpha) / (ab + 2)]
+        for k in range(1, n):
+            a.append((beta**2 - alpha**2) / ((2*k + ab) * (2*k + ab + 2)))
+        b = [0.]
+        if n > 1:
+            b.append(4 * (1 + alpha) * (1 + beta) / ((2 + ab)**2 * (3 + ab)))
+        for k in range(2, n):
+            b.append(4 * k * (k + alpha) * (k + beta) * (k + ab) 
+                      / ((2*k + ab)**2 * (2*k + ab + 1) * (2*k + ab - 1)))
+        mu_0 = 2**(ab + 1) * gamma(alpha + 1) * gamma(beta + 1) / gamma(ab + 2)
+    else:
+        raise ValueError("Unknown family: {}. Must be one of {}".format(family, SUPPORTED_GAUSS_FAMILIES))
+    return a, b, mu_0
+
+def _tridiagonal_eigen(d: List[float], e: List[float]) -> Tuple[List[float], List[float]]:
+    """Eigenvalues and the first components of the normalised eigenvectors of a symmetric tridiagonal matrix, 
+        with the implicit QL algorithm in O(n^2). d is the diagonal, e[i] couples i and i + 1 (e[n-1] = 0).
+
+    Reference: 
+    W. H. Press et al., Numerical Recipes (3rd ed.), section 11.4 (tqli)
+    """
+    n = len(d)
+    d, e = list(d), list(e)
+    z = [1.] + [0.] * (n - 1)
+    for l in range(n):
+        n_iter = 0
+        while True:
+            m = l
+            while m < n - 1:
+                if abs(e[m]) <= _EPS * (abs(d[m]) + abs(d[m+1])):
+                    break
+                m += 1
+            if m == l:
+                break
+            n_iter += 1
+            if n_iter > 60:
+                raise Warning("Too many iterations in the tridiagonal eigenvalue problem.")
+            g = (d[l+1] - d[l]) / (2 * e[l])
+            r = hypot(g, 1.)
+            g = d[m] - d[l] + e[l] / (g + copysign(r, g))
+            s = c = 1.
+            p = 0.
+            for i in range(m - 1, l - 1, -1):
+                f = s * e[i]
+                b = c * e[i]
+                r = hypot(f, g)
+                e[i+1] = r
+                if r == 0:
+                    d[i+1] -= p
+                    e[m] = 0.
+                    break
+                s = f / r
+                c = g / r
+                g = d[i+1] - p
+                r = (d[i] - g) * s + 2 * c * b
+                p = s * r
+                d[i+1] = g + p
+                g = c * r - b
+                f = z[i+1]
+                z[i+1] = s * z[i] + c * f
+                z[i] = c * z[i] - s * f
+            else:
+                d[l] -= p
+                e[l] = g
+                e[m] = 0.
+    return d, z
+
+def _orthonormal_eval(x: float, a: List[float], sqrt_b: List[float], n: int) -> Tuple[float, float, float]:
+    """(q_n(x), q_n'(x), sum(q_k(x)**2 for k < n)) of the orthonormal polynomials (with q_0 = 1)"""
+    q_prev, q = 0., 1.
+    dq_prev, dq = 0., 0.
+    christoffel = 0.
+    for k in range(n):
+        christoffel += q * q
+        next_b = sqrt_b[k+1]
+        q_next = ((x - a[k]) * q - sqrt_b[k] * q_prev) / next_b
+        dq_next = ((x - a[k]) * dq + q - sqrt_b[k] * dq_prev) / next_b
+        q_prev, q = q, q_next
+        dq_prev, dq = dq, dq_next
+    return q, dq, christoffel
+
+_GAUSS_CACHE = {}
+
+SUPPORTED_GAUSS_FAMILIES = ("Legendre", "Laguerre", "Hermite", "Jacobi")
+
+def Gauss_rule(family: str = "Legendre", n: int = 10, alpha: float = 0., beta: float = 0., 
+        cache_dir: Optional[str] = None) -> Tuple[Tuple[float, ...], Tuple[float, ...]]:
+    """Nodes and weights of the n-point Gauss rule of a family of orthogonal polynomials, 
+        so that integral(w(x) f(x)) ~= sum(weights[i] * f(nodes[i])), exact for polynomials of degree 2n - 1:
+        "Legendre": w(x) = 1 in [-1, 1]
+        "Laguerre": w(x) = x**alpha * exp(-x) in [0, inf)
+        "Hermite": w(x) = exp(-x**2) in (-inf, inf)
+        "Jacobi": w(x) = (1 - x)**alpha * (1 + x)**beta in [-1, 1]
+
+    Legendre nodes start from their asymptotic approximations, 
+    while the other families start from the eigenvalues of the Jacobi matrix (Golub-Welsch). 
+    The nodes are then refined by Newton's method on the three-term recurrence, 
+    and the weights come from the Christoffel function, in O(n^2).
+    The rules are kept in a process-wide cache keyed by (family, n, alpha, beta), 
+    and optionally in pickle files in cache_dir.
+
+    Args:
+        family (str, optional): one of SUPPORTED_GAUSS_FAMILIES. Defaults to "Legendre".
+        n (int, optional): the number of nodes. Defaults to 10.
+        alpha, beta (float, optional): parametres of "Laguerre" (alpha) and "Jacobi". Defaults to 0..
+        cache_dir (str, optional): a directory to store the rules. Defaults to None.
+
+    Returns:
+        Tuple[Tuple[float, ...], Tuple[float, ...]]: (nodes, weights), nodes in increasing order
+
+    Reference: 
+    G. H. Golub and J. H. Welsch, Calculation of Gauss quadrature rules, Math. Comp. 23, 221-230 (1969).
+    """
+    family = family.lower()
+    if family in ("legendre", "hermite"):
+        alpha = beta = 0.
+    elif family == "laguerre":
+        beta = 0.
+    key = (family, n, float(alpha), float(beta))
+    try:
+        return _GAUSS_CACHE[key]
+    except KeyError:
+        pass
+    if cache_dir is not None:
+        path = os.path.join(cache_dir, "Gauss_{}_{}_{}_{}.pkl".format(*key))
+        if os.path.exists(path):
+            with open(path, "rb") as file:
+                rule = pickle.load(file)
+            _GAUSS_CACHE[key] = rule
+            return rule
+    if n < 1:
+        raise ValueError("n must be positive.")
+
+    a, b, mu_0 = _recurrence_Gauss(family, n + 1, alpha, beta)
+    sqrt_b = [sqrt(b_k) for b_k in b]
+    if family == "legendre":
+        xs = [-cos(pi * (4*k - 1) / (4*n + 2)) * (1 - (n - 1) / (8 * n**3)) for k in range(1, n + 1)]
+    else:
+        xs, _ = _tridiagonal_eigen(a[:n], sqrt_b[1:n] + [0.])
+        xs.sort()
+    nodes, weights = [], []
+    for x in xs:
+        for _ in range(100):
+            q, dq, _ = _orthonormal_eval(x, a, sqrt_b, n)
+            dx = q / dq
+            x -= dx
+            if abs(dx) <= 4 * _EPS * max(1., abs(x)):
+                break
+        _, _, christoffel = _orthonormal_eval(x, a, sqrt_b, n)
+        nodes.append(x)
+        weights.append(mu_0 / christoffel)
+    rule = (tuple(nodes), tuple(weights))
+    _GAUSS_CACHE[key] = rule
+    if cache_dir is not None:
+        with open(path, "wb") as file:
+            pickle.dump(rule, file)
+    return rule
+
+def Gauss_Legendre(f: Callable[[Number], Number], a: Number, b: Number, n: int = 5, N: int = 1, 
+        partition: Optional[List[Number]] = None, vectorized: bool = False) -> Number:
+    """Composite Gauss-Legendre rule with n nodes in each of the N equal spaces of [a, b], 
+        or in each space of a given partition. The reference nodes are cached, see `Gauss_rule`.
+
+    Args:
+        f (Callable[[Number], Number]): The function to be integrated
+        a (Number): the starting point
+        b (Number): the end point
+        n (int, optional): the number of nodes in every space (exact for degree 2n - 1). Defaults to 5.
+        N (int, optional): the number of equal spaces. Defaults to 1.
+        partition (List[Number], optional): a collection of points [a, ..., b], 
+            if given, a, b and N are ignored. Defaults to None.
+        vectorized (bool, optional): if f takes a list of points and returns their values, 
+            then f is called once with all the points. Defaults to False.
+
+    Returns:
+        Number: the integration result
+    """
+    nodes, weights = Gauss_rule("Legendre", n)
+    if partition is None:
+        partition = generate_partition(a, b, N)
+    if vectorized:
+        xs = []
+        for x_l, x_r in zip(partition, islice(partition, 1, None)):
+            center = (x_l + x_r) / 2
+            half = (x_r - x_l) / 2
+            xs.extend(center + half * x for x in nodes)
+        ys = f(xs)
+        panels = []
+        for i, (x_l, x_r) in enumerate(zip(partition, islice(partition, 1, None))):
+            base = i * n
+            panels.append((x_r - x_l) / 2 * sum(w * ys[base + k] for k, w in enumerate(weights)))
+        return _pairwise_sum(panels)
+    quad = 0.
+    for x_l, x_r in zip(partition, islice(partition, 1, None)):
+        center = (x_l + x_r) / 2
+        half = (x_r - x_l) / 2
+        quad += half * sum(w * f(center + half * x) for x, w in zip(nodes, weights))
+    return quad
+
+def Gauss_Laguerre(f: Callable[[Number], Number], n: int = 10, alpha: float = 0.) -> Number:
+    """integral(x**alpha * exp(-x) * f(x), 0, inf) with the n-point Gauss-Laguerre rule"""
+    nodes, weights = Gauss_rule("Laguerre", n, alpha)
+    return sum(w * f(x) for x, w in zip(nodes, weights))
+
+def Gauss_Hermite(f: Callable[[Number], Number], n: int = 10) -> Number:
+    """integral(exp(-x**2) * f(x), -inf, inf) with the n-point Gauss-Hermite rule"""
+    nodes, weights = Gauss_rule("Hermite", n)
+    return sum(w * f(x) for x, w in zip(nodes, weights))
+
+def Gauss_Jacobi(f: Callable[[Number], Number], n: int = 10, alpha: float = 0., beta: float = 0.) -> Number:
+    """integral((1 - x)**alpha * (1 + x)**beta * f(x), -1, 1) with the n-point Gauss-Jacobi rule"""
+    nodes, weights = Gauss_rule("Jacobi", n, alpha, beta)
+    return sum(w * f(x) for x, w in zip(nodes, weights))
+
+_DE_U_MAX = 345.     # the nodes are truncated at pi / 2 * sinh(t) = _DE_U_MAX, where exp(-2 * _DE_U_MAX) ~ 1e-300
+_DE_U_MAX_LARGE = 69.   # and at exp(_DE_U_MAX_LARGE) ~ 1e30 for the large nodes of exp-sinh and sinh-sinh
+
+@lru_cache(maxsize=None)
+def _double_exponential_level(kind: str, level: int) -> Tuple[Tuple[float, float, float, float, float], ...]:
+    """The new nodes of a double exponential rule at a level, i.e. t = k / 2**level > 0 with k odd 
+        (or any k at the level 0, where the node t = 0 is handled separately), 
+        as the tuples (t, x_1, x_2, w_1, w_2) of the nodes at t and -t:
+        "tanh-sinh": x_1 = x_2 = 1 - tanh(u) (the distance to the nearest end of [-1, 1]), 
+        "sinh-sinh": x_1 = x_2 = sinh(u) (the nodes are +/- sinh(u)), 
+        "exp-sinh": x_1 = exp(u), x_2 = exp(-u), 
+        with u = pi / 2 * sinh(t), and w_i the derivatives of the transformations.
+    The large nodes (sinh-sinh, and x_1 of exp-sinh) stop at about 1e30, beyond which x_1 = inf (dropped), 
+    so that f is not evaluated where its powers overflow.
+    """
+    h = 1 / 2**level
+    step = 1 if level == 0 else 2
+    nodes = []
+    k = 1
+    while True:
+        t = k * h
+        u = pi / 2 * sinh(t)
+        if u > (_DE_U_MAX_LARGE if kind == "sinh-sinh" else _DE_U_MAX):
+            break
+        dt = pi / 2 * cosh(t)
+        if kind == "tanh-sinh":
+            e = exp(-2 * u)
+            x = 2 * e / (1 + e)
+            w = dt * 4 * e / (1 + e)**2
+            nodes.append((t, x, x, w, w))
+        elif kind == "sinh-sinh":
+            nodes.append((t, sinh(u), sinh(u), dt * cosh(u), dt * cosh(u)))
+        elif u > _DE_U_MAX_LARGE:
+            nodes.append((t, inf, exp(-u), 0., dt * exp(-u)))
+        else:
+            nodes.append((t, exp(u), exp(-u), dt * exp(u), dt * exp(-u)))
+        k += step
+    return tuple(nodes)
+
+@instrumented
+def double_exponential(f: Callable[[Number], Number], a: Number, b: Number, 
+        atol: float = 1.49e-8, rtol: float = 1.49e-8, max_level: int = 8, vectorized: bool = False, 
+        with_distance: bool = False) -> QuadResult:
+    """Double exponential quadrature of f in [a, b], suited to endpoint singularities and infinite ranges: 
+        tanh-sinh for a finite [a, b], exp-sinh for [a, inf) and (-inf, b], sinh-sinh for (-inf, inf).
+    The transformed integrand decays double exponentially, so the trapezoid rule with step h = 1 / 2**level 
+    converges very fast. Each level halves the step, hence only evaluates f at the new nodes and reuses the others, 
+    until the difference between two levels is below max(atol, rtol * |result|).
+    The nodes and weights of each level are cached. 
+    f is never evaluated at a, b (a node too close to an end is dropped), 
+    and the tails beyond the last significant node of the level 0 are not refined.
+    The infinite ranges are truncated at |x| ~ 1e30, and in the tails (|t| >= 1) 
+    the nodes where f overflows (OverflowError, or a non-finite value) are dropped.
+    Since a node x near a nonzero end is rounded (or even dropped), the integral loses accuracy 
+    at a singularity there (e.g. 1 / sqrt(1 - x) near 1), which is avoided with `with_distance`.
+
+    Args:
+        f (Callable[[Number], Number]): The function to be integrated
+        a (Number): the starting point, may be -inf
+        b (Number): the end point, may be inf
+        atol (float, optional): absolute tolerance. Defaults to 1.49e-8.
+        rtol (float, optional): relative tolerance. Defaults to 1.49e-8.
+        max_level (int, optional): the max level. Defaults to 8.
+        vectorized (bool, optional): if f takes a list of points and returns their values, 
+            then f is called once per level. Defaults to False.
+        with_distance (bool, optional): if True, f is called as f(x, x - c), where c is the nearest finite end 
+            (a for the nodes of the first half of [a, b], b for the second one), 
+            and x - c is exact. Ignored for (-inf, inf). Defaults to False.
+
+    Returns:
+        QuadResult: (value, error, n_evals), the integration result, 
+            its estimated error (the difference between the last two levels) and the number of evaluations of f.
+            The estimate is pessimistic: as each level about doubles the number of correct digits, 
+            the error of the last level is usually much smaller (e.g. 1e-15 for an estimate of 1e-8).
+    """
+    if a == b:
+        return QuadResult(0., 0., 0)
+    if a > b:
+        value, error, n_evals = double_exponential(f, b, a, atol, rtol, max_level, vectorized, with_distance)
+        return QuadResult(-value, error, n_evals)
+    if isinf(a) and isinf(b):
+        kind = "sinh-sinh"
+        with_distance = False
+        center, scale = 0., 1.
+        # the nodes (x_i(u_i)) and their signed distances to the nearest end (d_i(u_i))
+        x_1 = d_1 = lambda u: u
+        x_2 = d_2 = lambda u: -u
+    elif isinf(b):
+        kind = "exp-sinh"
+        center, scale = a + 1., 1.
+        x_1 = x_2 = lambda u: a + u
+        d_1 = d_2 = lambda u: u
+    elif isinf(a):
+        kind = "exp-sinh"
+        center, scale = b - 1., 1.
+        x_1 = x_2 = lambda u: b - u
+        d_1 = d_2 = lambda u: -u
+    else:
+        kind = "tanh-sinh"
+        scale = (b - a) / 2
+        center = a + scale
+        x_1 = lambda u: a + scale * u
+        x_2 = lambda u: b - scale * u
+        d_1 = lambda u: scale * u
+        d_2 = lambda u: -scale * u
+
+    def evaluate(xs: List[Number], ds: List[Number], ts: List[float]) -> List[Number]:
+        if not xs:
+            return []
+        if vectorized:
+            try:
+                return list(f(xs, ds)) if with_distance else list(f(xs))
+            except OverflowError:   # evaluated one by one, to find the overflowing nodes
+                pass
+        return [evaluate_at(x, d, t) for x, d, t in zip(xs, ds, ts)]
+
+    # f at a node x (at t), which is nan in the tails where f overflows
+    def evaluate_at(x: Number, d: Number, t: float) -> Number:
+        try:
+            if vectorized:
+                return (f([x], [d]) if with_distance else f([x]))[0]
+            return f(x, d) if with_distance else f(x)
+        except OverflowError:
+            if abs(t) < 1:
+                raise
+            return nan
+
+    # the nodes of a level, on both sides of t = 0, with t not larger than t_max_1 and t_max_2, 
+    # returns the terms, their t and the number of evaluations of f (including the dropped nodes)
+    def level_terms(level: int, t_max_1: float, t_max_2: float) -> Tuple[List[float], List[float], int]:
+        xs, ds, ws, ts = [], [], [], []
+        for t, u_1, u_2, w_1, w_2 in _double_exponential_level(kind, level):
+            if t <= t_max_1:
+                x, d = x_1(u_1), d_1(u_1)
+                if (d != 0 and not isinf(x)) if with_distance else a < x < b:
+                    xs.append(x)
+                    ds.append(d)
+                    ws.append(w_1)
+                    ts.append(t)
+            if t <= t_max_2:
+                x, d = x_2(u_2), d_2(u_2)
+                if (d != 0 and not isinf(x)) if with_distance else a < x < b:
+                    xs.append(x)
+                    ds.append(d)
+                    ws.append(w_2)
+                    ts.append(-t)
+        terms = []
+        terms_ts = []
+        for w, y, t in zip(ws, evaluate(xs, ds, ts), ts):
+            term = w * y
+            if isfinite(term) or abs(t) < 1:    # the overflows in the tails are dropped
+                terms.append(term)
+                terms_ts.append(t)
+        return terms, terms_ts, len(xs)
+
+    terms, ts, n_evals = level_terms(0, inf, inf)
+    terms.append(pi / 2 * evaluate([center], [center - a if isinf(b) or not isinf(a) else center - b], [0.])[0])
+    n_evals += 1
+    total = _pairwise_sum(terms)
+    # drop the tails which are not significant at the level 0
+    threshold = _EPS**2 * sum(abs(term) for term in terms)
+    t_max_1 = t_max_2 = 0.
+    for term, t in zip(terms, ts):
+        if abs(term) > threshold:
+            if t > 0:
+                t_max_1 = max(t_max_1, t + 1)
+            else:
+                t_max_2 = max(t_max_2, -t + 1)
+    value = total * scale
+    error = inf
+    level = 0
+    for level in range(1, max_level + 1):
+        terms, _, n_level = level_terms(level, t_max_1, t_max_2)
+        n_evals += n_level
+        total += _pairwise_sum(terms)
+        value, value_old = total * scale / 2**level, value
+        error = abs(value - value_old)
+        if error <= max(atol, rtol * abs(value)):
+            break
+    record("double_exponential", iterations=level)
+    return QuadResult(value, error, n_evals)
+
+def _Simpson_pair(h1: Number, h2: Number, y0: Number, y1: Number, y2: Number) -> Tuple[Number, Number]:
+    """The integrals of the quadratic through (x0, y0), (x1, y1), (x2, y2) over [x0, x1] and [x1, x2], 
+        with h1 = x1 - x0, h2 = x2 - x1. Their sum is the Simpson's rule on [x0, x2].
+    """
+    if h1 == h2:
+        return h1 * (5 * y0 + 8 * y1 - y2) / 12, h1 * (-y0 + 8 * y1 + 5 * y2) / 12
+    H = h1 + h2
+    a0 = (h1 / 3 + h2 / 2) / H
+    c0 = -h1 * h1 / (6 * H * h2)
+    a2 = (h2 / 3 + h1 / 2) / H
+    c2 = -h2 * h2 / (6 * H * h1)
+    return h1 * (a0 * y0 + (1 - a0 - c0) * y1 + c0 * y2), h2 * (a2 * y2 + (1 - a2 - c2) * y1 + c2 * y0)
+
+class CumulativeIntegral:
+    """Running integral of sampled data, consumed chunk by chunk with O(chunk) memory.
+    `update` returns the running integrals at the new samples which are already determined, 
+    and `finish` returns the remaining ones after the last chunk. 
+    Feeding a series in any chunks gives the same results as `cumulative_trapezoid` or `cumulative_simpson` at once.
+
+    For "Simpson", the samples are taken by pairs of intervals, integrating the quadratic through 3 samples 
+    (so that the results at the even samples are the composite Simpson's rule), 
+    hence the result at an odd sample is only returned after the next sample has arrived.
+    An odd last interval is integrated with the quadratic through the last 3 samples, 
+    and with only 2 samples in total, the trapezoid rule is used.
+
+    Attributes:
+        value (Number): the integral up to the last determined sample
+    """
+    def __init__(self, method: str = "trapezoid", dx: Number = 1.0, initial: Number = 0.):
+        """
+        Args:
+            method (str, optional): "trapezoid" or "Simpson". Defaults to "trapezoid".
+            dx (Number, optional): the step of a uniform grid, ignored when xs are given to `update`. Defaults to 1.0.
+            initial (Number, optional): the value at the first sample. Defaults to 0..
+        """
+        method = method.lower()
+        if method not in ["trapezoid", "simpson"]:
+            raise ValueError("Unkown method: {}. Must be 'trapezoid' or 'Simpson'".format(method))
+        self.method = method
+        self.dx = dx
+        self.value = initial
+        self._xs = []       # the samples carried over, whose results are not returned yet (but the first one)
+        self._ys = []
+        self._before = None     # (x, y) of the sample before the carried ones
+        self._uniform = None
+
+    def update(self, ys: Sequence[Number], xs: Optional[Sequence[Number]] = None) -> array:
+        """Consume a chunk of samples.
+
+        Args:
+            ys (Sequence[Number]): the samples
+            xs (Optional[Sequence[Number]], optional): the increasing points of the samples on a non-uniform grid, 
+                must be given for all the chunks or for none. Defaults to None.
+
+        Raises:
+            ValueError: raised when the lengths of xs and ys are different, or the grid type changes.
+
+        Returns:
+            array: the running integrals, as `array("d")`
+        """
+        if xs is not None and len(xs) != len(ys):
+            raise ValueError("xs and ys should be of same length.")
+        if self._uniform is None:
+            self._uniform = xs is None
+        elif self._uniform != (xs is None):
+            raise ValueError("xs must be given for all the chunks or for none.")
+        output = array("d")
+        if not len(ys):
+            return output
+        if xs is None:
+            xs = [0.] * len(ys)     # unused, the steps are dx
+        pending_xs, pending_ys = self._xs, self._ys
+        if not pending_ys and self._before is None:  # the first sample
+            output.append(self.value)
+        pending_xs.extend(xs)
+        pending_ys.extend(ys)
+        dx = self.dx
+        uniform = self._uniform
+        if self.method == "trapezoid":
+            value = self.value
+            x_last, y_last = pending_xs[0], pending_ys[0]
+            for x, y in zip(islice(pending_xs, 1, None), islice(pending_ys, 1, None)):
+                value += (dx if uniform else x - x_last) * (y_last + y) / 2
+                output.append(value)
+                x_last, y_last = x, y
+            self.value = value
+            del pending_xs[:-1], pending_ys[:-1]
+        else:
+            value = self.value
+            i = 0
+            while i + 2 < len(pending_ys):
+                x0, x1, x2 = pending_xs[i:i+3]
+                I_1, I_2 = _Simpson_pair(
+                    dx if uniform else x1 - x0, dx if uniform else x2 - x1, *pending_ys[i:i+3])
+                output.append(value + I_1)
+                value += I_1 + I_2
+                output.append(value)
+                i += 2
+            if i:
+                self._before = (pending_xs[i-1], pending_ys[i-1])
+                del pending_xs[:i], pending_ys[:i]
+            self.value = value
+        return output
+
+    def finish(self) -> array:
+        """The running integrals at the remaining samples after the last chunk.
+
+        Returns:
+            array: the running integrals, as `array("d")`
+        """
+        output = array("d")
+        if self.method == "simpson" and len(self._ys) == 2:
+            (x1, x2), (y1, y2) = self._xs, self._ys
+            h2 = self.dx if self._uniform else x2 - x1
+            if self._before is None:
+                self.value += h2 * (y1 + y2) / 2
+            else:
+                x0, y0 = self._before
+                self.value += _Simpson_pair(self.dx if self._uniform else x1 - x0, h2, y0, y1, y2)[1]
+                self._before = (x1, y1)
+            del self._xs[0], self._ys[0]
+            output.append(self.value)
+        return output
+
+def _cumulative(method: str, ys: Sequence[Number], dx: Number, xs: Optional[Sequence[Number]], 
+        initial: Number) -> array:
+    integral = CumulativeIntegral(method, dx, initial)
+    output = integral.update(ys, xs)
+    output.extend(integral.finish())
+    return output
+
+def cumulative_trapezoid(ys: Sequence[Number], dx: Number = 1.0, xs: Optional[Sequence[Number]] = None, 
+        initial: Number = 0.) -> array:
+    """The running integral of sampled data by the trapezoid rule, 
+        on a uniform grid with step dx or on a non-uniform grid xs.
+
+    Args:
+        ys (Sequence[Number]): the samples
+        dx (Number, optional): the step of the uniform grid. Defaults to 1.0.
+        xs (Optional[Sequence[Number]], optional): the increasing points of a non-uniform grid, 
+            if given, dx is ignored. Defaults to None.
+        initial (Number, optional): the value at the first sample. Defaults to 0..
+
+    Returns:
+        array: the integrals from the first sample to each sample, as a compact `array("d")` of the length of ys
+    """
+    return _cumulative("trapezoid", ys, dx, xs, initial)
+
+def cumulative_simpson(ys: Sequence[Number], dx: Number = 1.0, xs: Optional[Sequence[Number]] = None, 
+        initial: Number = 0.) -> array:
+    """The running integral of sampled data by the Simpson's rule (see `CumulativeIntegral`), 
+        on a uniform grid with step dx or on a non-uniform grid xs.
+
+    Args:
+        ys (Sequence[Number]): the samples
+        dx (Number, optional): the step of the uniform grid. Defaults to 1.0.
+        xs (Optional[Sequence[Number]], optional): the increasing points of a non-uniform grid, 
+            if given, dx is ignored. Defaults to None.
+        initial (Number, optional): the value at the first sample. Defaults to 0..
+
+    Returns:
+        array: the integrals from the first sample to each sample, as a compact `array("d")` of the length of ys
+    """
+    return _cumulative("Simpson", ys, dx, xs, initial)
 
 def Riemann_sum(f: Callable[[Number], Number], 
         partition: List[Number], 
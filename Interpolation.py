@@ -1,11 +1,25 @@
 """
     1D Interpolation
     interpolate_lagrange and interpolate_Hermite available now
+    Piecewise cubic interpolation: CubicSpline and PchipInterpolator
+    Barycentric Lagrange interpolation: BarycentricInterpolator
+    Streaming Newton (and Hermite) interpolation: NewtonInterpolator
+    N-D Interpolation on regular and rectilinear grids: GridInterpolator
+    Chebyshev surrogates of expensive functions: chebfun and ChebyshevSurrogate
 """
+from bisect import bisect_right
+from cmath import exp as cexp
+from collections import OrderedDict
+from itertools import product
+import os
+import pickle
 from numbers import Number
-from math import factorial
+from math import comb, cos, factorial, pi, prod, sin
 from itertools import islice
+from typing import Callable, List, Optional, Sequence, Tuple, Union
+from ._const import _EPS
 from .Polynomial import Polynomial, zero_poly
+from .LinearAlgebra import solve_tridiagonal, solve_cyclic_tridiagonal
 
 def interpolate_Lagrange(xs: "list[Number]", ys: "list[Number]") -> Polynomial:
     """return a Lagrange polynomial interpolated with Newton difference method.
@@ -94,4 +108,1013 @@ def div_diff(xs: "list[Number]", ys: "list[Number]"):
 
         div_diff.append(next_depth)
 
-    return div_diff
\ No newline at end of file
+    return div_diff
+
+class PiecewisePolynomial:
+    """Piecewise polynomial on the breakpoints xs, so that for xs[i] <= x < xs[i+1]
+        P(x) = coeffs[i][0] + coeffs[i][1] * (x - xs[i]) + ... + coeffs[i][d] * (x - xs[i])**d
+
+    The interval containing x is found by bisection in O(log n), and the last interval is cached
+    so that sorted (e.g. increasing) queries are found in O(1).
+    Points out of [xs[0], xs[-1]] are extrapolated by the first or the last pieces, 
+    or wrapped into the interval when periodic is True.
+    """
+    def __init__(self, xs: "list[Number]", coeffs: "list[list[Number]]", periodic: bool = False):
+        """
+        Args:
+            xs (list[Number]): strictly increasing breakpoints [x_0, ..., x_{n-1}]
+            coeffs (list[list[Number]]): n-1 lists of local factors, coeffs[i][k] is the factor of (x - xs[i])**k
+            periodic (bool, optional): if the function is periodic with period xs[-1] - xs[0]. Defaults to False.
+
+        Raises:
+            ValueError: raised when xs are not strictly increasing or the number of pieces mismatches.
+        """
+        if len(xs) < 2:
+            raise ValueError("At least 2 breakpoints are required.")
+        if len(coeffs) != len(xs) - 1:
+            raise ValueError("The number of pieces should be len(xs) - 1.")
+        for x_i, x_ip1 in zip(xs, islice(xs, 1, None)):
+            if not x_i < x_ip1:
+                raise ValueError("xs should be strictly increasing.")
+        self.xs = list(xs)
+        self.coeffs = [list(c) for c in coeffs]
+        self.periodic = periodic
+        self._last = 0  # cache of the last interval found
+
+    def _find_interval(self, x: Number) -> int:
+        xs = self.xs
+        i = self._last
+        if xs[i] <= x < xs[i+1]:
+            return i
+        if i + 2 < len(xs) and xs[i+1] <= x < xs[i+2]:
+            i += 1
+        else:
+            i = min(max(bisect_right(xs, x) - 1, 0), len(xs) - 2)
+        self._last = i
+        return i
+
+    def _wrap(self, x: Number) -> Number:
+        if self.periodic:
+            x_0, x_N = self.xs[0], self.xs[-1]
+            if not x_0 <= x < x_N:
+                x = x_0 + (x - x_0) % (x_N - x_0)
+        return x
+
+    def _eval(self, x: Number, nu: int) -> Number:
+        x = self._wrap(x)
+        i = self._find_interval(x)
+        factors = self.coeffs[i]
+        dx = x - self.xs[i]
+        y = 0.
+        for k in range(len(factors) - 1, nu - 1, -1):
+            factor = factors[k]
+            for j in range(nu):
+                factor *= k - j
+            y = y * dx + factor
+        return y
+
+    def __call__(self, x: Union[Number, Sequence[Number]], nu: int = 0) -> Union[Number, List[Number]]:
+        """Evaluate the nu-th derivative of the piecewise polynomial at x.
+
+        Args:
+            x (Number | Sequence[Number]): a point, or a sequence of points (evaluated in batch).
+            nu (int, optional): the order of derivative. Defaults to 0.
+
+        Returns:
+            Number | List[Number]: the value(s) at x
+        """
+        if nu < 0:
+            raise ValueError("The order of derivative 'nu' should be non-negative.")
+        if isinstance(x, Number):
+            return self._eval(x, nu)
+        return [self._eval(x_i, nu) for x_i in x]
+
+    def diff(self, n: int = 1) -> "PiecewisePolynomial":
+        """Return the n-th derivative as a PiecewisePolynomial"""
+        coeffs = []
+        for factors in self.coeffs:
+            diff_factors = []
+            for k in range(n, len(factors)):
+                factor = factors[k]
+                for j in range(n):
+                    factor *= k - j
+                diff_factors.append(factor)
+            coeffs.append(diff_factors or [0.])
+        return PiecewisePolynomial(self.xs, coeffs, self.periodic)
+
+    def antiderivative(self) -> "PiecewisePolynomial":
+        """Return the antiderivative F with F(xs[0]) = 0 as a (non-periodic) PiecewisePolynomial"""
+        coeffs = []
+        F_i = 0.
+        for i, factors in enumerate(self.coeffs):
+            int_factors = [F_i] + [factor / (k + 1) for k, factor in enumerate(factors)]
+            coeffs.append(int_factors)
+            dx = self.xs[i+1] - self.xs[i]
+            F_i = 0.
+            for factor in reversed(int_factors):
+                F_i = F_i * dx + factor
+        return PiecewisePolynomial(self.xs, coeffs)
+
+    def integrate(self, a: Number, b: Number) -> Number:
+        """The definite integral from a to b"""
+        if self.periodic:
+            x_0, x_N = self.xs[0], self.xs[-1]
+            period = x_N - x_0
+            F = self.antiderivative()
+            F_period = F(x_N)
+
+            def F_periodic(x):
+                n_period, _ = divmod(x - x_0, period)
+                return n_period * F_period + F(self._wrap(x))
+            return F_periodic(b) - F_periodic(a)
+        F = self.antiderivative()
+        return F(b) - F(a)
+
+class _CubicHermite(PiecewisePolynomial):
+    """Piecewise cubic Hermite interpolant from values ys and slopes ms at xs"""
+    def __init__(self, xs: "list[Number]", ys: "list[Number]", ms: "list[Number]", periodic: bool = False):
+        coeffs = []
+        for i in range(len(xs) - 1):
+            h = xs[i+1] - xs[i]
+            slope = (ys[i+1] - ys[i]) / h
+            c2 = (3 * slope - 2 * ms[i] - ms[i+1]) / h
+            c3 = (ms[i] + ms[i+1] - 2 * slope) / h**2
+            coeffs.append([ys[i], ms[i], c2, c3])
+        super().__init__(xs, coeffs, periodic)
+        self.ys = list(ys)
+
+def _check_xy(xs: "list[Number]", ys: "list[Number]") -> Tuple[List[Number], List[Number]]:
+    n = len(xs)
+    if n != len(ys):
+        raise ValueError("xs and ys should be of same length.")
+    if n < 2:
+        raise ValueError("At least 2 points are required.")
+    hs = [xs[i+1] - xs[i] for i in range(n - 1)]
+    for h in hs:
+        if h <= 0:
+            raise ValueError("xs should be strictly increasing.")
+    slopes = [(ys[i+1] - ys[i]) / h for i, h in enumerate(hs)]
+    return hs, slopes
+
+class CubicSpline(_CubicHermite):
+    """Cubic spline interpolation (C2 piecewise cubic polynomial). 
+        The slopes at xs are solved from a tridiagonal system in O(n).
+
+    Supported boundary conditions `bc`:
+        "not-a-knot" (default): the third derivative is continuous at xs[1] and xs[-2].
+        "natural": the second derivatives at both ends are zero.
+        "clamped": the first derivatives at both ends are given by `dydx`.
+        "periodic": ys[0] == ys[-1] and y', y'' are periodic too.
+
+    Example:
+        >>> S = CubicSpline([0, 1, 2, 3], [0, 1, 8, 27])
+        >>> S(1.5), S([0.5, 2.5], nu=1), S.integrate(0, 3)
+    """
+    def __init__(self, xs: "list[Number]", ys: "list[Number]", bc: str = "not-a-knot", 
+            dydx: Tuple[Number, Number] = (0., 0.)):
+        """
+        Args:
+            xs (list[Number]): strictly increasing points
+            ys (list[Number]): values
+            bc (str, optional): boundary condition, one of 
+                "not-a-knot", "natural", "clamped" and "periodic". Defaults to "not-a-knot".
+            dydx (Tuple[Number, Number], optional): the derivatives at xs[0] and xs[-1], 
+                only used when bc is "clamped". Defaults to (0., 0.).
+
+        Raises:
+            ValueError: raised when the inputs are invalid or bc is unknown.
+        """
+        bc = bc.lower()
+        ms = self.slopes(xs, ys, bc, dydx)
+        super().__init__(xs, ys, ms, periodic=bc == "periodic")
+        self.bc = bc
+
+    @classmethod
+    def slopes(cls, xs: "list[Number]", ys: "list[Number]", bc: str = "not-a-knot", 
+            dydx: Tuple[Number, Number] = (0., 0.)) -> List[Number]:
+        """The first derivatives of the cubic spline at xs, solved in O(n). 
+            See `CubicSpline` for the arguments.
+        """
+        hs, slopes = _check_xy(xs, ys)
+        n = len(xs)
+        bc = bc.lower()
+        if bc == "clamped":
+            ms = cls._clamped_slopes(hs, slopes, *dydx)
+        elif bc == "natural":
+            ms = cls._natural_slopes(hs, slopes)
+        elif bc in ["not-a-knot", "not_a_knot", "not a knot"]:
+            if n == 2:
+                ms = [slopes[0]] * 2
+            elif n == 3:    # the not-a-knot spline is the parabola through the 3 points
+                f_012 = (slopes[1] - slopes[0]) / (xs[2] - xs[0])
+                ms = [slopes[0] + f_012 * (2 * x_i - xs[0] - xs[1]) for x_i in xs]
+            else:
+                ms = cls._not_a_knot_slopes(xs, hs, slopes)
+        elif bc == "periodic":
+            if ys[0] != ys[-1]:
+                raise ValueError("ys[0] and ys[-1] should be equal for periodic boundary condition.")
+            ms = cls._periodic_slopes(hs, slopes)
+        else:
+            raise ValueError("Unknown boundary condition: {}. Must be one of {}".format(
+                bc, ["not-a-knot", "natural", "clamped", "periodic"]))
+        return ms
+
+    @staticmethod
+    def _interior_system(hs: "list[Number]", slopes: "list[Number]"):
+        n = len(hs) + 1
+        a = [0.] * n
+        b = [0.] * n
+        c = [0.] * n
+        d = [0.] * n
+        for i in range(1, n - 1):
+            a[i] = hs[i]
+            b[i] = 2 * (hs[i-1] + hs[i])
+            c[i] = hs[i-1]
+            d[i] = 3 * (hs[i] * slopes[i-1] + hs[i-1] * slopes[i])
+        return a, b, c, d
+
+    @classmethod
+    def _clamped_slopes(cls, hs, slopes, dydx_0, dydx_N):
+        a, b, c, d = cls._interior_system(hs, slopes)
+        b[0], d[0] = 1., dydx_0
+        b[-1], d[-1] = 1., dydx_N
+        return solve_tridiagonal(a, b, c, d)
+
+    @classmethod
+    def _natural_slopes(cls, hs, slopes):
+        a, b, c, d = cls._interior_system(hs, slopes)
+        b[0], c[0], d[0] = 2., 1., 3 * slopes[0]
+        a[-1], b[-1], d[-1] = 1., 2., 3 * slopes[-1]
+        return solve_tridiagonal(a, b, c, d)
+
+    @classmethod
+    def _not_a_knot_slopes(cls, xs, hs, slopes):
+        a, b, c, d = cls._interior_system(hs, slopes)
+        span = xs[2] - xs[0]
+        b[0], c[0] = hs[1], span
+        d[0] = ((hs[0] + 2 * span) * hs[1] * slopes[0] + hs[0]**2 * slopes[1]) / span
+        span = xs[-1] - xs[-3]
+        a[-1], b[-1] = span, hs[-2]
+        d[-1] = (hs[-1]**2 * slopes[-2] + (2 * span + hs[-1]) * hs[-2] * slopes[-1]) / span
+        return solve_tridiagonal(a, b, c, d)
+
+    @staticmethod
+    def _periodic_slopes(hs, slopes):
+        # unknowns m_0, ..., m_{n-2}, with m_{n-1} = m_0
+        n = len(hs)
+        if n == 1:
+            return [slopes[0]] * 2
+        a = [hs[i] for i in range(n)]
+        b = [2 * (hs[i-1] + hs[i]) for i in range(n)]
+        c = [hs[i-1] for i in range(n)]
+        d = [3 * (hs[i] * slopes[i-1] + hs[i-1] * slopes[i]) for i in range(n)]
+        if n == 2:  # a 2x2 system, where the sub- and super-diagonal elements overlap the corners
+            A01 = a[0] + c[0]
+            A10 = a[1] + c[1]
+            det = b[0] * b[1] - A01 * A10
+            m_0 = (d[0] * b[1] - A01 * d[1]) / det
+            m_1 = (b[0] * d[1] - A10 * d[0]) / det
+            return [m_0, m_1, m_0]
+        ms = solve_cyclic_tridiagonal(a, b, c, d)
+        ms.append(ms[0])
+        return ms
+
+class PchipInterpolator(_CubicHermite):
+    """Piecewise Cubic Hermite Interpolating Polynomial (PCHIP, C1 and monotone).
+        The slopes are the weighted harmonic means of the adjacent secants (Fritsch-Carlson), 
+        and zero at local extrema, so the interpolant never overshoots monotone data.
+
+    Reference: 
+    F. N. Fritsch and J. Butland, A method for constructing local monotone piecewise cubic interpolants, 
+    SIAM J. Sci. Comput., 5(2), 300-304 (1984).
+    """
+    def __init__(self, xs: "list[Number]", ys: "list[Number]"):
+        """
+        Args:
+            xs (list[Number]): strictly increasing points
+            ys (list[Number]): values
+        """
+        hs, slopes = _check_xy(xs, ys)
+        n = len(xs)
+        if n == 2:
+            ms = [slopes[0]] * 2
+        else:
+            ms = [0.] * n
+            for k in range(1, n - 1):
+                s_l, s_r = slopes[k-1], slopes[k]
+                if s_l * s_r <= 0:
+                    continue
+                w_l = 2 * hs[k] + hs[k-1]
+                w_r = hs[k] + 2 * hs[k-1]
+                ms[k] = (w_l + w_r) / (w_l / s_l + w_r / s_r)
+            ms[0] = self._edge_slope(hs[0], hs[1], slopes[0], slopes[1])
+            ms[-1] = self._edge_slope(hs[-1], hs[-2], slopes[-1], slopes[-2])
+        super().__init__(xs, ys, ms)
+
+    @staticmethod
+    def _edge_slope(h_0: Number, h_1: Number, s_0: Number, s_1: Number) -> Number:
+        """One-sided three-point slope, modified to preserve the shape"""
+        m = ((2 * h_0 + h_1) * s_0 - h_0 * s_1) / (h_0 + h_1)
+        if m * s_0 <= 0:
+            return 0.
+        if s_0 * s_1 < 0 and abs(m) > 3 * abs(s_0):
+            return 3 * s_0
+        return m
+
+
+def barycentric_weights(xs: "list[Number]") -> List[Number]:
+    """Barycentric weights w_j = 1 / prod(x_j - x_k for k != j) in O(n^2).
+
+    Args:
+        xs (list[Number]): distinct points
+
+    Raises:
+        ValueError: raised when xs are not distinct
+
+    Returns:
+        List[Number]: the weights
+    """
+    ws = []
+    for j, x_j in enumerate(xs):
+        w = 1.
+        for k, x_k in enumerate(xs):
+            if k != j:
+                if x_j == x_k:
+                    raise ValueError("xs should be distinct.")
+                w *= x_j - x_k
+        ws.append(1 / w)
+    return ws
+
+def equispaced_weights(n: int) -> List[int]:
+    """Closed-form barycentric weights of n equispaced points in O(n), up to a common factor:
+        w_j = (-1)**j * comb(n - 1, j)
+    """
+    return [(-1)**j * comb(n - 1, j) for j in range(n)]
+
+def Chebyshev_points(n: int, a: Number = -1, b: Number = 1, kind: int = 2) -> List[float]:
+    """n Chebyshev points in [a, b] in increasing order.
+
+    Args:
+        n (int): the number of points
+        a, b (Number, optional): the interval. Defaults to -1 and 1.
+        kind (int, optional): 1 for the roots of T_n (Chebyshev-Gauss points), 
+            2 for the extrema of T_{n-1} (Chebyshev-Lobatto points, endpoints included). Defaults to 2.
+
+    Returns:
+        List[float]: the points
+    """
+    if kind == 1:
+        ts = [-cos((2*j + 1) * pi / (2*n)) for j in range(n)]
+    elif kind == 2:
+        if n == 1:
+            ts = [0.]
+        else:
+            ts = [-cos(j * pi / (n - 1)) for j in range(n)]
+    else:
+        raise ValueError("kind should be 1 or 2.")
+    return [(a + b) / 2 + (b - a) / 2 * t for t in ts]
+
+def Chebyshev_weights(n: int, kind: int = 2) -> List[float]:
+    """Closed-form barycentric weights of the n Chebyshev points from `Chebyshev_points` in O(n), 
+        up to a common factor:
+        kind 1: w_j = (-1)**j * sin((2j + 1) pi / (2n))
+        kind 2: w_j = (-1)**j, halved for j = 0 and j = n - 1
+    """
+    if kind == 1:
+        ws = [(-1)**j * sin((2*j + 1) * pi / (2*n)) for j in range(n)]
+    elif kind == 2:
+        ws = [float((-1)**j) for j in range(n)]
+        ws[0] /= 2
+        ws[-1] /= 2
+    else:
+        raise ValueError("kind should be 1 or 2.")
+    return ws
+
+class BarycentricInterpolator:
+    """Lagrange interpolation polynomial in the (second, true) barycentric form:
+        p(x) = sum(w_j y_j / (x - x_j)) / sum(w_j / (x - x_j))
+
+    Weights are computed once in O(n^2) (or given in closed form in O(n)), 
+    then each evaluation costs O(n), and a node can be added in O(n).
+    This is numerically stable for Chebyshev points, unlike the monomial basis used by `interpolate_Lagrange`.
+
+    Reference: 
+    J.-P. Berrut and L. N. Trefethen, Barycentric Lagrange interpolation, SIAM Review 46(3), 501-517 (2004).
+    """
+    def __init__(self, xs: "list[Number]", ys: "list[Number]", weights: "Optional[list[Number]]" = None):
+        """
+        Args:
+            xs (list[Number]): distinct points
+            ys (list[Number]): values
+            weights (list[Number], optional): barycentric weights (up to a common factor). 
+                If None (default), computed by `barycentric_weights` in O(n^2).
+
+        Raises:
+            ValueError: raised when the lengths of xs, ys (and weights) are different.
+        """
+        if len(xs) != len(ys):
+            raise ValueError("xs and ys should be of same length.")
+        if weights is None:
+            weights = barycentric_weights(xs)
+        elif len(weights) != len(xs):
+            raise ValueError("xs and weights should be of same length.")
+        self.xs = list(xs)
+        self.ys = list(ys)
+        self.weights = list(weights)
+
+    @classmethod
+    def from_equispaced(cls, a: Number, b: Number, ys: "list[Number]") -> "BarycentricInterpolator":
+        """Interpolate ys at len(ys) equispaced points in [a, b] with closed-form weights"""
+        n = len(ys)
+        if n == 1:
+            return cls([a], ys, [1.])
+        dx = (b - a) / (n - 1)
+        return cls([a + i * dx for i in range(n)], ys, equispaced_weights(n))
+
+    @classmethod
+    def from_Chebyshev(cls, a: Number, b: Number, ys: "list[Number]", kind: int = 2) -> "BarycentricInterpolator":
+        """Interpolate ys at the len(ys) Chebyshev points of `Chebyshev_points(len(ys), a, b, kind)` 
+            with closed-form weights"""
+        n = len(ys)
+        return cls(Chebyshev_points(n, a, b, kind), ys, Chebyshev_weights(n, kind))
+
+    def add_node(self, x: Number, y: Number):
+        """Add a node (x, y) in O(n), updating the weights without recomputing them.
+
+        Raises:
+            ValueError: raised when x is already a node.
+        """
+        xs, ws = self.xs, self.weights
+        if not xs:
+            w_new = 1.
+        else:
+            # keep the common factor of the weights: w_new / w_0 = prod((x_0 - x_k) / (x_new - x_k))
+            x_0 = xs[0]
+            if x == x_0:
+                raise ValueError("x is already a node.")
+            w_new = ws[0] / (x - x_0)
+            for x_k in islice(xs, 1, None):
+                if x == x_k:
+                    raise ValueError("x is already a node.")
+                w_new *= (x_0 - x_k) / (x - x_k)
+            for j, x_j in enumerate(xs):
+                ws[j] /= x_j - x
+        xs.append(x)
+        ws.append(w_new)
+        self.ys.append(y)
+
+    def _eval(self, x: Number) -> Number:
+        numerator = 0.
+        denominator = 0.
+        for x_j, y_j, w_j in zip(self.xs, self.ys, self.weights):
+            dx = x - x_j
+            if dx == 0:
+                return y_j
+            w_dx = w_j / dx
+            numerator += w_dx * y_j
+            denominator += w_dx
+        return numerator / denominator
+
+    def __call__(self, x: Union[Number, Sequence[Number]]) -> Union[Number, List[Number]]:
+        """Evaluate the interpolant at a point x, or at a sequence of points in batch"""
+        if isinstance(x, Number):
+            return self._eval(x)
+        return [self._eval(x_i) for x_i in x]
+
+
+class NewtonInterpolator:
+    """Newton interpolation polynomial built incrementally from a stream of samples:
+        p(x) = c_0 + c_1 (x - z_0) + ... + c_{k} (x - z_0)...(x - z_{k-1})
+    where c_j = f[z_0, ..., z_j] are divided differences.
+
+    Only the last diagonal of the divided difference table, f[z_{k-j}, ..., z_k] for j = 0, ..., k, 
+    is kept, so `append` costs O(n) time and the memory is O(n).
+    Derivative data can be appended as well (Hermite interpolation), 
+    in which case the node is repeated once per given derivative.
+
+    Example:
+        >>> P = NewtonInterpolator()
+        >>> P.append(0, 1); P.append(1, [2, 2])     # f(0) = 1, f(1) = 2, f'(1) = 2
+        >>> P(0.5)
+    """
+    def __init__(self, xs: "Optional[list[Number]]" = None, ys: "Optional[list]" = None):
+        """
+        Args:
+            xs (list[Number], optional): initial points. Defaults to None.
+            ys (list, optional): initial values, each one a Number or [y, y', ..., y^(m)]. Defaults to None.
+        """
+        self.zs: List[Number] = []  # the nodes, repeated for derivative data
+        self.coeffs: List[Number] = []  # c_j = f[z_0, ..., z_j]
+        self._diag: List[Number] = []   # _diag[j] = f[z_{k-j}, ..., z_k]
+        if xs is not None:
+            if ys is None or len(xs) != len(ys):
+                raise ValueError("xs and ys should be of same length.")
+            for x, y in zip(xs, ys):
+                self.append(x, y)
+
+    def __len__(self) -> int:
+        return len(self.zs)
+
+    @property
+    def degree(self) -> int:
+        return len(self.zs) - 1
+
+    def append(self, x: Number, y: "Union[Number, list[Number]]"):
+        """Add a sample in O(n).
+
+        Args:
+            x (Number): the point
+            y (Number | list[Number]): the value f(x), or [f(x), f'(x), ..., f^(m)(x)] 
+
+        Raises:
+            ValueError: raised when x is already a node, including the last appended one, 
+                since the Hermite data of a node must be given at once.
+        """
+        if isinstance(y, Number):
+            y = [y]
+        zs, diag = self.zs, self._diag
+        for r in range(len(y)):
+            K = len(zs)
+            new_diag = [y[0]]
+            for j in range(1, K + 1):
+                if j <= r:  # z_{K-j} = ... = z_K = x
+                    new_diag.append(y[j] / factorial(j))
+                else:
+                    dz = x - zs[K-j]
+                    if dz == 0:
+                        raise ValueError("The node {} already exists.".format(x))
+                    new_diag.append((new_diag[j-1] - diag[j-1]) / dz)
+            zs.append(x)
+            self.coeffs.append(new_diag[-1])
+            diag = new_diag
+        self._diag = diag
+
+    def _eval(self, x: Number) -> Number:
+        zs, coeffs = self.zs, self.coeffs
+        if not coeffs:
+            return 0.
+        y = coeffs[-1]
+        for k in range(len(coeffs) - 2, -1, -1):
+            y = y * (x - zs[k]) + coeffs[k]
+        return y
+
+    def __call__(self, x: Union[Number, Sequence[Number]]) -> Union[Number, List[Number]]:
+        """Evaluate the interpolant at a point x, or at a sequence of points in batch, with nested Newton form"""
+        if isinstance(x, Number):
+            return self._eval(x)
+        return [self._eval(x_i) for x_i in x]
+
+    def error_estimate(self, x: Number) -> Number:
+        """Estimate the error at x by the last Newton term c_k (x - z_0)...(x - z_{k-1})"""
+        zs, coeffs = self.zs, self.coeffs
+        if not coeffs:
+            return 0.
+        term = coeffs[-1]
+        for z in islice(zs, 0, len(zs) - 1):
+            term *= x - z
+        return abs(term)
+
+
+class GridInterpolator:
+    """Interpolation of values tabulated on a N-D rectilinear grid (axes[0] x axes[1] x ... x axes[d-1]).
+
+    Supported methods:
+        "linear": multilinear (bilinear, trilinear, ...) interpolation, 2**d values per point.
+        "cubic": Keys' cubic convolution on uniform axes, 4**d values per point, 
+            with the cubic extrapolation of Keys at the boundaries. 
+        "spline": tensor product cubic spline (bicubic, tricubic, ...), 
+            evaluated in the Hermite form from the values and the 2**d - 1 mixed spline derivatives, 
+            which are precomputed in O(2**d * N) time and memory.
+
+    The cell containing a point is found in O(1) on uniform axes, and by bisection on the others.
+    The values of "linear" and "cubic" are read from the buffer only when needed, 
+    so any flat sequence in C (row-major) order can be used, 
+    e.g. `memoryview(mmap.mmap(...)).cast("d")` or `array.array("d")`, without loading the table into lists.
+    With `cache_size`, the values used by each cell are gathered once and kept in a LRU cache.
+
+    Example:
+        >>> xs, ys = [0, 1, 2], [0, 1, 2, 3]
+        >>> G = GridInterpolator([xs, ys], [[x + y**2 for y in ys] for x in xs])
+        >>> G([0.5, 1.5]), G([[0.5, 1.5], [1, 2.5]])
+
+    Reference: 
+    R. Keys, Cubic convolution interpolation for digital image processing, 
+    IEEE Trans. Acoust., Speech, Signal Process., 29(6), 1153-1160 (1981).
+    """
+    def __init__(self, axes: "list[list[Number]]", values: "Sequence", method: str = "linear", 
+            fill_value: Optional[Number] = None, cache_size: Optional[int] = 0, bc: str = "not-a-knot"):
+        """
+        Args:
+            axes (list[list[Number]]): d strictly increasing sequences of grid points
+            values (Sequence): the tabulated values, either nested lists with shape (n_0, ..., n_{d-1}) 
+                or a flat buffer of length n_0 * ... * n_{d-1} in C (row-major) order.
+            method (str, optional): "linear", "cubic" or "spline". Defaults to "linear".
+            fill_value (Number, optional): the value out of the grid, if None, extrapolate. Defaults to None.
+            cache_size (int, optional): the max number of cells kept in the cache, 
+                0 for no cache and None for unlimited. Defaults to 0.
+            bc (str, optional): the boundary condition of "spline", see `CubicSpline`. Defaults to "not-a-knot".
+
+        Raises:
+            ValueError: raised when the axes or values are invalid, or method is unknown.
+        """
+        self.axes = [list(axis) for axis in axes]
+        self.shape = tuple(len(axis) for axis in self.axes)
+        self.ndim = len(self.shape)
+        for axis in self.axes:
+            if len(axis) < 2:
+                raise ValueError("Each axis should have at least 2 points.")
+            for x_i, x_ip1 in zip(axis, islice(axis, 1, None)):
+                if not x_i < x_ip1:
+                    raise ValueError("Each axis should be strictly increasing.")
+        self.strides = tuple(prod(self.shape[k+1:]) for k in range(self.ndim))
+
+        if self.ndim > 1 and not isinstance(values[0], Number):
+            for _ in range(self.ndim - 1):
+                values = [v for sub in values for v in sub]
+        if len(values) != prod(self.shape):
+            raise ValueError("The number of values cannot fit the shape of the grid {}.".format(self.shape))
+
+        # (x_0, h) for uniform axes, None for others
+        self._uniform = []
+        for axis in self.axes:
+            n = len(axis)
+            h = (axis[-1] - axis[0]) / (n - 1)
+            TOL = 1e-10 * abs(axis[-1] - axis[0])
+            if all(abs(x_i - axis[0] - i * h) <= TOL for i, x_i in enumerate(axis)):
+                self._uniform.append((axis[0], h))
+            else:
+                self._uniform.append(None)
+
+        method = method.lower()
+        if method in ["linear", "multilinear", "bilinear", "trilinear"]:
+            self._stencil = self._stencil_linear
+            self._data = {0: values}
+        elif method in ["cubic", "cubic-convolution", "cubic convolution"]:
+            for n, uniform in zip(self.shape, self._uniform):
+                if uniform is None or n < 3:
+                    raise ValueError("Method 'cubic' requires uniform axes with at least 3 points.")
+            self._stencil = self._stencil_cubic
+            self._data = {0: values}
+        elif method in ["spline", "bicubic", "tricubic"]:
+            self._stencil = self._stencil_spline
+            self._data = self._spline_derivatives(values, bc)
+        else:
+            raise ValueError("Unknown method: {}. Must be one of {}".format(method, ["linear", "cubic", "spline"]))
+        self.method = method
+        self.fill_value = fill_value
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+
+    def _spline_derivatives(self, values: "Sequence", bc: str) -> dict:
+        """Mixed derivatives D_s f on the grid for each subset s of axes (as a bitmask)"""
+        data = {0: list(values)}
+        for mask in range(1, 2**self.ndim):
+            k = mask.bit_length() - 1   # differentiate along the highest axis in the mask
+            source = data[mask ^ (1 << k)]
+            derivative = [0.] * len(source)
+            axis, n, stride = self.axes[k], self.shape[k], self.strides[k]
+            outer = stride * n
+            for start_outer in range(0, len(source), outer):
+                for start in range(start_outer, start_outer + stride):
+                    line = source[start:start + outer:stride]
+                    ms = CubicSpline.slopes(axis, line, bc)
+                    derivative[start:start + outer:stride] = ms
+            data[mask] = derivative
+        return data
+
+    def _locate(self, k: int, x: Number) -> Tuple[int, Number]:
+        """The cell index i along axis k and the local coordinate t = (x - x_i) / h_i"""
+        axis = self.axes[k]
+        uniform = self._uniform[k]
+        if uniform is not None:
+            x_0, h = uniform
+            i = int((x - x_0) // h)
+            i = min(max(i, 0), len(axis) - 2)
+            return i, (x - x_0 - i * h) / h
+        i = min(max(bisect_right(axis, x) - 1, 0), len(axis) - 2)
+        return i, (x - axis[i]) / (axis[i+1] - axis[i])
+
+    def _stencil_linear(self, k: int, i: int, t: Number):
+        return [(i, 0), (i + 1, 0)], [1 - t, t]
+
+    def _stencil_cubic(self, k: int, i: int, t: Number):
+        a = -0.5
+        def W(s):
+            s = abs(s)
+            if s <= 1:
+                return ((a + 2) * s - (a + 3)) * s * s + 1
+            elif s < 2:
+                return ((a * s - 5 * a) * s + 8 * a) * s - 4 * a
+            return 0.
+        ws = [W(1 + t), W(t), W(1 - t), W(2 - t)]
+        n = self.shape[k]
+        if i == 0:  # f_{-1} = 3 f_0 - 3 f_1 + f_2
+            w_ghost = ws[0]
+            return [(0, 0), (1, 0), (2, 0)], [ws[1] + 3 * w_ghost, ws[2] - 3 * w_ghost, ws[3] + w_ghost]
+        if i == n - 2:  # f_n = 3 f_{n-1} - 3 f_{n-2} + f_{n-3}
+            w_ghost = ws[3]
+            return [(n - 3, 0), (n - 2, 0), (n - 1, 0)], [ws[0] + w_ghost, ws[1] - 3 * w_ghost, ws[2] + 3 * w_ghost]
+        return [(i - 1, 0), (i, 0), (i + 1, 0), (i + 2, 0)], ws
+
+    def _stencil_spline(self, k: int, i: int, t: Number):
+        axis = self.axes[k]
+        h = axis[i+1] - axis[i]
+        t2 = t * t
+        t3 = t2 * t
+        ws = [2*t3 - 3*t2 + 1, (t3 - 2*t2 + t) * h, -2*t3 + 3*t2, (t3 - t2) * h]
+        return [(i, 0), (i, 1), (i + 1, 0), (i + 1, 1)], ws
+
+    def _cell_values(self, cell: tuple, stencils: list) -> List[Number]:
+        cache_size = self.cache_size
+        if cache_size != 0:
+            cache = self._cache
+            try:
+                values = cache[cell]
+                cache.move_to_end(cell)
+                return values
+            except KeyError:
+                pass
+        data, strides = self._data, self.strides
+        values = []
+        for combo in product(*stencils):
+            flat = 0
+            mask = 0
+            for k, (idx, bit) in enumerate(combo):
+                flat += idx * strides[k]
+                mask |= bit << k
+            values.append(data[mask][flat])
+        if cache_size != 0:
+            cache[cell] = values
+            if cache_size is not None and len(cache) > cache_size:
+                cache.popitem(last=False)
+        return values
+
+    def _eval(self, point: "Sequence[Number]") -> Number:
+        if len(point) != self.ndim:
+            raise ValueError("The point should have {} coordinates.".format(self.ndim))
+        if self.fill_value is not None:
+            for x, axis in zip(point, self.axes):
+                if not axis[0] <= x <= axis[-1]:
+                    return self.fill_value
+        cell = []
+        stencils = []
+        weights = []
+        for k, x in enumerate(point):
+            i, t = self._locate(k, x)
+            stencil, ws = self._stencil(k, i, t)
+            cell.append(i)
+            stencils.append(stencil)
+            weights.append(ws)
+        values = self._cell_values(tuple(cell), stencils)
+        return sum(v * prod(ws) for v, ws in zip(values, product(*weights)))
+
+    def __call__(self, points: "Sequence") -> Union[Number, List[Number]]:
+        """Evaluate the interpolant at a point [x_0, ..., x_{d-1}], or at a sequence of points in batch"""
+        if isinstance(points[0], Number):
+            return self._eval(points)
+        return [self._eval(point) for point in points]
+
+
+def _fft(a: "list[Number]") -> List[complex]:
+    """Iterative radix-2 FFT: A_k = sum(a_j exp(-2 pi i j k / n)), where n = len(a) is a power of 2"""
+    n = len(a)
+    A = [complex(a_j) for a_j in a]
+    j = 0
+    for i in range(1, n):  # bit-reversal permutation
+        bit = n >> 1
+        while j & bit:
+            j ^= bit
+            bit >>= 1
+        j |= bit
+        if i < j:
+            A[i], A[j] = A[j], A[i]
+    length = 2
+    while length <= n:
+        w_length = cexp(-2j * pi / length)
+        half = length // 2
+        for start in range(0, n, length):
+            w = 1.
+            for k in range(start, start + half):
+                u = A[k]
+                v = A[k + half] * w
+                A[k] = u + v
+                A[k + half] = u - v
+                w *= w_length
+        length <<= 1
+    return A
+
+def _Chebyshev_coeffs(values: "list[Number]") -> List[float]:
+    """Chebyshev coefficients c_0, ..., c_N of the interpolant of values at t_j = cos(j pi / N), j = 0, ..., N,
+        computed in O(N log N) with a DCT-I (a FFT of the even extension), where N is a power of 2.
+    """
+    N = len(values) - 1
+    if N == 0:
+        return [float(values[0])]
+    extended = list(values) + values[-2:0:-1]
+    coeffs = [E_k.real / N for E_k in islice(_fft(extended), 0, N + 1)]
+    coeffs[0] /= 2
+    coeffs[-1] /= 2
+    return coeffs
+
+class ChebyshevSurrogate:
+    """A function on [a, b] represented by a Chebyshev series:
+        f(x) = sum(c_k T_k(t)), where t = (2x - a - b) / (b - a)
+
+    It is evaluated in O(n) with Clenshaw recurrence, and the derivative and the antiderivative 
+    are Chebyshev series as well. Instances are picklable, see `save` and `load`.
+    """
+    def __init__(self, coeffs: "list[Number]", a: Number = -1, b: Number = 1):
+        """
+        Args:
+            coeffs (list[Number]): Chebyshev coefficients [c_0, ..., c_n]
+            a, b (Number, optional): the interval. Defaults to -1 and 1.
+        """
+        if not a < b:
+            raise ValueError("b must be greater than a, but {} >= {}".format(a, b))
+        self.coeffs = list(coeffs) or [0.]
+        self.a = a
+        self.b = b
+
+    def __repr__(self):
+        return "ChebyshevSurrogate of degree {} on [{}, {}]".format(len(self.coeffs) - 1, self.a, self.b)
+
+    def __len__(self) -> int:
+        return len(self.coeffs)
+
+    def _eval(self, x: Number) -> Number:
+        t = (2 * x - self.a - self.b) / (self.b - self.a)
+        b_kp1 = b_kp2 = 0.
+        coeffs = self.coeffs
+        for k in range(len(coeffs) - 1, 0, -1):
+            b_kp1, b_kp2 = 2 * t * b_kp1 - b_kp2 + coeffs[k], b_kp1
+        return t * b_kp1 - b_kp2 + coeffs[0]
+
+    def __call__(self, x: Union[Number, Sequence[Number]]) -> Union[Number, List[Number]]:
+        """Evaluate the surrogate at a point x, or at a sequence of points in batch"""
+        if isinstance(x, Number):
+            return self._eval(x)
+        return [self._eval(x_i) for x_i in x]
+
+    def diff(self, n: int = 1) -> "ChebyshevSurrogate":
+        """Return the n-th derivative, exact for the series"""
+        coeffs = self.coeffs
+        scale = 2 / (self.b - self.a)
+        for _ in range(n):
+            m = len(coeffs) - 1
+            if m == 0:
+                coeffs = [0.]
+                break
+            diff_coeffs = [0.] * (m + 2)
+            for k in range(m, 0, -1):   # c'_{k-1} = c'_{k+1} + 2k c_k
+                diff_coeffs[k-1] = diff_coeffs[k+1] + 2 * k * coeffs[k]
+            diff_coeffs[0] /= 2
+            coeffs = [c * scale for c in diff_coeffs[:m]]
+        return ChebyshevSurrogate(coeffs, self.a, self.b)
+
+    def antiderivative(self) -> "ChebyshevSurrogate":
+        """Return the antiderivative F with F(a) = 0, exact for the series"""
+        coeffs = self.coeffs + [0., 0.]
+        m = len(self.coeffs)
+        scale = (self.b - self.a) / 2
+        int_coeffs = [0.] * (m + 1)
+        int_coeffs[1] = (2 * coeffs[0] - coeffs[2]) / 2 * scale
+        for k in range(2, m + 1):   # C_k = (c_{k-1} - c_{k+1}) / 2k
+            int_coeffs[k] = (coeffs[k-1] - coeffs[k+1]) / (2 * k) * scale
+        # F(a) = F(t = -1) = sum(C_k (-1)**k) = 0
+        int_coeffs[0] = -sum(C_k * (-1)**k for k, C_k in islice(enumerate(int_coeffs), 1, None))
+        return ChebyshevSurrogate(int_coeffs, self.a, self.b)
+
+    def integrate(self, a: Optional[Number] = None, b: Optional[Number] = None) -> Number:
+        """The definite integral from a to b, defaults to the whole interval"""
+        if a is None and b is None:
+            # int_{-1}^{1} T_k = 2 / (1 - k**2) for even k and 0 for odd k
+            return sum(2 * c / (1 - k**2) for k, c in enumerate(self.coeffs) if k % 2 == 0) * (self.b - self.a) / 2
+        F = self.antiderivative()
+        return F(self.b if b is None else b) - F(self.a if a is None else a)
+
+    def roots(self, TOL: float = 1e-15, Nmax: int = 100) -> List[float]:
+        """Real roots in [a, b] where the surrogate changes its sign (or vanishes on a sample point).
+
+        The surrogate is sampled on 4n Chebyshev points to bracket the roots, 
+        then each root is located by Newton's method safeguarded with bisection.
+        Roots of even multiplicity between the samples can be missed.
+        An endpoint counts as a root when the value there is within rounding error of 0.
+        """
+        a, b = self.a, self.b
+        M = 4 * len(self.coeffs)
+        xs = [(a + b) / 2 - (b - a) / 2 * cos(j * pi / M) for j in range(M + 1)]
+        ys = self(xs)
+        # the values are sums of the coefficients, rounding error ~ sum|c_k| * eps
+        zero_TOL = 8 * _EPS * sum(abs(c) for c in self.coeffs)
+        for j in (0, M):
+            if abs(ys[j]) <= zero_TOL:
+                ys[j] = 0
+        f_diff = self.diff()
+        roots = []
+        for j in range(M):
+            x_l, x_r = xs[j], xs[j+1]
+            y_l, y_r = ys[j], ys[j+1]
+            if y_l == 0:
+                roots.append(x_l)
+                continue
+            if y_l * y_r > 0 or y_r == 0:
+                continue
+            x = (x_l + x_r) / 2
+            for _ in range(Nmax):
+                y = self._eval(x)
+                if y == 0:
+                    break
+                if (y < 0) == (y_l < 0):
+                    x_l = x
+                else:
+                    x_r = x
+                dy = f_diff._eval(x)
+                x_next = x - y / dy if dy else (x_l + x_r) / 2
+                if not x_l < x_next < x_r:
+                    x_next = (x_l + x_r) / 2
+                if abs(x_next - x) <= TOL * max(abs(x), 1.):
+                    x = x_next
+                    break
+                x = x_next
+            roots.append(x)
+        if ys[-1] == 0:
+            roots.append(xs[-1])
+        return roots
+
+    def save(self, path: str):
+        """Save the surrogate into a file with pickle"""
+        with open(path, "wb") as file:
+            pickle.dump(self, file)
+
+    @staticmethod
+    def load(path: str) -> "ChebyshevSurrogate":
+        """Load a surrogate saved by `save`"""
+        with open(path, "rb") as file:
+            surrogate = pickle.load(file)
+        if not isinstance(surrogate, ChebyshevSurrogate):
+            raise TypeError("{} does not contain a ChebyshevSurrogate.".format(path))
+        return surrogate
+
+def chebfun(f: Callable[[Number], Number], a: Number = -1, b: Number = 1, 
+        TOL: float = 1e-14, N_min: int = 16, N_max: int = 2**16, 
+        cache_path: Optional[str] = None, args: tuple = (), **kwargs) -> ChebyshevSurrogate:
+    """Build a Chebyshev surrogate of an expensive function f on [a, b].
+
+    f is sampled at the N + 1 Chebyshev points cos(j pi / N), N = N_min, 2 N_min, ..., 
+    where every doubling reuses all the previous samples, 
+    until the trailing Chebyshev coefficients (computed with a DCT) decay below TOL * max(|c_k|). 
+    The negligible tail is then chopped.
+
+    Args:
+        f (Callable[[Number], Number]): the function to be approximated, smooth in [a, b]
+        a, b (Number, optional): the interval. Defaults to -1 and 1.
+        TOL (float, optional): relative tolerance of the coefficients. Defaults to 1e-14.
+        N_min (int, optional): the initial number of intervals, a power of 2. Defaults to 16.
+        N_max (int, optional): the max number of intervals. Defaults to 2**16.
+        cache_path (str, optional): if given and the file exists, the surrogate is loaded from it 
+            (without calling f), else the built surrogate is saved into it. Defaults to None.
+        args, **kwargs: to be passed to f
+
+    Raises:
+        ValueError: raised when N_min is not a power of 2.
+        Warning: raised when the coefficients did not decay with N_max.
+
+    Returns:
+        ChebyshevSurrogate: the surrogate
+    """
+    if cache_path is not None and os.path.exists(cache_path):
+        surrogate = ChebyshevSurrogate.load(cache_path)
+        if (surrogate.a, surrogate.b) != (a, b):
+            raise ValueError("The surrogate in {} is on [{}, {}] instead of [{}, {}].".format(
+                cache_path, surrogate.a, surrogate.b, a, b))
+        return surrogate
+    if N_min < 2 or N_min & (N_min - 1):
+        raise ValueError("N_min must be a power of 2.")
+
+    def f_t(t):
+        return f((a + b) / 2 + (b - a) / 2 * t, *args, **kwargs)
+
+    N = N_min
+    values = [f_t(cos(j * pi / N)) for j in range(N + 1)]
+    while True:
+        coeffs = _Chebyshev_coeffs(values)
+        scale = max(abs(c) for c in coeffs)
+        n_tail = max(4, N // 16)
+        if all(abs(c) <= TOL * scale for c in coeffs[-n_tail:]):
+            break
+        if 2 * N > N_max:
+            raise Warning("Chebyshev coefficients did not decay below TOL with N_max = {}".format(N_max))
+        N *= 2
+        new_values = [0.] * (N + 1)
+        new_values[::2] = values
+        for j in range(1, N, 2):
+            new_values[j] = f_t(cos(j * pi / N))
+        values = new_values
+
+    n = len(coeffs)
+    while n > 1 and abs(coeffs[n - 1]) <= TOL * scale:
+        n -= 1
+    surrogate = ChebyshevSurrogate(coeffs[:n], a, b)
+    if cache_path is not None:
+        surrogate.save(cache_path)
+    return surrogate
@@ -6,6 +6,7 @@ Idx = Union[int, Tuple[Union[int, slice], Union[int, slice]]]
 
 from ._util import _flatten
 from ._const import _EPS    # mechine error
+from .Profiling import instrumented, record
 
 Num = TypeVar("Num", bound=Number)
 
@@ -392,6 +393,7 @@ def matrixify(
             return func(A)
     return Mfunc
 
+@instrumented
 def solve_linear(A: Matrix[Num], b: Matrix[Number]) -> dict:
     """Solve a linear system with equations Ax = b, where A is a Matrix and b is a vector (i.e. (n, 1) Matrix).
 
@@ -414,6 +416,7 @@ def solve_linear(A: Matrix[Num], b: Matrix[Number]) -> dict:
     n, m = A.shape
     if (n, 1) != b.shape:
         raise ValueError ("The shape of A and b shall fit the linear equations Ax = b.")
+    record("solve_linear", matrix_size=(n, m))
     
     def idx_first_non_empty(A: Matrix[Num], i: int, j: int) -> Optional[int]:
         """Find the index of the first element that is not empty in between A[i, j] and A[n-1, j].
@@ -495,3 +498,146 @@ def solve_linear(A: Matrix[Num], b: Matrix[Number]) -> dict:
     sols["solable"] = True
 
     return sols
+
+
+def lu_factor(A: "Union[Matrix[Num], List[List[Num]]]") -> Tuple[List[List[Num]], List[int]]:
+    """LU decomposition PA = LU of a square matrix with partial pivoting (Doolittle), in O(n^3).
+    The factorization is meant to be reused by `lu_solve` for many right hand sides in O(n^2) each.
+    Complex matrices are supported.
+
+    Args:
+        A (Matrix[Num] | List[List[Num]]): the (n, n) matrix, not modified.
+
+    Raises:
+        ValueError: raised when A is not square or is singular.
+
+    Returns:
+        Tuple[List[List[Num]], List[int]]: (LU, pivots), where LU holds U on and above the diagonal
+            and the unit lower triangular L below, and row i was swapped with row pivots[i] at step i.
+    """
+    LU = [list(row) for row in (A.elements if isinstance(A, Matrix) else A)]
+    n = len(LU)
+    if any(len(row) != n for row in LU):
+        raise ValueError("The matrix should be square.")
+    pivots = [0] * n
+    for j in range(n):
+        p = max(range(j, n), key=lambda i: abs(LU[i][j]))
+        pivots[j] = p
+        if LU[p][j] == 0:
+            raise ValueError("The matrix is singular.")
+        if p != j:
+            LU[p], LU[j] = LU[j], LU[p]
+        row_j = LU[j]
+        pivot = row_j[j]
+        for i in range(j + 1, n):
+            row_i = LU[i]
+            K = row_i[j] / pivot
+            if K:
+                row_i[j] = K
+                for l in range(j + 1, n):
+                    row_i[l] -= K * row_j[l]
+            else:
+                row_i[j] = 0.
+    return LU, pivots
+
+def lu_solve(lu: Tuple[List[List[Num]], List[int]], b: List[Number]) -> List[Number]:
+    """Solve Ax = b with the factorization (LU, pivots) = `lu_factor(A)`.
+
+    Args:
+        lu (Tuple[List[List[Num]], List[int]]): the output of `lu_factor`
+        b (List[Number]): the right hand side, not modified.
+
+    Returns:
+        List[Number]: the solution x
+    """
+    LU, pivots = lu
+    n = len(LU)
+    x = list(b)
+    for i, p in enumerate(pivots):
+        if p != i:
+            x[i], x[p] = x[p], x[i]
+    for i in range(1, n):
+        row_i = LU[i]
+        x[i] -= sum(row_i[l] * x[l] for l in range(i))
+    for i in range(n - 1, -1, -1):
+        row_i = LU[i]
+        x[i] = (x[i] - sum(row_i[l] * x[l] for l in range(i + 1, n))) / row_i[i]
+    return x
+
+
+def solve_tridiagonal(
+    a: List[Number], b: List[Number], c: List[Number], d: List[Number]) -> List[Number]:
+    """Solve a tridiagonal system with the Thomas algorithm in O(n):
+        a[i] * x[i-1] + b[i] * x[i] + c[i] * x[i+1] = d[i],  i = 0, ..., n-1
+
+    Args:
+        a (List[Number]): the sub-diagonal, a[0] is not used.
+        b (List[Number]): the diagonal.
+        c (List[Number]): the super-diagonal, c[n-1] is not used.
+        d (List[Number]): the right hand side.
+
+    Raises:
+        ValueError: raised when the lengths of a, b, c and d are different, 
+            or when a zero pivot is met (no pivoting is done, 
+            which is safe for diagonally dominant systems such as splines).
+
+    Returns:
+        List[Number]: the solution x
+    """
+    n = len(b)
+    if not (len(a) == len(c) == len(d) == n):
+        raise ValueError("a, b, c and d should be of same length.")
+    if n == 0:
+        return []
+
+    c_prime = [0.] * n
+    d_prime = [0.] * n
+    if b[0] == 0:
+        raise ValueError("Zero pivot met in the tridiagonal system.")
+    c_prime[0] = c[0] / b[0]
+    d_prime[0] = d[0] / b[0]
+    for i in range(1, n):
+        pivot = b[i] - a[i] * c_prime[i-1]
+        if pivot == 0:
+            raise ValueError("Zero pivot met in the tridiagonal system.")
+        c_prime[i] = c[i] / pivot
+        d_prime[i] = (d[i] - a[i] * d_prime[i-1]) / pivot
+
+    x = d_prime
+    for i in range(n - 2, -1, -1):
+        x[i] -= c_prime[i] * x[i+1]
+    return x
+
+def solve_cyclic_tridiagonal(
+    a: List[Number], b: List[Number], c: List[Number], d: List[Number]) -> List[Number]:
+    """Solve a cyclic (periodic) tridiagonal system in O(n) with Sherman-Morrison formula:
+        a[i] * x[i-1] + b[i] * x[i] + c[i] * x[i+1] = d[i],  i = 0, ..., n-1
+    where x[-1] := x[n-1] and x[n] := x[0], i.e. a[0] and c[n-1] are the corner elements.
+
+    Args:
+        a (List[Number]): the sub-diagonal, a[0] is the upper right corner.
+        b (List[Number]): the diagonal.
+        c (List[Number]): the super-diagonal, c[n-1] is the lower left corner.
+        d (List[Number]): the right hand side.
+
+    Raises:
+        ValueError: raised when n < 3, when the lengths are different or a zero pivot is met.
+
+    Returns:
+        List[Number]: the solution x
+    """
+    n = len(b)
+    if n < 3:
+        raise ValueError("A cyclic tridiagonal system should have at least 3 unknowns.")
+    alpha, beta = c[-1], a[0]
+    gamma = -b[0]
+    b_modified = list(b)
+    b_modified[0] = b[0] - gamma
+    b_modified[-1] = b[-1] - alpha * beta / gamma
+    x = solve_tridiagonal(a, b_modified, c, d)
+    u = [0.] * n
+    u[0] = gamma
+    u[-1] = alpha
+    z = solve_tridiagonal(a, b_modified, c, u)
+    factor = (x[0] + beta * x[-1] / gamma) / (1 + z[0] + beta * z[-1] / gamma)
+    return [x_i - factor * z_i for x_i, z_i in zip(x, z)]
@@ -0,0 +1,335 @@
+"""Monte Carlo and quasi-Monte Carlo integration in many dimensions"""
+from concurrent.futures import ProcessPoolExecutor
+from math import log, sqrt
+from numbers import Number
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+import random
+
+from .Integration import QuadResult
+
+# Primitive polynomials and initial direction numbers of Sobol sequences for the dimensions 2, 3, ...:
+# (degree s, coefficients a, [m_1, ..., m_s])
+# Reference: S. Joe and F. Y. Kuo, Constructing Sobol sequences with better two-dimensional projections,
+# SIAM J. Sci. Comput. 30, 2635-2654 (2008).
+_SOBOL_DIRECTIONS = (
+    (1, 0, (1,)),
+    (2, 1, (1, 3)),
+    (3, 1, (1, 3, 1)),
+    (3, 2, (1, 1, 1)),
+    (4, 1, (1, 1, 3, 3)),
+    (4, 4, (1, 3, 5, 13)),
+    (5, 2, (1, 1, 5, 5, 17)),
+    (5, 4, (1, 1, 5, 5, 5)),
+    (5, 7, (1, 1, 7, 11, 19)),
+    (5, 11, (1, 1, 5, 1, 1)),
+    (5, 13, (1, 1, 1, 3, 11)),
+    (5, 14, (1, 3, 5, 5, 31)),
+    (6, 1, (1, 3, 3, 9, 7, 49)),
+    (6, 13, (1, 1, 1, 15, 21, 21)),
+    (6, 16, (1, 3, 1, 13, 27, 49)),
+    (6, 19, (1, 1, 1, 15, 7, 5)),
+    (6, 22, (1, 3, 1, 15, 13, 25)),
+    (6, 25, (1, 1, 5, 5, 19, 61)),
+    (7, 1, (1, 3, 7, 11, 23, 15, 103)),
+    (7, 4, (1, 3, 7, 13, 13, 15, 69)),
+)
+
+class Sobol:
+    """Sobol low-discrepancy sequence in [0, 1)^dim (dim <= 21),
+        optionally scrambled by a random digital shift.
+    Any point can be computed directly from its index, so that blocks can be generated independently.
+    """
+    BITS = 32
+
+    def __init__(self, dim: int, scramble: bool = False, seed: Any = 0):
+        if not 1 <= dim <= len(_SOBOL_DIRECTIONS) + 1:
+            raise ValueError("Sobol sequences support 1 to {} dimensions.".format(len(_SOBOL_DIRECTIONS) + 1))
+        BITS = self.BITS
+        V = [[1 << (BITS - 1 - k) for k in range(BITS)]]
+        for s, a, ms in _SOBOL_DIRECTIONS[:dim - 1]:
+            v = [m << (BITS - 1 - k) for k, m in enumerate(ms)]
+            for k in range(s, BITS):
+                v_k = v[k - s] ^ (v[k - s] >> s)
+                for j in range(1, s):
+                    if (a >> (s - 1 - j)) & 1:
+                        v_k ^= v[k - j]
+                v.append(v_k)
+            V.append(v)
+        self.dim = dim
+        self.V = V
+        if scramble:
+            rng = random.Random("Sobol-{}".format(seed))
+            self.shifts = [rng.getrandbits(BITS) for _ in range(dim)]
+        else:
+            self.shifts = [0] * dim
+
+    def points(self, start: int, count: int) -> List[List[float]]:
+        """The points of indices start + 1, ..., start + count (the point 0 is skipped)"""
+        BITS = self.BITS
+        scale = 1 / 2**BITS
+        i = start + 1
+        gray = i ^ (i >> 1)
+        xs = []
+        for v, shift in zip(self.V, self.shifts):
+            x = shift
+            for k in range(BITS):
+                if (gray >> k) & 1:
+                    x ^= v[k]
+            xs.append(x)
+        points = [[x * scale for x in xs]]
+        for i in range(start + 1, start + count):
+            c = (~i & (i + 1)).bit_length() - 1     # the lowest zero bit of i
+            for d, v in enumerate(self.V):
+                xs[d] ^= v[c]
+            points.append([x * scale for x in xs])
+        return points
+
+class Halton:
+    """Halton low-discrepancy sequence in [0, 1)^dim with the first dim primes as bases,
+        optionally scrambled by random digit permutations (0 fixed) for each dimension.
+    """
+    def __init__(self, dim: int, scramble: bool = False, seed: Any = 0):
+        bases = []
+        p = 2
+        while len(bases) < dim:
+            if all(p % q for q in bases if q * q <= p):
+                bases.append(p)
+            p += 1
+        self.dim = dim
+        self.bases = bases
+        if scramble:
+            rng = random.Random("Halton-{}".format(seed))
+            self.perms = []
+            for b in bases:
+                perm = list(range(1, b))
+                rng.shuffle(perm)
+                self.perms.append([0] + perm)
+        else:
+            self.perms = [list(range(b)) for b in bases]
+
+    def points(self, start: int, count: int) -> List[List[float]]:
+        """The points of indices start + 1, ..., start + count (the point 0 is skipped)"""
+        points = []
+        for i in range(start + 1, start + count + 1):
+            point = []
+            for b, perm in zip(self.bases, self.perms):
+                x = 0.
+                factor = 1 / b
+                k = i
+                while k:
+                    k, digit = divmod(k, b)
+                    x += perm[digit] * factor
+                    factor /= b
+                point.append(x)
+            points.append(point)
+        return points
+
+def _mc_block(task: tuple) -> Tuple[int, float, float, Optional[List[List[float]]]]:
+    """Evaluate a block of samples, returns (count, sum of f, sum of f**2, VEGAS bin sums of f**2 or None)"""
+    f, args, domain, method, sequence, seed, start, count, grid = task
+    lows = [low for low, _ in domain]
+    widths = [high - low for low, high in domain]
+    volume = 1.
+    for width in widths:
+        volume *= width
+    total = total_sq = 0.
+    if method == "vegas":
+        rng = random.Random("{}-{}".format(seed, start))
+        n_bins = len(grid[0]) - 1
+        d = [[0.] * n_bins for _ in domain]
+        for _ in range(count):
+            point = []
+            bins = []
+            jacobian = volume
+            for k, edges in enumerate(grid):
+                y = rng.random() * n_bins
+                i = int(y)
+                width = edges[i+1] - edges[i]
+                point.append(lows[k] + widths[k] * (edges[i] + (y - i) * width))
+                bins.append(i)
+                jacobian *= n_bins * width
+            y = f(point, *args) * jacobian
+            total += y
+            total_sq += y * y
+            for k, i in enumerate(bins):
+                d[k][i] += y * y
+        return count, total, total_sq, d
+
+    if method == "plain":
+        rng = random.Random("{}-{}".format(seed, start))
+        us = ([rng.random() for _ in domain] for _ in range(count))
+    else:
+        us = sequence.points(start, count)
+    for u in us:
+        y = f([low + width * u_k for low, width, u_k in zip(lows, widths, u)], *args) * volume
+        total += y
+        total_sq += y * y
+    return count, total, total_sq, None
+
+def _refine_grid(edges: List[float], d: List[float], alpha: float) -> List[float]:
+    """Redistribute the VEGAS bins of one dimension so that each one gets the same share of f**2 (Lepage)"""
+    n_bins = len(d)
+    if n_bins == 1:
+        return edges
+    smoothed = [(d[0] + d[1]) / 2] + [(d[i-1] + d[i] + d[i+1]) / 3 for i in range(1, n_bins - 1)] \
+        + [(d[-2] + d[-1]) / 2]
+    total = sum(smoothed)
+    if total == 0:
+        return edges
+    weights = []
+    for d_i in smoothed:
+        r = d_i / total
+        weights.append(((r - 1) / log(r)) ** alpha if 0 < r < 1 else (1. if r >= 1 else 0.))
+    per_bin = sum(weights) / n_bins
+    if per_bin == 0:
+        return edges
+    new_edges = [0.]
+    accumulated = 0.
+    i = 0
+    for _ in range(n_bins - 1):
+        while accumulated < per_bin:
+            accumulated += weights[i]
+            i += 1
+        accumulated -= per_bin
+        # the new edge is inside the old bin i - 1
+        new_edges.append(edges[i] - accumulated / weights[i-1] * (edges[i] - edges[i-1]))
+    new_edges.append(1.)
+    return new_edges
+
+SUPPORTED_MC_METHODS = ("plain", "Sobol", "Halton", "VEGAS")
+
+def mc_integrate(
+    f: Callable[[List[Number], Any], Number], domain: Sequence[Tuple[Number, Number]], n: int = 100_000,
+    method: str = "plain", se_TOL: float = 0., seed: Any = 0, scramble: bool = False,
+    block_size: int = 4096, workers: Optional[int] = None,
+    n_iter: int = 10, n_bins: int = 50, alpha: float = 1.5,
+    args: tuple = ()) -> QuadResult:
+    """Monte Carlo integration of f over a box domain in any dimension, with a running standard error.
+
+    Methods:
+        "plain": pseudo-random samples. The standard error is estimated from the sample variance.
+        "Sobol", "Halton": quasi-random (low-discrepancy) samples, scrambled if `scramble`.
+            The standard error is (conservatively) estimated from the spread of the block means.
+        "VEGAS": adaptive importance sampling with a separable grid of `n_bins` bins per dimension,
+            refined after each of the `n_iter` iterations.
+            The iterations are combined weighted by their inverse variances.
+
+    The samples are evaluated in blocks of `block_size`, each one with its own reproducible stream
+    (derived from `seed` and the block index, so the result does not depend on the number of workers),
+    and the blocks are distributed on a process pool when `workers` > 1 (f and args must be picklable then).
+    The integration stops early once the standard error is not larger than se_TOL, checked after each block 
+    in order (with workers, the blocks evaluated beyond the stopping one are dropped, and not counted in n_evals).
+
+    Args:
+        f (Callable[[List[Number], Any], Number]): f(x, *args), with x a list of coordinates
+        domain (Sequence[Tuple[Number, Number]]): [(a_1, b_1), ..., (a_d, b_d)]
+        n (int, optional): max number of samples. Defaults to 100_000.
+        method (str, optional): one of SUPPORTED_MC_METHODS. Defaults to "plain".
+        se_TOL (float, optional): the requested standard error. Defaults to 0. (use all the n samples).
+        seed (Any, optional): seed of the random streams. Defaults to 0.
+        scramble (bool, optional): randomise the quasi-random sequences. Defaults to False.
+        block_size (int, optional): the number of samples in each block. Defaults to 4096.
+        workers (int, optional): the number of processes, None or 1 to evaluate in this process. Defaults to None.
+        n_iter (int, optional): the number of VEGAS iterations. Defaults to 10.
+        n_bins (int, optional): the number of VEGAS bins per dimension. Defaults to 50.
+        alpha (float, optional): the damping of the VEGAS grid refinement. Defaults to 1.5.
+        args (tuple, optional): args to be passed to f. Defaults to ().
+
+    Returns:
+        QuadResult: (value, error, n_evals), where error is the estimated standard error
+    """
+    dim = len(domain)
+    method = method.lower()
+    if method == "sobol":
+        sequence = Sobol(dim, scramble, seed)
+    elif method == "halton":
+        sequence = Halton(dim, scramble, seed)
+    elif method in ["plain", "vegas"]:
+        sequence = None
+    else:
+        raise ValueError("Unknown method: {}. Must be one of {}".format(method, SUPPORTED_MC_METHODS))
+    domain = [tuple(bounds) for bounds in domain]
+
+    executor = ProcessPoolExecutor(workers) if workers is not None and workers > 1 else None
+    round_size = max(1, workers or 1)   # the number of blocks evaluated at once
+    try:
+        def run(blocks, grid=None):
+            tasks = [(f, args, domain, method, sequence, seed, start, count, grid) for start, count in blocks]
+            if executor is None:
+                return [_mc_block(task) for task in tasks]
+            return list(executor.map(_mc_block, tasks))
+
+        if method == "vegas":
+            return _vegas(run, n, se_TOL, block_size, round_size, n_iter, n_bins, alpha, dim)
+
+        n_evals = 0
+        total = total_sq = 0.
+        block_means = []
+        error = float("inf")
+        start = 0
+        while start < n and error > se_TOL:
+            blocks = []
+            for _ in range(round_size):
+                count = min(block_size, n - start)
+                if count <= 0:
+                    break
+                blocks.append((start, count))
+                start += count
+            # the convergence is checked after each block in order, so that the stopping block 
+            # does not depend on the number of workers (the next blocks of the round are dropped)
+            for count, s, s_sq, _ in run(blocks):
+                n_evals += count
+                total += s
+                total_sq += s_sq
+                block_means.append(s / count)
+                mean = total / n_evals
+                if method == "plain":
+                    variance = max(total_sq / n_evals - mean**2, 0.)
+                    error = sqrt(variance / n_evals)
+                elif len(block_means) > 1:
+                    m = len(block_means)
+                    mean_of_blocks = sum(block_means) / m
+                    error = sqrt(sum((b - mean_of_blocks)**2 for b in block_means) / (m - 1) / m)
+                if error <= se_TOL:
+                    break
+        return QuadResult(mean, error, n_evals)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+def _vegas(run, n, se_TOL, block_size, round_size, n_iter, n_bins, alpha, dim) -> QuadResult:
+    grid = [[i / n_bins for i in range(n_bins + 1)] for _ in range(dim)]
+    n_per_iter = max(1, n // n_iter)
+    n_evals = 0
+    weighted_sum = inverse_variance_sum = 0.
+    error = float("inf")
+    value = 0.
+    for _ in range(n_iter):
+        blocks = []
+        start = n_evals
+        while start < n_evals + n_per_iter:
+            count = min(block_size, n_evals + n_per_iter - start)
+            blocks.append((start, count))
+            start += count
+        total = total_sq = 0.
+        d = [[0.] * n_bins for _ in range(dim)]
+        for i in range(0, len(blocks), round_size):
+            for count, s, s_sq, d_block in run(blocks[i:i + round_size], grid):
+                total += s
+                total_sq += s_sq
+                for k in range(dim):
+                    for j in range(n_bins):
+                        d[k][j] += d_block[k][j]
+        n_evals += n_per_iter
+        mean = total / n_per_iter
+        variance = max(total_sq / n_per_iter - mean**2, 0.) / n_per_iter
+        if variance == 0:   # f is constant (or zero) along the sampling
+            return QuadResult(mean, 0., n_evals)
+        weighted_sum += mean / variance
+        inverse_variance_sum += 1 / variance
+        value = weighted_sum / inverse_variance_sum
+        error = sqrt(1 / inverse_variance_sum)
+        if error <= se_TOL:
+            break
+        grid = [_refine_grid(edges, d_k, alpha) for edges, d_k in zip(grid, d)]
+    return QuadResult(value, error, n_evals)
@@ -1,5 +1,16 @@
+from array import array
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from math import inf, isfinite
 from numbers import Number, Real
-from typing import Any, Callable, Dict, List, Literal, Optional, Tuple, TypeVar, Union, overload
+from typing import Any, BinaryIO, Callable, Dict, Iterator, List, Literal, NamedTuple, Optional, Sequence, Tuple, TypeVar, Union, overload
+
+from .Differentiation import jacobian
+from .LinearAlgebra import Matrix, lu_factor, lu_solve
+from .Optimisation import solve_Brent
+from .Profiling import instrumented, record
+from ._const import _EPS
 
 T = TypeVar("T", bound=Real)
 Y = TypeVar("Y", Number, List[Number])
@@ -9,9 +20,13 @@ Func = Callable[[T, Y, Any], Y]
 @overload
 def solve_IVP_explicit(
     f: Func[T, Y], y0: Y = 0, bounds: Tuple[T, T] = (0, 1),
-    method: Literal["RK23", "RKF45"] = "RKF45", 
+    method: Literal["RK23", "RKF45", "DP54", "BS32", "Tsit5", "PD87", "BDF", "Radau", "Rosenbrock"] = "RKF45", 
     args: Tuple[Any] = (),
-    dt: T = 1e-3, TOL: Y = 1e-6, dt_max: Optional[T] = None) -> Tuple[List[T], List[Y]]:
+    dt: T = 1e-3, TOL: Y = 1e-6, atol: Union[None, Y, Sequence[Number]] = None, dt_max: Optional[T] = None, 
+    t_eval: Optional[Sequence[T]] = None, dense_output: bool = False, 
+    jac: Optional[Callable[..., Any]] = None, jac_sparsity: Any = None, max_order: int = 5, 
+    events: Union[None, "Events", Sequence[Callable[..., Number]]] = None
+    ) -> Union[Tuple[List[T], List[Y]], "DenseOutput"]:
     ...
 @overload
 def solve_IVP_explicit(
@@ -20,7 +35,8 @@ def solve_IVP_explicit(
         Literal["Euler", "Midpoint", "Trapezoid", "RK4"], 
         Callable[[Func[T, Y], T, T, Y, Any], Y]] = "RKF45", 
     args: Tuple[Any] = (), 
-    N: int = 100, endpoint: bool = True) -> Tuple[List[T], List[Y]]:
+    N: int = 100, endpoint: bool = True, 
+    events: Union[None, "Events", Sequence[Callable[..., Number]]] = None) -> Tuple[List[T], List[Y]]:
     ...
 def solve_IVP_explicit(
     f: Func[T, Y], y0: Y = 0, bounds: Tuple[T, T] = (0, 1),
@@ -28,7 +44,8 @@ def solve_IVP_explicit(
     args: Tuple[Any] = (), 
     **kwargs) -> Tuple[List[T], List[Y]]:
     """Solve the IVP ODE problem y' = f(t, y) with initial condition y(t_0) = y_0
-        using the given explicit method， with constant step (b - a)/N.
+        using the given method: explicit with constant step (b - a)/N, 
+        or adaptive (explicit, or implicit for the stiff problems).
 
     TypeVars:
         T = TypeVar("T", bound=Number)
@@ -45,23 +62,38 @@ def solve_IVP_explicit(
             It should be a str in SUPPORTED_METHODS, or a func (f, dt, t, y, *args) -> next_y
         **kwargs: keyword arguments to be passed to the specific solver.
             When method is one of SUPPORTED_CONST_STEP_METHODS: 
-                keywords should be subset of {N, endpoint}, where: 
+                keywords should be subset of {N, endpoint, events}, where: 
                     N (int, optional): The number of steps in the given bounds. Defaults to 100.
                     endpoint (bool, optional): whether include the end point of bounds or not. defaults to True.
+                    events (Events | Sequence[(T, Y, Any) -> Number], optional): event functions, 
+                        see `Events`. Defaults to None.
             When method is one of SUPPORTED_VAR_STEP_METHODS: 
-                keywords should be subset of {dt, TOL, dt_max}, where:
-                    dt (T, optional): Initial step size. Defaults to 1e-3.
-                    TOL (Y, optional): Tolerent error (relative when y is not zero). Defaults to 1e-6.
+                keywords should be subset of {dt, TOL, atol, dt_max, t_eval, dense_output, events}, where:
+                    dt (T, optional): Initial step size. 
+                        Defaults to 1e-3 for "RK23" and "RKF45", else None (estimated).
+                    TOL (Y, optional): relative tolerance. Defaults to 1e-6.
+                    atol (Y | Sequence[Number], optional): absolute tolerance. Defaults to None (TOL).
                     dt_max (T | None, optional): Max step size. Defaults to None.
+                    t_eval (Sequence[T] | None, optional): the points where the solution is returned. 
+                        Defaults to None (the steps).
+                    dense_output (bool, optional): return the continuous solution. Defaults to False.
+                    events (Events | Sequence[(T, Y, Any) -> Number], optional): event functions, 
+                        see `Events`. Defaults to None.
+                and for SUPPORTED_IMPLICIT_METHODS ("BDF", "Radau", "Rosenbrock") also {jac, jac_sparsity}, 
+                and {max_order} for "BDF", see `solve_IVP_BDF`.
 
         
-    Returns Tuple[List[T], List[Y]]: ts, ys
+    Returns Tuple[List[T], List[Y]]: ts, ys (and t_events, y_events with events)
     """
 
     if isinstance(method, str):
         method = method.lower()
         if method in _SUPPORTED_IVP_VAR_STEP_METHODS.keys():
-            expected_key = {"dt", "TOL", "dt_max"}
+            expected_key = {"dt", "TOL", "atol", "dt_max", "t_eval", "dense_output", "events"}
+            if method in _SUPPORTED_IVP_IMPLICIT_METHODS:
+                expected_key |= {"jac", "jac_sparsity"}
+                if method == "bdf":
+                    expected_key.add("max_order")
             for key in kwargs.keys():
                 if key not in expected_key:
                     raise TypeError(
@@ -81,7 +113,7 @@ def solve_IVP_explicit(
     else:
         next_y = method
 
-    expected_key = {"N", "endpoint"}
+    expected_key = {"N", "endpoint", "events"}
     for key in kwargs.keys():
                 if key not in expected_key:
                     raise TypeError(
@@ -97,10 +129,12 @@ def solve_IVP_explicit(
 
 
 
+@instrumented
 def solve_IVP_explicit_const_step(
     f: Func[T, Y], y0: Y = 0, bounds: Tuple[T, T] = (0, 1), args: Tuple[Any] = (),
     method: Union[str, Callable[[Func[T, Y], T, T, Y, Any], Y]] = "RK45", 
-    N: int = 100, endpoint: bool = True) -> List[Y]:
+    N: int = 100, endpoint: bool = True, 
+    events: Union[None, "Events", Sequence[Callable[..., Number]]] = None) -> List[Y]:
     """Solve the IVP ODE problem y' = f(t, y) with initial condition y(t_0) = y_0
         using the given explicit method， with constant step (b - a)/N.
 
@@ -119,36 +153,59 @@ def solve_IVP_explicit_const_step(
             It should be a str in SUPPORTED_METHODS, or a func (f, dt, t, y, *args) -> next_y
         N (int, optional): The number of steps in the given bounds. Defaults to 100.
         endpoint (bool, optional): whether include the end point of bounds or not. defaults to True.
+        events (Events | Sequence[(T, Y, Any) -> Number], optional): event functions g(t, y, *args), 
+            whose zeros are located (the integration stops at the first zero of a terminal one), see `Events`. 
+            Defaults to None.
         
     Returns:
         Tuple[List[T], List[Y]]: (ts, ys) where
             ts:[t_i := t_0 + i * stepsize for i in (if endpoint then N + 1 else N)]
             ys: Solved function value at ts
+            (and the last one is the terminal event, if any), 
+            followed by (t_events, y_events), the zeros of each event function, if events
     """
-    output_ys = [y0]
-    t_0, t_N = bounds
-    output_ts = [t_0]
-    dt: T = (t_N - t_0) / N
+    events = _as_events(events)
+    return _collect(_iter_const_step(f, y0, bounds, args, _const_step_method(method), N, endpoint, events), 
+        y0, events=events)
 
+def _const_step_method(method: Union[str, Callable[[Func[T, Y], T, T, Y, Any], Y]]
+        ) -> Callable[[Func[T, Y], T, T, Y, Any], Y]:
+    """The next_y function of a constant step method"""
     if isinstance(method, str):
         method = method.lower()
         try:
-            next_y = _SUPPORTED_IVP_CONST_STEP_METHODS[method]
+            return _SUPPORTED_IVP_CONST_STEP_METHODS[method]
         except KeyError:
             raise ValueError(f"method {method} not supported. must be one of the {SUPPORTED_METHODS}")
-    else:
-        next_y = method
+    return method
 
+def _iter_const_step(
+    f: Func[T, Y], y0: Y, bounds: Tuple[T, T], args: Tuple[Any], 
+    next_y: Callable[[Func[T, Y], T, T, Y, Any], Y], N: int = 100, endpoint: bool = True, 
+    events: Optional["Events"] = None) -> Iterator[Tuple[T, Y]]:
+    """The steps (t, y) of `solve_IVP_explicit_const_step`, one at a time"""
+    t_0, t_N = bounds
+    dt: T = (t_N - t_0) / N
     if endpoint:
         N += 1
 
+    y_i = y0
+    yield t_0, y_i
+    if events is not None:
+        events._start(t_0, y0, args, False)
     for i in range(N-1):
         t_i: T = i * dt + t_0
-        y_i = output_ys[-1]
-        y_ip1 = next_y(f, dt, t_i, y_i, *args)
-        output_ys.append(y_ip1)
-        output_ts.append(t_i + dt)
-    return output_ts, output_ys
+        y_next = next_y(f, dt, t_i, y_i, *args)
+        if events is not None:
+            stop = events._step(t_i, y_i, t_i + dt, y_next, 
+                lambda: (_Hermite_segment, (f(t_i, y_i, *args), f(t_i + dt, y_next, *args))))
+            if stop is not None:
+                yield stop
+                record("solve_IVP_explicit_const_step", accepted=i + 1)
+                return
+        y_i = y_next
+        yield t_i + dt, y_i
+    record("solve_IVP_explicit_const_step", accepted=N - 1)
 
 def _next_y_Euler(f: Func[T, Y], dt: T, t: T, y: Y, *args)  -> Y:
     if isinstance(y, Number):
@@ -214,7 +271,8 @@ def _next_y_RK4(f: Func[T, Y], dt: T, t: T, y: Y, *args)  -> Y:
         ]
     return next_y
 
-def RK_array_explicit(a: List[List[Number]], b: List[Number], c: List[Number]) -> Callable[[Func[T, Y], T, T, Y, Any], Y]:
+def RK_array_explicit(a: List[List[Number]], b: List[Number], c: List[Number], e: Optional[List[Number]] = None
+        ) -> Callable[[Func[T, Y], T, T, Y, Any], Union[Y, Tuple[Y, Y]]]:
     """Create a function that generates the next y with given k stages Runge-Kutta coefficients:
     c | a
     -------
@@ -234,6 +292,9 @@ def RK_array_explicit(a: List[List[Number]], b: List[Number], c: List[Number]) -
     s_2 = f(t + c_1 dt, y + (a_{10} s_0 + a_{11} s_1) * dt)
     ...
     s_{k-1} = f(t + c_{k-2} dt, y + (a_{k-2, 0} s_0 + ... + a_{k-2, k-2} s_{k-2}) * dt)
+    For an embedded pair, the error weights e = b - b_hat of the embedded method b_hat give the error estimate
+    error = (e_0 * s_0 + ... + e_{k-1} * s_{k-1}) * dt
+    (see `EmbeddedRK` and `solve_IVP_adaptive` for the adaptive steps).
     Args:
         a (List[List[Number]]): 
         [
@@ -244,9 +305,11 @@ def RK_array_explicit(a: List[List[Number]], b: List[Number], c: List[Number]) -
         ]
         b (List[Number]): [b_0, ..., b_{k-2}, b_{k-1}]
         c (List[Number]): [c_0, ..., c_{k-2}]
+        e (List[Number], optional): [e_0, ..., e_{k-1}]. Defaults to None.
 
     Returns:
-        Callable[[Func[T, Y], T, T, Y, Any], Y]: func (f, dt, t, y, *args) -> next_y
+        Callable[[Func[T, Y], T, T, Y, Any], Y | Tuple[Y, Y]]: func (f, dt, t, y, *args) -> next_y, 
+            or -> (next_y, error) if e is given
 
     Reference: 
     线性方程数值解法 (第二版) by 余德浩，汤华中
@@ -262,6 +325,8 @@ def RK_array_explicit(a: List[List[Number]], b: List[Number], c: List[Number]) -
                     )
                 s.append(next_s)
             next_y = y + sum(s_i * b_i for b_i, s_i in zip(b, s)) * dt
+            if e is not None:
+                return next_y, sum(s_i * e_i for e_i, s_i in zip(e, s)) * dt
         else:
             s = [f(t, y, *args)]
             for a_i, c_i in zip(a, c):
@@ -271,15 +336,629 @@ def RK_array_explicit(a: List[List[Number]], b: List[Number], c: List[Number]) -
                 next_s = f(t + c_i * dt, y_stage_i, *args)
                 s.append(next_s)
             next_y = [y_k + sum(s_i[k] * b_i for b_i, s_i in zip(b, s)) * dt for k, y_k in enumerate(y)]
+            if e is not None:
+                return next_y, [sum(s_i[k] * e_i for e_i, s_i in zip(e, s)) * dt for k in range(len(y))]
         return next_y
     return next_y_RK
 
-def solve_IVP_RK23(
+def _Hermite_segment(theta: float, dt: T, y0: Y, y1: Y, f0: Y, f1: Y) -> Y:
+    """Cubic Hermite interpolant of a step from (y0, f0) at theta = 0 to (y1, f1) at theta = 1"""
+    h00 = (1 + 2*theta) * (1 - theta)**2
+    h10 = theta * (1 - theta)**2 * dt
+    h01 = theta**2 * (3 - 2*theta)
+    h11 = theta**2 * (theta - 1) * dt
+    if isinstance(y0, Number):
+        return h00 * y0 + h10 * f0 + h01 * y1 + h11 * f1
+    return [h00 * y0_k + h10 * f0_k + h01 * y1_k + h11 * f1_k for y0_k, y1_k, f0_k, f1_k in zip(y0, y1, f0, f1)]
+
+def _Hermite_error(dt: T, y0: List[Number], y1: List[Number], f0: List[Number], f1: List[Number], 
+        dt_prev: T, y_prev: List[Number]) -> List[Number]:
+    """Estimate of the error of the cubic Hermite interpolant of a step at its middle, 
+        from the quartic also through the point y_prev of the previous step at theta = -dt_prev / dt, 
+        which differs from the cubic by C theta**2 (1 - theta)**2
+    """
+    theta = -dt_prev / dt
+    w = 1 / (16 * theta**2 * (1 - theta)**2)
+    return [w * (yp_k - H_k) for yp_k, H_k in zip(y_prev, _Hermite_segment(theta, dt, y0, y1, f0, f1))]
+
+class DenseOutput:
+    """Continuous solution of an IVP given by an adaptive solver: 
+        each step [ts[i], ts[i+1]] has its own interpolant, called as 
+        interpolant(theta, dt, ys[i], ys[i+1], *data) with theta = (t - ts[i]) / dt in [0, 1]
+        (the cubic Hermite interpolant from the values and the slopes at both ends by default, 
+        or the native continuous extension of the Runge-Kutta method).
+
+    Attributes:
+        ts (List[T]): the step points
+        ys (List[Y]): the solution at ts
+    """
+    def __init__(self, ts: List[T], ys: List[Y], segments: List[Tuple[Callable[..., Y], tuple]], 
+            states: Optional[List[List[Number]]] = None):
+        """
+        Args:
+            ts (List[T]): the step points
+            ys (List[Y]): the solution at ts
+            segments (List[Tuple[Callable[..., Y], tuple]]): the (interpolant, data) of each step
+            states (List[List[Number]], optional): the solution at ts as lists (the states of the solver) 
+                when ys are numbers, for the interpolants then working on lists. Defaults to None.
+        """
+        self.ts = ts
+        self.ys = ys
+        self._segments = segments
+        self._states = states
+
+    def __call__(self, t: Union[T, Sequence[T]]) -> Union[Y, List[Y]]:
+        """The solution at t, or at each point of t
+
+        Raises:
+            ValueError: raised when t is out of the integration interval.
+        """
+        if not isinstance(t, Number):
+            return [self(t_i) for t_i in t]
+        ts = self.ts
+        if not ts[0] <= t <= ts[-1]:
+            raise ValueError("t = {} is out of the integration interval [{}, {}].".format(t, ts[0], ts[-1]))
+        i = min(max(bisect_right(ts, t) - 1, 0), len(self._segments) - 1)
+        if i < 0:   # a single point
+            return self.ys[0]
+        dt = ts[i+1] - ts[i]
+        interpolant, data = self._segments[i]
+        if self._states is not None:
+            return interpolant((t - ts[i]) / dt, dt, self._states[i], self._states[i+1], *data)[0]
+        return interpolant((t - ts[i]) / dt, dt, self.ys[i], self.ys[i+1], *data)
+
+class _StepRecorder:
+    """Collects the steps of an adaptive solver into interpolants, for dense output and t_eval.
+    The solver calls `begin(t, y, f(t, y))` at the start of each step attempt, 
+    `end(t_next, y_next)` (or `end(t_next, y_next, interpolant, data)` with a native interpolant) 
+    when a step is accepted (or `end_at` when it is cut by a terminal event), and `finish(f)` after the last step.
+    """
+    def __init__(self, t0: T, y0: Y, t_eval: Optional[Sequence[T]] = None, dense_output: bool = False):
+        self.segments = [] if dense_output else None
+        self.t_eval = None
+        if t_eval is not None:
+            self.t_eval = sorted(t_eval)
+            if self.t_eval and self.t_eval[0] < t0:
+                raise ValueError("t_eval should be in the integration interval.")
+            self.ts_output = []
+            self.ys_output = []
+            self._i_eval = 0
+            while self._i_eval < len(self.t_eval) and self.t_eval[self._i_eval] == t0:
+                self.ts_output.append(t0)
+                self.ys_output.append(y0)
+                self._i_eval += 1
+        self._start = None
+        self._pending = None
+
+    def begin(self, t: T, y: Y, f0: Y) -> None:
+        if self._pending is not None:
+            t_0, y_0, f_0, t_1, y_1, interpolant, data = self._pending
+            self._pending = None
+            if interpolant is None:
+                interpolant, data = _Hermite_segment, (f_0, f0)
+            self._add(t_0, y_0, t_1, y_1, interpolant, data)
+        self._start = (t, y, f0)
+
+    def end(self, t: T, y: Y, interpolant: Optional[Callable[..., Y]] = None, data: tuple = ()) -> None:
+        self._pending = self._start + (t, y, interpolant, data)
+
+    def end_at(self, t_e: T, y_e: Y, t: T, y: Y, 
+            interpolant: Optional[Callable[..., Y]] = None, data: tuple = ()) -> None:
+        """`end` of a step to (t, y) cut at (t_e, y_e) by a terminal event"""
+        if interpolant is None:
+            self.end(t_e, y_e)
+        else:
+            self.end(t_e, y_e, _truncated_segment, (interpolant, t - self._start[0], y, data))
+
+    def finish(self, f: Func[T, Y], args: tuple, stopped: bool = False) -> None:
+        """Add the last step, where stopped tells that the integration was stopped by a terminal event 
+            (so that the points of t_eval after it are dropped)"""
+        if self._pending is not None:
+            t, y = self._pending[3:5]
+            self.begin(t, y, f(t, y, *args) if self._pending[5] is None else None)
+        if not stopped and self.t_eval is not None and self._i_eval < len(self.t_eval):
+            raise ValueError("t_eval should be in the integration interval.")
+
+    def _add(self, t_0: T, y_0: Y, t_1: T, y_1: Y, interpolant: Callable[..., Y], data: tuple) -> None:
+        if self.segments is not None:
+            self.segments.append((interpolant, data))
+        if self.t_eval is not None:
+            t_eval = self.t_eval
+            dt = t_1 - t_0
+            while self._i_eval < len(t_eval) and t_eval[self._i_eval] <= t_1:
+                t = t_eval[self._i_eval]
+                self.ts_output.append(t)
+                self.ys_output.append(interpolant((t - t_0) / dt, dt, y_0, y_1, *data))
+                self._i_eval += 1
+
+    def result(self, ts: List[T], ys: List[Y], scalar: bool = False) -> Union[Tuple[List[T], List[Y]], DenseOutput]:
+        """The output of the solver, where scalar tells that the solver works on lists [y] for numbers y"""
+        if self.segments is not None:
+            return DenseOutput(ts, ys, self.segments, [[y] for y in ys] if scalar else None)
+        if self.t_eval is not None:
+            return self.ts_output, [y[0] for y in self.ys_output] if scalar else self.ys_output
+        return ts, ys
+
+def _recorder(t0: T, y0: Y, t_eval: Optional[Sequence[T]], dense_output: bool) -> Optional[_StepRecorder]:
+    """The recorder of an adaptive solver, if t_eval or dense_output"""
+    if t_eval is None and not dense_output:
+        return None
+    return _StepRecorder(t0, [y0] if isinstance(y0, Number) else list(y0), t_eval, dense_output)
+
+def _collect(steps: Iterator[Tuple[T, Y]], y0: Y, recorder: Optional[_StepRecorder] = None, 
+        events: Optional["Events"] = None) -> Union[tuple, DenseOutput]:
+    """The output of a solver from its steps: (ts, ys), or the `DenseOutput`, 
+        and the events (ts, ys, t_events, y_events) if any (as the attributes t_events and y_events of a `DenseOutput`)
+    """
+    ts = []
+    ys = []
+    for t, y in steps:
+        ts.append(t)
+        ys.append(y)
+    result = (ts, ys) if recorder is None else recorder.result(ts, ys, isinstance(y0, Number))
+    if events is None:
+        return result
+    if isinstance(result, DenseOutput):
+        result.t_events = events.ts
+        result.y_events = events.ys
+        return result
+    return result + (events.ts, events.ys)
+
+def _truncated_segment(theta: float, dt: T, y0: Y, y1: Y, 
+        interpolant: Callable[..., Y], dt_full: T, y1_full: Y, data: tuple) -> Y:
+    """The interpolant of a step of size dt_full to y1_full, on its first part of size dt (to y1)"""
+    return interpolant(theta * dt / dt_full, dt_full, y0, y1_full, *data)
+
+class Events:
+    """Event functions g(t, y, *args) of an IVP, whose zeros are located during the integration.
+
+    The sign of each g is checked at the end of every step, and a sign change within the step 
+    is localised by `Optimisation.solve_Brent` on the interpolant of the step 
+    (the native continuous extension of the method, or the cubic Hermite interpolant), 
+    so that it takes evaluations of g but no extra evaluations of f 
+    (except for the constant step methods, with 2 evaluations per step with a sign change).
+    Only the first zero of g within a step is found.
+    As in scipy, each function may have the attributes:
+        terminal (bool): whether the integration stops at its first zero. Defaults to False.
+        direction (Number): if > 0 (resp. < 0), only its zeros where g increases (resp. decreases) count. 
+            Defaults to 0 (both).
+
+    def hit_ground(t, y): 
+        return y[0]
+    hit_ground.terminal = True
+    hit_ground.direction = -1
+    ts, ys, t_events, y_events = solve_IVP_RKF45(f, [10., 0.], (0, 10), events=[hit_ground])
+
+    Attributes:
+        functions (List[(T, Y, Any) -> Number]): the event functions
+        terminal (List[bool]): their terminal flags
+        direction (List[Number]): their directions
+        ts (List[List[T]]): the times of the zeros of each function
+        ys (List[List[Y]]): the solution at ts
+        terminated (int | None): the index of the function which stopped the integration, if any
+    """
+    def __init__(self, functions: Sequence[Callable[..., Number]]):
+        """
+        Args:
+            functions (Sequence[(T, Y, Any) -> Number]): the event functions, called as g(t, y, *args) 
+                with the args of the solver
+        """
+        self.functions = list(functions)
+        self.terminal = [bool(getattr(g, "terminal", False)) for g in self.functions]
+        self.direction = [getattr(g, "direction", 0) for g in self.functions]
+        self.ts = [[] for _ in self.functions]
+        self.ys = [[] for _ in self.functions]
+        self.terminated = None
+
+    def _start(self, t: T, y: Y, args: tuple, unwrap: bool) -> None:
+        """Start an integration from (t, y), where unwrap tells that the states are lists [y] for numbers y"""
+        self._args = args
+        self._unwrap = unwrap
+        self.ts = [[] for _ in self.functions]
+        self.ys = [[] for _ in self.functions]
+        self.terminated = None
+        self._g = [g(t, self._user(y), *args) for g in self.functions]
+
+    def _user(self, y: Y) -> Y:
+        return y[0] if self._unwrap else y
+
+    def _step(self, t0: T, y0: Y, t1: T, y1: Y, segment: Callable[[], Tuple[Callable[..., Y], tuple]]
+            ) -> Optional[Tuple[T, Y]]:
+        """Check the step from (t0, y0) to (t1, y1), whose (interpolant, data) is given by segment() 
+            (called only when there is a sign change).
+
+        Returns:
+            Tuple[T, Y] | None: the first zero of a terminal function (t_e, y_e) within the step, if any
+        """
+        g0s = self._g
+        g1s = self._g = [g(t1, self._user(y1), *self._args) for g in self.functions]
+        crossings = [i for i, (g0, g1, direction) in enumerate(zip(g0s, g1s, self.direction))
+            if g0 < 0 <= g1 and direction >= 0 or g0 > 0 >= g1 and direction <= 0]
+        if not crossings:
+            return None
+        interpolant, data = segment()
+        dt = t1 - t0
+
+        def state(t):
+            return y1 if t == t1 else interpolant((t - t0) / dt, dt, y0, y1, *data)
+
+        occurrences = []
+        t_TOL = 4 * _EPS * max(abs(t0), abs(t1))
+        for i in crossings:
+            g = self.functions[i]
+            try:
+                t_e = solve_Brent(lambda t: g(t, self._user(state(t)), *self._args), t0, t1, t_TOL, 200)
+            except (ValueError, Warning):   # no sign change on the interpolant, or no convergence (e.g. a multiple root)
+                t_e = t0 - g0s[i] * dt / (g1s[i] - g0s[i])    # the secant of the step
+            occurrences.append((t_e, i))
+        occurrences.sort()
+        for t_e, i in occurrences:
+            y_e = state(t_e)
+            self.ts[i].append(t_e)
+            self.ys[i].append(self._user(y_e))
+            if self.terminal[i]:
+                self.terminated = i
+                return t_e, y_e
+        return None
+
+def _as_events(events: Union[None, "Events", Sequence[Callable[..., Number]]]) -> Optional[Events]:
+    """The `Events` of the events argument of a solver"""
+    if events is None or isinstance(events, Events):
+        return events
+    return Events(events)
+
+class EmbeddedRK(NamedTuple):
+    """Embedded explicit Runge-Kutta pair, with the layout (a, b, c) of `RK_array_explicit` 
+        and the error weights e = b - b_hat of the embedded method b_hat.
+
+    Attributes:
+        a (Tuple[Tuple[float, ...], ...]): the coefficients of the stages 1, ..., k-1
+        b (Tuple[float, ...]): the weights of the propagated solution
+        c (Tuple[float, ...]): the nodes of the stages 1, ..., k-1
+        e (Tuple[float, ...]): the error weights
+        order (int): the order of b
+        error_order (int): the order of the embedded method, which sets the step size control
+        fsal (bool): whether the last stage is f(t + dt, y_next) (first same as last), 
+            i.e. it is reused as the first stage of the next step
+        dense (Optional[Tuple[float, ...]]): weights d of the native continuous extension (Dormand-Prince form), 
+            y(t + theta dt) = y0 + theta (y1 - y0 + (1 - theta) (r3 + theta (r4 + (1 - theta) r5)))
+            with r3 = dt s_0 - (y1 - y0), r4 = y1 - y0 - dt s_{k-1} - r3, r5 = dt (d_0 s_0 + ... + d_{k-1} s_{k-1}).
+            If None, the cubic Hermite interpolant is used, and when it is needed (t_eval, dense output, events), 
+            the steps are also limited so that its error stays within the tolerance, 
+            which takes much shorter steps for the high order pairs (e.g. "PD87").
+    """
+    a: Tuple[Tuple[float, ...], ...]
+    b: Tuple[float, ...]
+    c: Tuple[float, ...]
+    e: Tuple[float, ...]
+    order: int
+    error_order: int
+    fsal: bool = False
+    dense: Optional[Tuple[float, ...]] = None
+
+    @classmethod
+    def from_weights(cls, a: List[List[Number]], b: List[Number], b_hat: List[Number], c: List[Number], 
+            order: int, error_order: int, fsal: bool = False, dense: Optional[List[Number]] = None) -> "EmbeddedRK":
+        """Create the pair from the weights b and b_hat of the two methods"""
+        return cls(
+            tuple(tuple(a_i) for a_i in a), tuple(b), tuple(c), tuple(b_i - b_hat_i for b_i, b_hat_i in zip(b, b_hat)), 
+            order, error_order, fsal, None if dense is None else tuple(dense))
+
+# RK2/3, the error is |next_y(RK3) - next_y(RK2)|
+RK23 = EmbeddedRK.from_weights(
+    a=[[1], [1/4, 1/4]], 
+    b=[1/6, 1/6, 2/3], 
+    b_hat=[1/2, 1/2, 0], 
+    c=[1, 1/2], 
+    order=3, error_order=2)
+
+# Runge-Kutta-Fehlberg 4/5, propagating the order 5 solution
+RKF45 = EmbeddedRK.from_weights(
+    a=[
+        [1/4], 
+        [3/32, 9/32], 
+        [1932/2197, -7200/2197, 7296/2197], 
+        [439/216, -8, 3680/513, -845/4104], 
+        [-8/27, 2, -3544/2565, 1859/4104, -11/40]], 
+    b=[16/135, 0, 6656/12_825, 28_561/56_430, -9/50, 2/55], 
+    b_hat=[25/216, 0, 1408/2565, 2197/4104, -1/5, 0], 
+    c=[1/4, 3/8, 12/13, 1, 1/2], 
+    order=5, error_order=4)
+
+# Dormand-Prince 5(4), FSAL with the native continuous extension of order 4
+# Reference: E. Hairer, S. P. Norsett and G. Wanner, Solving Ordinary Differential Equations I, Springer (1993)
+DP54 = EmbeddedRK.from_weights(
+    a=[
+        [1/5], 
+        [3/40, 9/40], 
+        [44/45, -56/15, 32/9], 
+        [19372/6561, -25360/2187, 64448/6561, -212/729], 
+        [9017/3168, -355/33, 46732/5247, 49/176, -5103/18656], 
+        [35/384, 0, 500/1113, 125/192, -2187/6784, 11/84]], 
+    b=[35/384, 0, 500/1113, 125/192, -2187/6784, 11/84, 0], 
+    b_hat=[5179/57600, 0, 7571/16695, 393/640, -92097/339200, 187/2100, 1/40], 
+    c=[1/5, 3/10, 4/5, 8/9, 1, 1], 
+    order=5, error_order=4, fsal=True, 
+    dense=[-12715105075/11282082432, 0, 87487479700/32700410799, -10690763975/1880347072, 
+           701980252875/199316789632, -1453857185/822651844, 69997945/29380423])
+
+# Bogacki-Shampine 3(2), FSAL
+BS32 = EmbeddedRK.from_weights(
+    a=[[1/2], [0, 3/4], [2/9, 1/3, 4/9]], 
+    b=[2/9, 1/3, 4/9, 0], 
+    b_hat=[7/24, 1/4, 1/3, 1/8], 
+    c=[1/2, 3/4, 1], 
+    order=3, error_order=2, fsal=True)
+
+# Tsitouras 5(4), FSAL
+# Reference: Ch. Tsitouras, Runge-Kutta pairs of order 5(4) satisfying only the first column simplifying assumption, 
+# Comput. Math. Appl. 62, 770-775 (2011)
+_TSIT5_B = [0.09646076681806523, 0.01, 0.4798896504144996, 1.379008574103742, -3.290069515436081, 
+            2.324710524099774, 0]
+Tsit5 = EmbeddedRK(
+    a=(
+        (0.161,), 
+        (-0.008480655492356989, 0.335480655492357), 
+        (2.897153057105493, -6.359448489975075, 4.3622954328695815), 
+        (5.325864828439257, -11.748883564062828, 7.4955393428898365, -0.09249506636175525), 
+        (5.86145544294642, -12.92096931784711, 8.159367898576159, -0.071584973281401, -0.028269050394068383), 
+        tuple(_TSIT5_B[:6])), 
+    b=tuple(_TSIT5_B), 
+    c=(0.161, 0.327, 0.9, 0.9800255409045097, 1, 1), 
+    e=(-0.00178001105222577714, -0.0008164344596567469, 0.007880878010261995, -0.1447110071732629, 
+       0.5823571654525552, -0.45808210592918697, 1/66), 
+    order=5, error_order=4, fsal=True, 
+    # the free 4th order interpolant of Tsitouras: its weights are Hermite quartics in theta, 
+    # whose coefficients of theta**4 are the weights d in the Dormand-Prince form
+    dense=(-1.0530884977290216, 0.1017, 2.490627285651252793, -16.54810288924490272, 47.37952196281928122, 
+           -34.87065786149660974, 2.5))
+
+# Prince-Dormand 8(7) (RK8(7)13M), propagating the order 8 solution
+# Reference: P. J. Prince and J. R. Dormand, High order embedded Runge-Kutta formulae, 
+# J. Comput. Appl. Math. 7, 67-75 (1981)
+PD87 = EmbeddedRK.from_weights(
+    a=[
+        [1/18], 
+        [1/48, 1/16], 
+        [1/32, 0, 3/32], 
+        [5/16, 0, -75/64, 75/64], 
+        [3/80, 0, 0, 3/16, 3/20], 
+        [29443841/614563906, 0, 0, 77736538/692538347, -28693883/1125000000, 23124283/1800000000], 
+        [16016141/946692911, 0, 0, 61564180/158732637, 22789713/633445777, 545815736/2771057229, 
+         -180193667/1043307555], 
+        [39632708/573591083, 0, 0, -433636366/683701615, -421739975/2616292301, 100302831/723423059, 
+         790204164/839813087, 800635310/3783071287], 
+        [246121993/1340847787, 0, 0, -37695042795/15268766246, -309121744/1061227803, -12992083/490766935, 
+         6005943493/2108947869, 393006217/1396673457, 123872331/1001029789], 
+        [-1028468189/846180014, 0, 0, 8478235783/508512852, 1311729495/1432422823, -10304129995/1701304382, 
+         -48777925059/3047939560, 15336726248/1032824649, -45442868181/3398467696, 3065993473/597172653], 
+        [185892177/718116043, 0, 0, -3185094517/667107341, -477755414/1098053517, -703635378/230739211, 
+         5731566787/1027545527, 5232866602/850066563, -4093664535/808688257, 3962137247/1805957418, 
+         65686358/487910083], 
+        [403863854/491063109, 0, 0, -5068492393/434740067, -411421997/543043805, 652783627/914296604, 
+         11173962825/925320556, -13158990841/6184727034, 3936647629/1978049680, -160528059/685178525, 
+         248638103/1413531060, 0]], 
+    b=[14005451/335480064, 0, 0, 0, 0, -59238493/1068277825, 181606767/758867731, 561292985/797845732, 
+       -1041891430/1371343529, 760417239/1151165299, 118820643/751138087, -528747749/2220607170, 1/4], 
+    b_hat=[13451932/455176623, 0, 0, 0, 0, -808719846/976000145, 1757004468/5645159321, 656045339/265891186, 
+           -3867574721/1518517206, 465885868/322736535, 53011238/667516719, 2/45, 0], 
+    c=[1/18, 1/12, 1/8, 5/16, 3/8, 59/400, 93/200, 5490023248/9719169821, 13/20, 1201146811/1299019798, 1, 1], 
+    order=8, error_order=7)
+
+SUPPORTED_TABLEAUS: Dict[str, EmbeddedRK] = {
+    "DP54": DP54,
+    "BS32": BS32,
+    "Tsit5": Tsit5,
+    "PD87": PD87,
+    "RK23": RK23,
+    "RKF45": RKF45
+}
+
+def _Dormand_Prince_segment(theta: float, dt: T, y0: Y, y1: Y, r3: Y, r4: Y, r5: Y) -> Y:
+    """Continuous extension in the Dormand-Prince form, see `EmbeddedRK`"""
+    if isinstance(y0, Number):
+        return y0 + theta * (y1 - y0 + (1 - theta) * (r3 + theta * (r4 + (1 - theta) * r5)))
+    return [y0_k + theta * (y1_k - y0_k + (1 - theta) * (r3_k + theta * (r4_k + (1 - theta) * r5_k))) 
+        for y0_k, y1_k, r3_k, r4_k, r5_k in zip(y0, y1, r3, r4, r5)]
+
+def _combine(y: List[Number], dt: T, terms: List[Tuple[int, Number]], s: List[List[Number]]) -> List[Number]:
+    """y + dt * (w_0 s_{j_0} + w_1 s_{j_1} + ...) for terms = [(j_0, w_0), (j_1, w_1), ...]"""
+    for j, w in terms:
+        w *= dt
+        y = [y_k + w * s_k for y_k, s_k in zip(y, s[j])]
+    return y
+
+def _as_lists(f: Func[T, Y], y0: Y, args: tuple, TOL: Number, atol: Union[None, Number, Sequence[Number]]
+        ) -> Tuple[Callable, tuple, List[Number], bool, List[Number]]:
+    """The problem with the state as a list: (F, F_args, y, scalar, atol) 
+        where F(t, y, *F_args) is a list, scalar tells that y0 is a number and atol is given for each component
+    """
+    scalar = isinstance(y0, Number)
+    if scalar:
+        def F(t, y):
+            return [f(t, y[0], *args)]
+        F_args = ()
+        y = [y0]
+    else:
+        F, F_args = f, args
+        y = list(y0)
+    if atol is None:
+        atol = TOL
+    atol = [atol] * len(y) if isinstance(atol, Number) else list(atol)
+    return F, F_args, y, scalar, atol
+
+def _error_norm(error: List[Number], y: List[Number], y_next: List[Number], 
+        atol: List[Number], rtol: Number) -> float:
+    """RMS norm of the error scaled component-wise by atol + rtol * |y|"""
+    return (sum((e_k / (atol_k + rtol * max(abs(y_k), abs(y_next_k))))**2 
+        for e_k, y_k, y_next_k, atol_k in zip(error, y, y_next, atol)) / len(y)) ** 0.5
+
+def _solve_IVP_embedded(
+    f: Func[T, Y], y0: Y, bounds: Tuple[T, T], args: Tuple[Any], tableau: EmbeddedRK, 
+    dt: Optional[T], TOL: Number, atol: Union[None, Number, Sequence[Number]], dt_max: Optional[T], 
+    t_eval: Optional[Sequence[T]], dense_output: bool, name: str, 
+    events: Union[None, "Events", Sequence[Callable[..., Number]]] = None
+    ) -> Union[Tuple[List[T], List[Y]], DenseOutput]:
+    """The adaptive driver of the embedded Runge-Kutta pairs, see `solve_IVP_adaptive`"""
+    recorder = _recorder(bounds[0], y0, t_eval, dense_output)
+    events = _as_events(events)
+    return _collect(_iter_embedded(f, y0, bounds, args, tableau, dt, TOL, atol, dt_max, recorder, name, events), 
+        y0, recorder, events)
+
+def _iter_embedded(
+    f: Func[T, Y], y0: Y, bounds: Tuple[T, T], args: Tuple[Any] = (), tableau: EmbeddedRK = None, 
+    dt: Optional[T] = None, TOL: Number = 1e-6, atol: Union[None, Number, Sequence[Number]] = None, 
+    dt_max: Optional[T] = None, recorder: Optional["_StepRecorder"] = None, name: str = "solve_IVP_adaptive", 
+    events: Optional["Events"] = None) -> Iterator[Tuple[T, Y]]:
+    """The steps (t, y) of `_solve_IVP_embedded`, one at a time"""
+    a, b, c, e, order, error_order, fsal, dense = tableau
+    F, F_args, y, scalar, atol = _as_lists(f, y0, args, TOL, atol)
+    n = len(y)
+    # the nonzero terms only
+    a_terms = [[(j, a_ij) for j, a_ij in enumerate(a_i) if a_ij] for a_i in a]
+    b_terms = [(j, b_j) for j, b_j in enumerate(b) if b_j]
+    e_terms = [(j, e_j) for j, e_j in enumerate(e) if e_j]
+    d_terms = None if dense is None else [(j, d_j) for j, d_j in enumerate(dense) if d_j]
+    exponent = -1 / (error_order + 1)
+    # without a native continuous extension, the interpolated steps are also limited 
+    # by the error of the cubic Hermite interpolant (from the second step)
+    hermite_control = d_terms is None and (recorder is not None or events is not None)
+    previous = None     # (dt, y) of the last step
+    f_1 = None          # f at the end of the step, with hermite_control
+
+    def segment():
+        """The (interpolant, data) of the step from (t, y) to (t_next, y_next)"""
+        if d_terms is not None:
+            difference = [y1_k - y0_k for y0_k, y1_k in zip(y, y_next)]
+            r3 = [dt * s_k - d_k for s_k, d_k in zip(s_0, difference)]
+            r4 = [d_k - dt * s_k - r3_k for d_k, s_k, r3_k in zip(difference, s[-1], r3)]
+            return _Dormand_Prince_segment, (r3, r4, _combine([0.] * n, dt, d_terms, s))
+        if fsal:
+            return _Hermite_segment, (s_0, s[-1])
+        return _Hermite_segment, (s_0, F(t_next, y_next, *F_args) if f_1 is None else f_1)
+
+    t, t_end = bounds
+    yield t, y0
+    if events is not None:
+        events._start(t, y, args, scalar)
+    accepted = 0
+    s_0 = F(t, y, *F_args)
+    if dt is None:
+        dt = _initial_dt(F, F_args, t, y, s_0, order, TOL, atol)
+    rejected = 0
+    step_rejected = False
+    while t < t_end:
+        if s_0 is None:
+            s_0 = F(t, y, *F_args)
+        if recorder is not None:
+            recorder.begin(t, y, s_0)
+        if dt_max is not None:
+            dt = min(dt, dt_max)
+        last = t + dt >= t_end
+        if last:
+            dt = t_end - t
+        if t + dt == t:
+            raise Warning(f"Step size underflow at t = {t}")
+        s = [s_0]
+        for a_i, c_i in zip(a_terms, c):
+            y_stage = _combine(y, dt, a_i, s)
+            s.append(F(t + c_i * dt, y_stage, *F_args))
+        y_next = y_stage if fsal else _combine(y, dt, b_terms, s)
+        error = _combine([0.] * n, dt, e_terms, s)
+        error_norm = _error_norm(error, y, y_next, atol, TOL)
+        t_next = t_end if last else t + dt
+        interpolation_norm = 0.
+        if error_norm <= 1 and hermite_control:
+            f_1 = s[-1] if fsal else F(t_next, y_next, *F_args)
+            if previous is not None:
+                interpolation_norm = _error_norm(_Hermite_error(dt, y, y_next, s_0, f_1, *previous), 
+                    y, y_next, atol, TOL)
+
+        if error_norm <= 1 and interpolation_norm <= 1:
+            accepted += 1
+            if events is not None:
+                stop = events._step(t, y, t_next, y_next, segment)
+                if stop is not None:
+                    t_e, y_e = stop
+                    yield t_e, y_e[0] if scalar else y_e
+                    if recorder is not None:
+                        recorder.end_at(t_e, y_e, t_next, y_next, *segment())
+                    break
+            yield t_next, y_next[0] if scalar else y_next
+            if recorder is not None:
+                recorder.end(t_next, y_next, *segment())
+            previous = (dt, y)
+            t = t_next
+            y = y_next
+            s_0 = s[-1] if fsal else f_1
+            factor = 5. if error_norm == 0 else min(5., 0.9 * error_norm**exponent)
+            if interpolation_norm > 0:
+                factor = min(factor, 0.9 * interpolation_norm**-0.25)
+            if step_rejected:   # no growth right after a rejection
+                factor = min(factor, 1.)
+            dt *= factor
+            step_rejected = False
+        else:
+            rejected += 1
+            step_rejected = True
+            if error_norm > 1:
+                dt *= max(0.2, 0.9 * error_norm**exponent)
+            else:   # the Hermite interpolant is not accurate enough
+                dt *= max(0.2, 0.9 * interpolation_norm**-0.25)
+
+    record(name, accepted=accepted, rejected=rejected)
+    if recorder is not None:
+        recorder.finish(F, F_args, events is not None and events.terminated is not None)
+
+def _initial_dt(F: Callable, F_args: tuple, t: T, y: List[Number], s_0: List[Number], order: int, 
+        rtol: Number, atol: List[Number]) -> T:
+    """Initial step size from the scale of y and y' and an estimate of y'' (Hairer, Norsett and Wanner)"""
+    return _initial_dts(lambda ts, ys: [F(ts[0], ys[0], *F_args)], [t], [y], [s_0], order, rtol, atol)[0]
+
+def _initial_dts(F_batch: Callable[[List[T], List[List[Number]]], List[List[Number]]], 
+        ts: List[T], ys: List[List[Number]], s_0s: List[List[Number]], order: int, 
+        rtol: Number, atol: List[Number]) -> List[T]:
+    """`_initial_dt` for a batch of problems, with a single call of F_batch(ts, ys) -> [f(t, y) for t, y]"""
+    dt_0s = []
+    d_1s = []
+    for y, s_0 in zip(ys, s_0s):
+        scale = [atol_k + rtol * abs(y_k) for y_k, atol_k in zip(y, atol)]
+        d_0 = (sum((y_k / sc)**2 for y_k, sc in zip(y, scale)) / len(y)) ** 0.5
+        d_1 = (sum((s_k / sc)**2 for s_k, sc in zip(s_0, scale)) / len(y)) ** 0.5
+        dt_0s.append(1e-6 if d_0 < 1e-5 or d_1 < 1e-5 else 0.01 * d_0 / d_1)
+        d_1s.append(d_1)
+    s_1s = F_batch([t + dt_0 for t, dt_0 in zip(ts, dt_0s)], 
+        [[y_k + dt_0 * s_k for y_k, s_k in zip(y, s_0)] for y, s_0, dt_0 in zip(ys, s_0s, dt_0s)])
+    dts = []
+    for y, s_0, s_1, dt_0, d_1 in zip(ys, s_0s, s_1s, dt_0s, d_1s):
+        scale = [atol_k + rtol * abs(y_k) for y_k, atol_k in zip(y, atol)]
+        d_2 = (sum(((s1_k - s0_k) / sc)**2 for s0_k, s1_k, sc in zip(s_0, s_1, scale)) / len(y)) ** 0.5 / dt_0
+        if max(d_1, d_2) <= 1e-15:
+            dt_1 = max(1e-6, dt_0 * 1e-3)
+        else:
+            dt_1 = (0.01 / max(d_1, d_2)) ** (1 / (order + 1))
+        dts.append(min(100 * dt_0, dt_1))
+    return dts
+
+@instrumented
+def solve_IVP_adaptive(
     f: Func[T, Y], y0: Y = 0, bounds: Tuple[T, T] = (0, 1),
-    args: Tuple[Any] = (),
-    dt: T = 1e-3, TOL: Y = 1e-6, dt_max: Optional[T] = None) -> Tuple[List[T], List[Y]]:
+    args: Tuple[Any] = (), method: Union[str, EmbeddedRK] = "DP54", 
+    dt: Optional[T] = None, TOL: Y = 1e-6, atol: Union[None, Y, Sequence[Number]] = None, 
+    dt_max: Optional[T] = None, 
+    t_eval: Optional[Sequence[T]] = None, dense_output: bool = False, 
+    events: Union[None, "Events", Sequence[Callable[..., Number]]] = None
+    ) -> Union[Tuple[List[T], List[Y]], DenseOutput]:
     """Solve the IVP ODE problem y' = f(t, y) with initial condition y(t_0) = y_0
-        using RK2/3 (embedded RK pair).
+        using an embedded Runge-Kutta pair with adaptive steps.
+
+    A step is accepted when the RMS norm of the estimated error, scaled component-wise by atol + TOL * |y|, 
+    is not larger than 1, and the next step size is 0.9 * norm**(-1/(q+1)) times the last one 
+    (within [0.2, 5]), q being the order of the embedded method.
+    For FSAL pairs (e.g. "DP54": 6 evaluations of f per accepted step), the last stage is reused.
+    The steps are interpolated (for t_eval, dense_output and events) with the native continuous extension 
+    of "DP54" and "Tsit5". The other pairs use the cubic Hermite interpolant, and from the second step 
+    on, its estimated error then also limits the step size. For "PD87" this takes many more steps.
 
     TypeVars:
         T = TypeVar("T", bound=Number)
@@ -291,85 +970,94 @@ def solve_IVP_RK23(
             and the second be a number or a list of number representing the function value.
         y0 (Y, optional): Initial value y(t_0). Defaults to 0.
         bounds (Tuple[T, T], optional): The range of parametres of the system. Defaults to (0, 1).
-        N (int, optional): The number of steps in the given bounds. Defaults to 100.
         args (Tuple[Any], optional): Additional args to be passed to f. Defaults to ().
+        method (str | EmbeddedRK, optional): one of SUPPORTED_TABLEAUS 
+            ("DP54", "BS32", "Tsit5", "PD87", "RK23", "RKF45"), or an `EmbeddedRK`. Defaults to "DP54".
+        dt (T, optional): Initial step size. Defaults to None (estimated).
+        TOL (Y, optional): relative tolerance. Defaults to 1e-6.
+        atol (Y | Sequence[Number], optional): absolute tolerance, for all the components or for each one. 
+            Defaults to None (TOL).
+        dt_max (T | None, optional): Max step size. Defaults to None.
+        t_eval (Sequence[T], optional): if given, the solution is returned at these points (in the bounds) 
+            instead of at the steps, interpolated within the steps (see `DenseOutput`). Defaults to None.
+        dense_output (bool, optional): if True, return the continuous solution as a `DenseOutput`, 
+            and t_eval is ignored. Defaults to False.
+        events (Events | Sequence[(T, Y, Any) -> Number], optional): event functions g(t, y, *args), 
+            whose zeros are located within the steps (the integration stops at the first zero of a terminal one), 
+            see `Events`. Defaults to None.
+
+    Raises:
+        ValueError: raised when the method is unknown.
+        Warning: raised when the step size underflows.
 
     Returns:
-        Tuple[List[T], List[Y]]: (ts, ys) 
+        Tuple[List[T], List[Y]] | DenseOutput: (ts, ys), or the continuous solution if dense_output, 
+            and with events: (ts, ys, t_events, y_events) with the zeros of each event function 
+            (the attributes t_events and y_events of the continuous solution)
     """
-    y = y0
-    t, t_end = bounds
-    retry = False   # is it the second time to rechoose dt?
-    y_output = [y0]
-    t_output = [t]
-    if isinstance(y, Number):
-        while t < t_end:
-            s1 = f(t, y, *args)
-            s2 = f(t + dt, y + s1 * dt, *args)
-            s3 = f(t + dt/2, y + 1/4 * (s1 + s2) * dt, *args)
-            if y:
-                error_y_rel = abs(dt/3 * (s1 - 2 * s3 + s2)) / y    # |next_y(RK3) - next_y(RK2)| / y
-            else:
-                error_y_rel = abs(dt/3 * (s1 - 2 * s3 + s2))    # |next_y(RK3) - next_y(RK2)|
-
-            if error_y_rel < TOL:
-                if t + dt > t_end:
-                    dt = t_end - t
-                    continue
-                t += dt
-                t_output.append(t)
-                y += dt/6 * (s1 + s2 + 4*s3)    # RK3
-                dt = _next_dt(dt, error_y_rel, 2, TOL, dt_max)
-                y_output.append(y)
-                retry = False
-            else:
-                if retry:
-                    dt /= 2
-                else:
-                    dt = _next_dt(dt, error_y_rel, 2, TOL, dt_max)
-                    retry = True
+    if isinstance(method, str):
+        tableau = _TABLEAUS.get(method.lower())
+        if tableau is None:
+            raise ValueError(f"method {method} not supported. Should be one of {list(SUPPORTED_TABLEAUS.keys())}")
     else:
-        while t < t_end:
-            s1 = f(t, y, *args)
-            s2 = f(t + dt, [y_i + s1[i] * dt for i, y_i in enumerate(y)], *args)
-            s3 = f(t + dt/2, [y_i + 1/4 * (s1[i] + s2[i]) * dt for i, y_i in enumerate(y)], *args)
-            error_y = dt/3 * sum(
-                (s1_i - 2 * s3_i + s2_i) ** 2 
-                    for s1_i, s2_i, s3_i in zip(s1, s2, s3)) ** 0.5    # |next_y(RK3) - next_y(RK2)|
-            y_length = sum(y_i**2 for y_i in y) ** 0.5
-            if y_length:
-                error_y_rel =  error_y / y_length   # |next_y(RK3) - next_y(RK2)| / y
-            else:
-                error_y_rel = error_y
+        tableau = method
+    return _solve_IVP_embedded(f, y0, bounds, args, tableau, dt, TOL, atol, dt_max, t_eval, dense_output, 
+        "solve_IVP_adaptive", events)
 
-            if error_y_rel < TOL:
-                if t + dt > t_end:
-                    dt = t_end - t
-                    continue
-                t += dt
-                t_output.append(t)
-                next_y = []
-                for i, y_i in enumerate(y):
-                    next_y.append(y_i +  dt/6 * (s1[i] + s2[i] + 4*s3[i]))   # RK3
-                y_output.append(next_y)
-                dt = _next_dt(dt, error_y_rel, 2, TOL, dt_max)
-                y = next_y
-                retry = False
-            else:
-                if retry:
-                    dt /= 2
-                else:
-                    dt = _next_dt(dt, error_y_rel, 2, TOL, dt_max)
-                    retry = True
-        
-    return t_output, y_output
+@instrumented
+def solve_IVP_RK23(
+    f: Func[T, Y], y0: Y = 0, bounds: Tuple[T, T] = (0, 1),
+    args: Tuple[Any] = (),
+    dt: T = 1e-3, TOL: Y = 1e-6, dt_max: Optional[T] = None, 
+    t_eval: Optional[Sequence[T]] = None, dense_output: bool = False, 
+    atol: Union[None, Y, Sequence[Number]] = None, 
+    events: Union[None, "Events", Sequence[Callable[..., Number]]] = None
+    ) -> Union[Tuple[List[T], List[Y]], DenseOutput]:
+    """Solve the IVP ODE problem y' = f(t, y) with initial condition y(t_0) = y_0
+        using RK2/3 (embedded RK pair), see `solve_IVP_adaptive`.
 
+    TypeVars:
+        T = TypeVar("T", bound=Number)
+        Y = TypeVar("Y", Number, List[Number])
+        Func = (T, Y, Any) -> Y
+    Args:
+        f (Func[T, Y], Y]): The function f in y' = f(t, y), 
+            with first parametre one be the parametre of the system 
+            and the second be a number or a list of number representing the function value.
+        y0 (Y, optional): Initial value y(t_0). Defaults to 0.
+        bounds (Tuple[T, T], optional): The range of parametres of the system. Defaults to (0, 1).
+        args (Tuple[Any], optional): Additional args to be passed to f. Defaults to ().
+        dt (T, optional): Initial step size. Defaults to 1e-3.
+        TOL (Y, optional): relative tolerance. Defaults to 1e-6.
+        dt_max (T | None, optional): Max step size. Defaults to be None.
+        t_eval (Sequence[T], optional): if given, the solution is returned at these points (in the bounds) 
+            instead of at the steps, interpolated within the steps (see `DenseOutput`). Defaults to None.
+        dense_output (bool, optional): if True, return the continuous solution as a `DenseOutput`, 
+            and t_eval is ignored. Defaults to False.
+        atol (Y | Sequence[Number], optional): absolute tolerance. Defaults to None (TOL).
+        events (Events | Sequence[(T, Y, Any) -> Number], optional): event functions g(t, y, *args), 
+            whose zeros are located within the steps (the integration stops at the first zero of a terminal one), 
+            see `Events`. Defaults to None.
+
+    Returns:
+        Tuple[List[T], List[Y]] | DenseOutput: (ts, ys), or the continuous solution if dense_output, 
+            and with events: (ts, ys, t_events, y_events) with the zeros of each event function 
+            (the attributes t_events and y_events of the continuous solution)
+    """
+    return _solve_IVP_embedded(f, y0, bounds, args, RK23, dt, TOL, atol, dt_max, t_eval, dense_output, 
+        "solve_IVP_RK23", events)
+
+@instrumented
 def solve_IVP_RKF45(
     f: Func[T, Y], y0: Y = 0, bounds: Tuple[T, T] = (0, 1),
     args: Tuple[Any] = (), 
-    dt: T = 1e-3, TOL: Y = 1e-6, dt_max: Optional[T] = None) -> Tuple[List[T], List[Y]]:
+    dt: T = 1e-3, TOL: Y = 1e-6, dt_max: Optional[T] = None, 
+    t_eval: Optional[Sequence[T]] = None, dense_output: bool = False, 
+    atol: Union[None, Y, Sequence[Number]] = None, 
+    events: Union[None, "Events", Sequence[Callable[..., Number]]] = None
+    ) -> Union[Tuple[List[T], List[Y]], DenseOutput]:
     """Solve the IVP ODE problem y' = f(t, y) with initial condition y(t_0) = y_0
-        using RKF4/5 (embedded RK pair).
+        using RKF4/5 (embedded RK pair), see `solve_IVP_adaptive`.
 
     TypeVars:
         T = TypeVar("T", bound=Number)
@@ -383,132 +1071,1312 @@ def solve_IVP_RKF45(
         args (Tuple[Any], optional): Additional args to be passed to f. Defaults to ().
         bounds (Tuple[T, T], optional): The range of parametres of the system. Defaults to (0, 1).
         dt (T, optional): Initial step size. Defaults to 1e-3.
-        TOL (Y, optional): Tolerent error (relative when y is not zero). Defaults to 1e-6.
+        TOL (Y, optional): relative tolerance. Defaults to 1e-6.
         dt_max (T | None, optional): Max step size. Defaults to be None.
+        t_eval (Sequence[T], optional): if given, the solution is returned at these points (in the bounds) 
+            instead of at the steps, interpolated within the steps (see `DenseOutput`). Defaults to None.
+        dense_output (bool, optional): if True, return the continuous solution as a `DenseOutput`, 
+            and t_eval is ignored. Defaults to False.
+        atol (Y | Sequence[Number], optional): absolute tolerance. Defaults to None (TOL).
+        events (Events | Sequence[(T, Y, Any) -> Number], optional): event functions g(t, y, *args), 
+            whose zeros are located within the steps (the integration stops at the first zero of a terminal one), 
+            see `Events`. Defaults to None.
+
+    Returns:
+        Tuple[List[T], List[Y]] | DenseOutput: (ts, ys), or the continuous solution if dense_output, 
+            and with events: (ts, ys, t_events, y_events) with the zeros of each event function 
+            (the attributes t_events and y_events of the continuous solution)
+    """
+    return _solve_IVP_embedded(f, y0, bounds, args, RKF45, dt, TOL, atol, dt_max, t_eval, dense_output, 
+        "solve_IVP_RKF45", events)
+
+def _rms(v: List[Number], scale: List[Number]) -> float:
+    """RMS norm of v scaled component-wise"""
+    return (sum((abs(v_k) / scale_k)**2 for v_k, scale_k in zip(v, scale)) / len(v)) ** 0.5
+
+def _jacobian_function(F: Callable, F_args: tuple, scalar: bool, args: tuple,
+        jac: Optional[Callable[..., Any]], jac_sparsity: Any) -> Callable[[T, List[Number], Optional[List[Number]]], List[List[Number]]]:
+    """J(t, y, F(t, y) or None) -> df/dy as a list of lists,
+        from the user's jac(t, y, *args) (a number, a `Matrix` or a list of lists) or by forward differences
+    """
+    if jac is not None:
+        def J(t, y, f_0):
+            value = jac(t, y[0] if scalar else y, *args)
+            if isinstance(value, Number):
+                return [[value]]
+            return [list(row) for row in (value.elements if isinstance(value, Matrix) else value)]
+        return J
+
+    def J(t, y, f_0):
+        return jacobian(lambda x: F(t, x, *F_args), y, sparsity=jac_sparsity, F0=f_0).elements
+    return J
+
+def _shifted(J: List[List[Number]], a: Number, b: Number) -> List[List[Number]]:
+    """a * I - b * J"""
+    return [[(a if i == j else 0.) - b * J_ij for j, J_ij in enumerate(row)] for i, row in enumerate(J)]
+
+def _implicit_setup(f, y0, args, TOL, atol, jac, jac_sparsity):
+    """The common state of the implicit solvers"""
+    F, F_args, y, scalar, atol = _as_lists(f, y0, args, TOL, atol)
+    J_of = _jacobian_function(F, F_args, scalar, args, jac, jac_sparsity)
+    # the tolerance of the (simplified) Newton iterations, relative to the error tolerance
+    newton_TOL = max(10 * _EPS / TOL, min(0.03, TOL ** 0.5))
+    return F, F_args, y, scalar, atol, J_of, newton_TOL
+
+_BDF_MAX_ORDER = 5
+_BDF_NEWTON_MAXITER = 4
+_BDF_GAMMA = [sum(1 / j for j in range(1, k + 1)) for k in range(_BDF_MAX_ORDER + 1)]
+_BDF_ERROR_CONST = [1 / (k + 1) for k in range(_BDF_MAX_ORDER + 2)]
+
+def _BDF_change_D(D: List[List[Number]], order: int, factor: float) -> None:
+    """Rescale (in place) the backward differences D[:order+1] of the solution
+        when the step size is multiplied by factor
+    """
+    def R(factor):
+        M = [[1.] * (order + 1)] + [[0.] + [(i - 1 - factor * j) / i for j in range(1, order + 1)]
+            for i in range(1, order + 1)]
+        for i in range(1, order + 1):
+            M[i] = [M_ij * M_i_1j for M_ij, M_i_1j in zip(M[i], M[i-1])]
+        return M
+    R_factor, U = R(factor), R(1.)
+    RU = [[sum(R_factor[i][k] * U[k][j] for k in range(order + 1)) for j in range(order + 1)]
+        for i in range(order + 1)]
+    D[:order+1] = [[sum(RU[k][i] * D[k][m] for k in range(order + 1)) for m in range(len(D[0]))]
+        for i in range(order + 1)]
+
+def _BDF_segment(theta: float, dt: T, y0: List[Number], y1: List[Number], D: List[List[Number]]) -> List[Number]:
+    """Interpolating polynomial of the BDF method from the backward differences D at the end of the step"""
+    y = D[0]
+    p = 1.
+    for j in range(1, len(D)):
+        p *= (theta + j - 2) / j
+        y = [y_k + p * D_jk for y_k, D_jk in zip(y, D[j])]
+    return y
+
+def _BDF_Newton(F: Callable, F_args: tuple, t: T, y_predict: List[Number], c: Number, psi: List[Number],
+        LU: tuple, scale: List[Number], TOL: Number) -> Tuple[bool, int, List[Number], List[Number]]:
+    """Simplified Newton iterations of the BDF system y - c f(t, y) - psi - y_predict = 0,
+        returning (converged, iterations, y, y - y_predict)
+    """
+    y = y_predict
+    d = [0.] * len(y)
+    dy_norm_old = None
+    for k in range(_BDF_NEWTON_MAXITER):
+        f = F(t, y, *F_args)
+        if not all(map(isfinite, f)):
+            break
+        dy = lu_solve(LU, [c * f_k - psi_k - d_k for f_k, psi_k, d_k in zip(f, psi, d)])
+        dy_norm = _rms(dy, scale)
+        rate = None if dy_norm_old is None else dy_norm / dy_norm_old
+        if rate is not None and (rate >= 1 or rate ** (_BDF_NEWTON_MAXITER - k) / (1 - rate) * dy_norm > TOL):
+            break   # diverging, or too slow to converge within the iterations left
+        y = [y_k + dy_k for y_k, dy_k in zip(y, dy)]
+        d = [d_k + dy_k for d_k, dy_k in zip(d, dy)]
+        if dy_norm == 0 or rate is not None and rate / (1 - rate) * dy_norm < TOL:
+            return True, k + 1, y, d
+        dy_norm_old = dy_norm
+    return False, k + 1, y, d
+
+@instrumented
+def solve_IVP_BDF(
+    f: Func[T, Y], y0: Y = 0, bounds: Tuple[T, T] = (0, 1),
+    args: Tuple[Any] = (),
+    dt: Optional[T] = None, TOL: Y = 1e-6, atol: Union[None, Y, Sequence[Number]] = None,
+    dt_max: Optional[T] = None,
+    jac: Optional[Callable[..., Any]] = None, jac_sparsity: Any = None, max_order: int = 5,
+    t_eval: Optional[Sequence[T]] = None, dense_output: bool = False,
+    events: Union[None, "Events", Sequence[Callable[..., Number]]] = None
+    ) -> Union[Tuple[List[T], List[Y]], DenseOutput]:
+    """Solve the stiff IVP ODE problem y' = f(t, y) with initial condition y(t_0) = y_0
+        using the backward differentiation formulas of variable order (1 to max_order) and step size.
+
+    The solution is kept as backward differences on an equally spaced grid, which are rescaled
+    when the step size changes. The implicit formula is solved with simplified Newton iterations,
+    whose matrix I - c J is factorized once and reused as long as the step size and the order are unchanged
+    (they change at most every order + 1 steps). The Jacobian J is reused across the steps,
+    and updated only when the iterations fail to converge.
+
+    TypeVars:
+        T = TypeVar("T", bound=Number)
+        Y = TypeVar("Y", Number, List[Number])
+        Func = (T, Y, Any) -> Y
+    Args:
+        f (Func[T, Y], Y]): The function f in y' = f(t, y),
+            with first parametre one be the parametre of the system
+            and the second be a number or a list of number representing the function value.
+        y0 (Y, optional): Initial value y(t_0). Defaults to 0.
+        bounds (Tuple[T, T], optional): The range of parametres of the system. Defaults to (0, 1).
+        args (Tuple[Any], optional): Additional args to be passed to f (and jac). Defaults to ().
+        dt (T, optional): Initial step size. Defaults to None (estimated).
+        TOL (Y, optional): relative tolerance. Defaults to 1e-6.
+        atol (Y | Sequence[Number], optional): absolute tolerance. Defaults to None (TOL).
+        dt_max (T | None, optional): Max step size. Defaults to None.
+        jac ((T, Y, Any) -> Number | Matrix | List[List[Number]], optional): the Jacobian df/dy.
+            Defaults to None, i.e. forward differences (see `Differentiation.jacobian`).
+        jac_sparsity (Matrix | List[List[Any]], optional): the sparsity pattern of df/dy
+            for the finite differences. Defaults to None.
+        max_order (int, optional): the max order, in [1, 5]. Defaults to 5.
+        t_eval (Sequence[T], optional): if given, the solution is returned at these points (in the bounds)
+            instead of at the steps, interpolated within the steps. Defaults to None.
+        dense_output (bool, optional): if True, return the continuous solution as a `DenseOutput`,
+            and t_eval is ignored. Defaults to False.
+        events (Events | Sequence[(T, Y, Any) -> Number], optional): event functions g(t, y, *args), 
+            whose zeros are located within the steps (the integration stops at the first zero of a terminal one), 
+            see `Events`. Defaults to None.
+
+    Raises:
+        ValueError: raised when max_order is not in [1, 5].
+        Warning: raised when the step size underflows.
 
     Returns:
-        Tuple[List[T], List[Y]]: (ts, ys) 
+        Tuple[List[T], List[Y]] | DenseOutput: (ts, ys), or the continuous solution if dense_output, 
+            and with events: (ts, ys, t_events, y_events) with the zeros of each event function 
+            (the attributes t_events and y_events of the continuous solution)
     """
-    y = y0
+    if not 1 <= max_order <= _BDF_MAX_ORDER:
+        raise ValueError(f"max_order should be in [1, {_BDF_MAX_ORDER}].")
+    recorder = _recorder(bounds[0], y0, t_eval, dense_output)
+    events = _as_events(events)
+    return _collect(_iter_BDF(f, y0, bounds, args, dt, TOL, atol, dt_max, jac, jac_sparsity, max_order, recorder, events), 
+        y0, recorder, events)
+
+def _iter_BDF(
+    f: Func[T, Y], y0: Y, bounds: Tuple[T, T], args: Tuple[Any] = (),
+    dt: Optional[T] = None, TOL: Y = 1e-6, atol: Union[None, Y, Sequence[Number]] = None,
+    dt_max: Optional[T] = None,
+    jac: Optional[Callable[..., Any]] = None, jac_sparsity: Any = None, max_order: int = 5,
+    recorder: Optional["_StepRecorder"] = None, events: Optional["Events"] = None
+    ) -> Iterator[Tuple[T, Y]]:
+    """The steps (t, y) of `solve_IVP_BDF`, one at a time"""
+    F, F_args, y, scalar, atol, J_of, newton_TOL = _implicit_setup(f, y0, args, TOL, atol, jac, jac_sparsity)
+    n = len(y)
     t, t_end = bounds
-    retry = False   # is it the second time to rechoose dt?
-    y_output = [y0]
-    t_output = [t]
-    if isinstance(y, Number):
-        while t < t_end:
-            s1 = f(t, y, *args)
-            s2 = f(t + dt/4, y + s1 * dt/4, *args)
-            s3 = f(t + 3*dt/8, y + dt/32 * (3 * s1 + 9 * s2), *args)
-            s4 = f(t + 12/13 * dt, y + dt/2197 * (1932 * s1 - 7200 * s2 + 7296 * s3), *args)
-            s5 = f(t + dt, y + dt * (439/216 * s1 - 8 * s2 + 3680/513 * s3 - 845/4104 * s4), *args)
-            s6 = f(
-                t + dt/2, 
-                y + dt * (-8/27 * s1 + 2 * s2 - 3544/2565 * s3 + 1859/4104 * s4 - 11/40 * s5),
-                *args)
-            error_y = abs(dt * (s1/360 - 128/4275 * s3 
-                                - 2197/75_240 * s4 + s5 / 50 + 2/55 * s6))  # |next_y(RK5) - next_y(RK4)|
-            if y:
-                error_y_rel = error_y / y    # |next_y(RK5) - next_y(RK4)| / y
-            else:
-                error_y_rel = error_y 
+    yield t, y0
+    if events is not None:
+        events._start(t, y, args, scalar)
+    accepted = 0
+    f_0 = F(t, y, *F_args)
+    if dt is None:
+        dt = _initial_dt(F, F_args, t, y, f_0, 1, TOL, atol)
+    if dt_max is not None:
+        dt = min(dt, dt_max)
+    J = J_of(t, y, f_0)
+    current_jac = True
+    LU = None
+    D = [y, [dt * f_k for f_k in f_0]] + [[0.] * n for _ in range(max_order + 1)]
+    order = 1
+    n_equal_steps = 0
+    rejected = iterations = 0
+    while t < t_end:
+        if recorder is not None:
+            recorder.begin(t, y, None)
+        last = t + dt >= t_end
+        if last and t_end - t != dt:
+            _BDF_change_D(D, order, (t_end - t) / dt)
+            dt = t_end - t
+            n_equal_steps = 0
+            LU = None
+        if t + dt == t:
+            raise Warning(f"Step size underflow at t = {t}")
+        t_next = t_end if last else t + dt
+        y_predict = [sum(D_k) for D_k in zip(*D[:order+1])]
+        scale = [atol_k + TOL * abs(y_k) for atol_k, y_k in zip(atol, y_predict)]
+        alpha = _BDF_GAMMA[order]
+        psi = [sum(gamma_j * D_jk for gamma_j, D_jk in zip(_BDF_GAMMA[1:order+1], D_k)) / alpha
+            for D_k in zip(*D[1:order+1])]
+        c = dt / alpha
+        while True:
+            if LU is None:
+                LU = lu_factor(_shifted(J, 1., c))
+            converged, n_iter, y_next, d = _BDF_Newton(F, F_args, t_next, y_predict, c, psi, LU, scale, newton_TOL)
+            iterations += n_iter
+            if converged or current_jac:
+                break
+            J = J_of(t_next, y_predict, None)
+            current_jac = True
+            LU = None
+        if not converged:
+            rejected += 1
+            _BDF_change_D(D, order, 0.5)
+            dt *= 0.5
+            n_equal_steps = 0
+            LU = None
+            continue
 
-            if error_y_rel < TOL:
-                if t + dt > t_end:
-                    dt = t_end - t
-                    continue
-                t += dt
-                t_output.append(t)
-                y += dt * (16/135 * s1 + 6656/12_825 * s3 + 28_561/56_430 * s4 - 9/50 * s5 + 2/55 * s6)    # RK5
-                dt = _next_dt(dt, error_y_rel, 4, TOL, dt_max)
-                y_output.append(y)
-                retry = False
-            else:
-                if retry:
-                    dt /= 2
-                else:
-                    dt = _next_dt(dt, error_y_rel, 4, TOL, dt_max)
-                    retry = True
+        safety = 0.9 * (2 * _BDF_NEWTON_MAXITER + 1) / (2 * _BDF_NEWTON_MAXITER + n_iter)
+        scale = [atol_k + TOL * abs(y_k) for atol_k, y_k in zip(atol, y_next)]
+        error_norm = _BDF_ERROR_CONST[order] * _rms(d, scale)
+        if error_norm > 1:
+            rejected += 1
+            factor = max(0.2, safety * error_norm ** (-1 / (order + 1)))
+            _BDF_change_D(D, order, factor)
+            dt *= factor
+            n_equal_steps = 0
+            LU = None
+            continue
+
+        current_jac = False
+        n_equal_steps += 1
+        D[order+2] = [d_k - D_k for d_k, D_k in zip(d, D[order+1])]
+        D[order+1] = d
+        for i in range(order, -1, -1):
+            D[i] = [D_ik + D_i1k for D_ik, D_i1k in zip(D[i], D[i+1])]
+        accepted += 1
+        if events is not None:
+            stop = events._step(t, y, t_next, y_next, lambda: (_BDF_segment, (D[:order+1],)))
+            if stop is not None:
+                t_e, y_e = stop
+                yield t_e, y_e[0] if scalar else y_e
+                if recorder is not None:
+                    recorder.end_at(t_e, y_e, t_next, y_next, _BDF_segment, (D[:order+1],))
+                break
+        t = t_next
+        y = y_next
+        yield t, y[0] if scalar else y
+        if recorder is not None:
+            recorder.end(t, y, _BDF_segment, (D[:order+1],))
+
+        if n_equal_steps < order + 1:
+            continue
+        # the order with the largest step size for the error estimates of the orders order - 1, order, order + 1
+        error_norms = [
+            _BDF_ERROR_CONST[order-1] * _rms(D[order], scale) if order > 1 else inf,
+            error_norm,
+            _BDF_ERROR_CONST[order+1] * _rms(D[order+2], scale) if order < max_order else inf]
+        factors = [inf if norm == 0 else norm ** (-1 / (order + i)) for i, norm in enumerate(error_norms)]
+        delta_order = max(range(3), key=factors.__getitem__) - 1
+        order += delta_order
+        factor = min(10., safety * max(factors))
+        if dt_max is not None:
+            factor = min(factor, dt_max / dt)
+        _BDF_change_D(D, order, factor)
+        dt *= factor
+        n_equal_steps = 0
+        LU = None
+
+    record("solve_IVP_BDF", accepted=accepted, rejected=rejected, iterations=iterations,
+        matrix_size=(n, n))
+    if recorder is not None:
+        recorder.finish(F, F_args, events is not None and events.terminated is not None)
+
+_S6 = 6 ** 0.5
+_RADAU_C = [(4 - _S6) / 10, (4 + _S6) / 10, 1.]
+_RADAU_E = [(-13 - 7 * _S6) / 3, (-13 + 7 * _S6) / 3, -1 / 3]
+# eigenvalues of the inverse of the Radau IIA matrix, and its eigenvectors T (the real form)
+_RADAU_MU_REAL = 3 + 3 ** (2 / 3) - 3 ** (1 / 3)
+_RADAU_MU_COMPLEX = 3 + 0.5 * (3 ** (1 / 3) - 3 ** (2 / 3)) - 0.5j * (3 ** (5 / 6) + 3 ** (7 / 6))
+_RADAU_T = [
+    [0.09443876248897524, -0.14125529502095421, 0.03002919410514742],
+    [0.25021312296533332, 0.20412935229379994, -0.38294211275726192],
+    [1., 1., 0.]]
+_RADAU_TI = [
+    [4.17871859155190428, 0.32768282076106237, 0.52337644549944951],
+    [-4.17871859155190428, -0.32768282076106237, 0.47662355450055044],
+    [0.50287263494578682, -2.57192694985560522, 0.59603920482822492]]
+_RADAU_TI_COMPLEX = [TI_1j + 1j * TI_2j for TI_1j, TI_2j in zip(_RADAU_TI[1], _RADAU_TI[2])]
+# the collocation polynomial of a step in powers of theta
+_RADAU_P = [
+    [13 / 3 + 7 * _S6 / 3, -23 / 3 - 22 * _S6 / 3, 10 / 3 + 5 * _S6],
+    [13 / 3 - 7 * _S6 / 3, -23 / 3 + 22 * _S6 / 3, 10 / 3 - 5 * _S6],
+    [1 / 3, -8 / 3, 10 / 3]]
+_RADAU_NEWTON_MAXITER = 6
+
+def _Radau_segment(theta: float, dt: T, y0: List[Number], y1: List[Number], Q: List[List[Number]]) -> List[Number]:
+    """Collocation polynomial of a Radau IIA step, y0 + Q[0] theta + Q[1] theta^2 + Q[2] theta^3"""
+    return [y0_k + theta * (Q0_k + theta * (Q1_k + theta * Q2_k)) for y0_k, Q0_k, Q1_k, Q2_k in zip(y0, *Q)]
+
+def _Radau_Newton(F: Callable, F_args: tuple, t: T, y: List[Number], dt: T, Z: List[List[Number]],
+        scale: List[Number], TOL: Number, LU_real: tuple, LU_complex: tuple
+        ) -> Tuple[bool, int, List[List[Number]], Optional[float]]:
+    """Simplified Newton iterations of the Radau IIA stages Z_i = y_i - y,
+        in the eigenbasis of the Radau matrix where the 3n system splits into a real and a complex n system.
+    Returns (converged, iterations, Z, rate of convergence)
+    """
+    n = len(y)
+    M_real = _RADAU_MU_REAL / dt
+    M_complex = _RADAU_MU_COMPLEX / dt
+    W = [[sum(TI_ij * Z[j][k] for j, TI_ij in enumerate(TI_i)) for k in range(n)] for TI_i in _RADAU_TI]
+    dW_norm_old = None
+    rate = None
+    for k in range(_RADAU_NEWTON_MAXITER):
+        s = [F(t + c_i * dt, [y_k + Z_ik for y_k, Z_ik in zip(y, Z_i)], *F_args) for c_i, Z_i in zip(_RADAU_C, Z)]
+        if not all(isfinite(s_ik) for s_i in s for s_ik in s_i):
+            break
+        dW_real = lu_solve(LU_real, [
+            sum(TI_j * s_jm for TI_j, s_jm in zip(_RADAU_TI[0], s_m)) - M_real * W_0m
+            for s_m, W_0m in zip(zip(*s), W[0])])
+        dW_complex = lu_solve(LU_complex, [
+            sum(TI_j * s_jm for TI_j, s_jm in zip(_RADAU_TI_COMPLEX, s_m)) - M_complex * (W_1m + 1j * W_2m)
+            for s_m, W_1m, W_2m in zip(zip(*s), W[1], W[2])])
+        dW = [dW_real, [dW_m.real for dW_m in dW_complex], [dW_m.imag for dW_m in dW_complex]]
+        dW_norm = _rms([dW_im for dW_i in dW for dW_im in dW_i], scale * 3)
+        if dW_norm_old is not None:
+            rate = dW_norm / dW_norm_old
+        if rate is not None and (rate >= 1 or rate ** (_RADAU_NEWTON_MAXITER - k) / (1 - rate) * dW_norm > TOL):
+            break
+        W = [[W_im + dW_im for W_im, dW_im in zip(W_i, dW_i)] for W_i, dW_i in zip(W, dW)]
+        Z = [[sum(T_ij * W[j][m] for j, T_ij in enumerate(T_i)) for m in range(n)] for T_i in _RADAU_T]
+        if dW_norm == 0 or rate is not None and rate / (1 - rate) * dW_norm < TOL:
+            return True, k + 1, Z, rate
+        dW_norm_old = dW_norm
+    return False, k + 1, Z, rate
+
+def _Radau_factor(dt: T, dt_old: Optional[T], error_norm: float, error_norm_old: Optional[float]) -> float:
+    """Step size factor with the predictive controller of Gustafsson"""
+    if error_norm == 0:
+        return inf
+    if error_norm_old is None or dt_old is None:
+        multiplier = 1.
     else:
-        while t < t_end:
-            s1 = f(t, y, *args)
-            s2 = f(
-                t + dt/4, 
-                [y_i + s1[i] * dt/4 for i, y_i in enumerate(y)], 
-                *args)
-            s3 = f(
-                t + 3*dt/8, 
-                [y_i + dt/32 * (3 * s1[i] + 9 * s2[i]) for i, y_i in enumerate(y)], 
-                *args)
-            s4 = f(
-                t + 12/13 * dt, 
-                [y_i + dt/2197 * (1932 * s1[i] - 7200 * s2[i] + 7296 * s3[i]) 
-                    for i, y_i in enumerate(y)], 
-                *args)
-            s5 = f(
-                t + dt, 
-                [y_i + dt * (439/216 * s1[i] - 8 * s2[i] + 3680/513 * s3[i] - 845/4104 * s4[i])
-                    for i, y_i in enumerate(y)], 
-                *args)
-            s6 = f(
-                t + dt/2, 
-                [y_i + dt * (-8/27 * s1[i] + 2 * s2[i] - 3544/2565 * s3[i] + 1859/4104 * s4[i] - 11/40 * s5[i])
-                    for i, y_i in enumerate(y)],
-                *args)
-            error_y = dt * sum(
-                (s1_i/360 - 128/4275 * s3_i
-                    - 2197/75_240 * s4_i + s5_i / 50 + 2/55 * s6_i)**2 
-                        for s1_i, s3_i, s4_i, s5_i, s6_i 
-                            in zip(s1, s3, s4, s5, s6)) ** 0.5  # |next_y(RK5) - next_y(RK4)|
-            y_length = sum(y_i**2 for y_i in y) ** 0.5
-            if y_length:
-                error_y_rel = error_y / sum(y_i**2 for y_i in y) ** 0.5    # |next_y(RK5) - next_y(RK4)| / y
-            else:
-                error_y_rel = error_y   
+        multiplier = dt / dt_old * (error_norm_old / error_norm) ** 0.25
+    return min(1., multiplier) * error_norm ** -0.25
 
-            if error_y_rel < TOL:
-                if t + dt > t_end:
-                    dt = t_end - t
-                    continue
-                t += dt
-                t_output.append(t)
-                
-                next_y = []
-                for i, y_i in enumerate(y):
-                    next_y.append(y_i + dt * (16/135 * s1[i] + 6656/12_825 * s3[i] 
-                                    + 28_561/56_430 * s4[i] - 9/50 * s5[i] + 2/55 * s6[i]))    # RK5
-                dt = _next_dt(dt, error_y_rel, 4, TOL, dt_max)
-                y_output.append(next_y)
-                y = next_y
-                retry = False
+@instrumented
+def solve_IVP_Radau(
+    f: Func[T, Y], y0: Y = 0, bounds: Tuple[T, T] = (0, 1),
+    args: Tuple[Any] = (),
+    dt: Optional[T] = None, TOL: Y = 1e-6, atol: Union[None, Y, Sequence[Number]] = None,
+    dt_max: Optional[T] = None,
+    jac: Optional[Callable[..., Any]] = None, jac_sparsity: Any = None,
+    t_eval: Optional[Sequence[T]] = None, dense_output: bool = False,
+    events: Union[None, "Events", Sequence[Callable[..., Number]]] = None
+    ) -> Union[Tuple[List[T], List[Y]], DenseOutput]:
+    """Solve the stiff IVP ODE problem y' = f(t, y) with initial condition y(t_0) = y_0
+        using the implicit Runge-Kutta method Radau IIA of order 5 (3 stages) with adaptive steps.
+
+    The 3n stage equations are solved with simplified Newton iterations
+    in the eigenbasis of the Radau matrix, i.e. with one real and one complex n system,
+    started from the collocation polynomial of the last step.
+    The two LU factorizations are reused while the step size changes by less than 20%,
+    and the Jacobian is reused across the steps, and updated only when the iterations converge slowly.
+
+    TypeVars:
+        T = TypeVar("T", bound=Number)
+        Y = TypeVar("Y", Number, List[Number])
+        Func = (T, Y, Any) -> Y
+    Args:
+        f (Func[T, Y], Y]): The function f in y' = f(t, y),
+            with first parametre one be the parametre of the system
+            and the second be a number or a list of number representing the function value.
+        y0 (Y, optional): Initial value y(t_0). Defaults to 0.
+        bounds (Tuple[T, T], optional): The range of parametres of the system. Defaults to (0, 1).
+        args (Tuple[Any], optional): Additional args to be passed to f (and jac). Defaults to ().
+        dt (T, optional): Initial step size. Defaults to None (estimated).
+        TOL (Y, optional): relative tolerance. Defaults to 1e-6.
+        atol (Y | Sequence[Number], optional): absolute tolerance. Defaults to None (TOL).
+        dt_max (T | None, optional): Max step size. Defaults to None.
+        jac ((T, Y, Any) -> Number | Matrix | List[List[Number]], optional): the Jacobian df/dy.
+            Defaults to None, i.e. forward differences (see `Differentiation.jacobian`).
+        jac_sparsity (Matrix | List[List[Any]], optional): the sparsity pattern of df/dy
+            for the finite differences. Defaults to None.
+        t_eval (Sequence[T], optional): if given, the solution is returned at these points (in the bounds)
+            instead of at the steps, interpolated within the steps. Defaults to None.
+        dense_output (bool, optional): if True, return the continuous solution as a `DenseOutput`,
+            and t_eval is ignored. Defaults to False.
+        events (Events | Sequence[(T, Y, Any) -> Number], optional): event functions g(t, y, *args), 
+            whose zeros are located within the steps (the integration stops at the first zero of a terminal one), 
+            see `Events`. Defaults to None.
+
+    Raises:
+        Warning: raised when the step size underflows.
+
+    Returns:
+        Tuple[List[T], List[Y]] | DenseOutput: (ts, ys), or the continuous solution if dense_output, 
+            and with events: (ts, ys, t_events, y_events) with the zeros of each event function 
+            (the attributes t_events and y_events of the continuous solution)
+    """
+    recorder = _recorder(bounds[0], y0, t_eval, dense_output)
+    events = _as_events(events)
+    return _collect(_iter_Radau(f, y0, bounds, args, dt, TOL, atol, dt_max, jac, jac_sparsity, recorder, events), 
+        y0, recorder, events)
+
+def _iter_Radau(
+    f: Func[T, Y], y0: Y, bounds: Tuple[T, T], args: Tuple[Any] = (),
+    dt: Optional[T] = None, TOL: Y = 1e-6, atol: Union[None, Y, Sequence[Number]] = None,
+    dt_max: Optional[T] = None,
+    jac: Optional[Callable[..., Any]] = None, jac_sparsity: Any = None,
+    recorder: Optional["_StepRecorder"] = None, events: Optional["Events"] = None
+    ) -> Iterator[Tuple[T, Y]]:
+    """The steps (t, y) of `solve_IVP_Radau`, one at a time"""
+    F, F_args, y, scalar, atol, J_of, newton_TOL = _implicit_setup(f, y0, args, TOL, atol, jac, jac_sparsity)
+    n = len(y)
+    t, t_end = bounds
+    yield t, y0
+    if events is not None:
+        events._start(t, y, args, scalar)
+    accepted = 0
+    f_0 = F(t, y, *F_args)
+    if dt is None:
+        dt = _initial_dt(F, F_args, t, y, f_0, 3, TOL, atol)
+    J = J_of(t, y, f_0)
+    current_jac = True
+    LU_real = LU_complex = None
+    Q = None    # the collocation polynomial of the last step
+    dt_old = error_norm_old = None
+    step_rejected = False
+    rejected = iterations = 0
+    while t < t_end:
+        if recorder is not None:
+            recorder.begin(t, y, None)
+        if dt_max is not None and dt > dt_max:
+            dt = dt_max
+            LU_real = None
+        last = t + dt >= t_end
+        if last and t_end - t != dt:
+            dt = t_end - t
+            LU_real = None
+        if t + dt == t:
+            raise Warning(f"Step size underflow at t = {t}")
+        t_next = t_end if last else t + dt
+        if Q is None:
+            Z_0 = [[0.] * n for _ in range(3)]
+        else:   # extrapolated from the last step
+            Z_0 = [[theta * (Q0_k + theta * (Q1_k + theta * Q2_k)) - Q0_k - Q1_k - Q2_k
+                for Q0_k, Q1_k, Q2_k in zip(*Q)]
+                for theta in (1 + dt * c_i / dt_old for c_i in _RADAU_C)]
+        scale = [atol_k + TOL * abs(y_k) for atol_k, y_k in zip(atol, y)]
+        while True:
+            if LU_real is None:
+                LU_real = lu_factor(_shifted(J, _RADAU_MU_REAL / dt, 1.))
+                LU_complex = lu_factor(_shifted(J, _RADAU_MU_COMPLEX / dt, 1.))
+            converged, n_iter, Z, rate = _Radau_Newton(
+                F, F_args, t, y, dt, Z_0, scale, newton_TOL, LU_real, LU_complex)
+            iterations += n_iter
+            if converged or current_jac:
+                break
+            J = J_of(t, y, f_0)
+            current_jac = True
+            LU_real = None
+        if not converged:
+            rejected += 1
+            step_rejected = True
+            dt *= 0.5
+            LU_real = None
+            continue
+
+        y_next = [y_k + Z_k for y_k, Z_k in zip(y, Z[2])]
+        ZE = [sum(E_i * Z_ik for E_i, Z_ik in zip(_RADAU_E, Z_k)) / dt for Z_k in zip(*Z)]
+        error = lu_solve(LU_real, [f_k + ZE_k for f_k, ZE_k in zip(f_0, ZE)])
+        error_norm = _error_norm(error, y, y_next, atol, TOL)
+        if step_rejected and error_norm > 1:  # the estimate is filtered again for the stiff components
+            error = lu_solve(LU_real, [f_k + ZE_k for f_k, ZE_k in zip(
+                F(t, [y_k + e_k for y_k, e_k in zip(y, error)], *F_args), ZE)])
+            error_norm = _error_norm(error, y, y_next, atol, TOL)
+        safety = 0.9 * (2 * _RADAU_NEWTON_MAXITER + 1) / (2 * _RADAU_NEWTON_MAXITER + n_iter)
+        if error_norm > 1:
+            rejected += 1
+            step_rejected = True
+            dt *= max(0.2, safety * _Radau_factor(dt, dt_old, error_norm, error_norm_old))
+            LU_real = None
+            continue
+
+        recompute_jac = n_iter > 2 and rate > 1e-3
+        factor = min(10., safety * _Radau_factor(dt, dt_old, error_norm, error_norm_old))
+        if not recompute_jac and factor < 1.2:
+            factor = 1.
+        else:
+            LU_real = None
+        Q = [[sum(Z_ik * P_ij for Z_ik, P_ij in zip(Z_k, P_j)) for Z_k in zip(*Z)] for P_j in zip(*_RADAU_P)]
+        accepted += 1
+        if events is not None:
+            stop = events._step(t, y, t_next, y_next, lambda: (_Radau_segment, (Q,)))
+            if stop is not None:
+                t_e, y_e = stop
+                yield t_e, y_e[0] if scalar else y_e
+                if recorder is not None:
+                    recorder.end_at(t_e, y_e, t_next, y_next, _Radau_segment, (Q,))
+                break
+        yield t_next, y_next[0] if scalar else y_next
+        if recorder is not None:
+            recorder.end(t_next, y_next, _Radau_segment, (Q,))
+        t = t_next
+        y = y_next
+        f_0 = F(t, y, *F_args)
+        if recompute_jac:
+            J = J_of(t, y, f_0)
+            current_jac = True
+        else:
+            current_jac = False
+        dt_old = dt
+        error_norm_old = error_norm
+        dt *= factor
+        step_rejected = False
+
+    record("solve_IVP_Radau", accepted=accepted, rejected=rejected, iterations=iterations,
+        matrix_size=(n, n))
+    if recorder is not None:
+        recorder.finish(F, F_args, events is not None and events.terminated is not None)
+
+_ROSENBROCK_D = 1 / (2 + 2 ** 0.5)
+_ROSENBROCK_E32 = 6 + 2 ** 0.5
+
+def _Rosenbrock_segment(theta: float, dt: T, y0: List[Number], y1: List[Number],
+        k1: List[Number], k2: List[Number]) -> List[Number]:
+    """Continuous extension of a step of the Rosenbrock-W method of `solve_IVP_Rosenbrock`"""
+    w1 = theta * (1 - theta) / (1 - 2 * _ROSENBROCK_D) * dt
+    w2 = theta * (theta - 2 * _ROSENBROCK_D) / (1 - 2 * _ROSENBROCK_D) * dt
+    return [y0_k + w1 * k1_k + w2 * k2_k for y0_k, k1_k, k2_k in zip(y0, k1, k2)]
+
+@instrumented
+def solve_IVP_Rosenbrock(
+    f: Func[T, Y], y0: Y = 0, bounds: Tuple[T, T] = (0, 1),
+    args: Tuple[Any] = (),
+    dt: Optional[T] = None, TOL: Y = 1e-3, atol: Union[None, Y, Sequence[Number]] = None,
+    dt_max: Optional[T] = None,
+    jac: Optional[Callable[..., Any]] = None, jac_sparsity: Any = None,
+    t_eval: Optional[Sequence[T]] = None, dense_output: bool = False,
+    events: Union[None, "Events", Sequence[Callable[..., Number]]] = None
+    ) -> Union[Tuple[List[T], List[Y]], DenseOutput]:
+    """Solve the stiff IVP ODE problem y' = f(t, y) with initial condition y(t_0) = y_0
+        using the Rosenbrock-W method of order 2(3) of Shampine and Reichelt (MATLAB's ode23s).
+
+    Each step solves 3 linear systems with the matrix W = I - d dt J and no iterations.
+    Since it is a W-method, the order 2 holds for any approximation J of the Jacobian,
+    but its error estimate needs an accurate one: J (and df/dt, by a forward difference) 
+    is evaluated once per step and reused when the step is rejected.
+    Unlike `solve_IVP_BDF` and `solve_IVP_Radau`, J is not kept across the steps 
+    (with a stale J, the error estimate lets inaccurate steps through).
+    The evaluation at the end of a step is reused by the next one (3 evaluations of f per step, and J).
+    Without jac, J costs n more evaluations of f per step (fewer with jac_sparsity), 
+    so for large systems pass jac, or prefer `solve_IVP_BDF` or `solve_IVP_Radau`.
+    It is best suited to low accuracies (the default TOL is 1e-3).
+
+    TypeVars:
+        T = TypeVar("T", bound=Number)
+        Y = TypeVar("Y", Number, List[Number])
+        Func = (T, Y, Any) -> Y
+    Args:
+        f (Func[T, Y], Y]): The function f in y' = f(t, y),
+            with first parametre one be the parametre of the system
+            and the second be a number or a list of number representing the function value.
+        y0 (Y, optional): Initial value y(t_0). Defaults to 0.
+        bounds (Tuple[T, T], optional): The range of parametres of the system. Defaults to (0, 1).
+        args (Tuple[Any], optional): Additional args to be passed to f (and jac). Defaults to ().
+        dt (T, optional): Initial step size. Defaults to None (estimated).
+        TOL (Y, optional): relative tolerance. Defaults to 1e-3.
+        atol (Y | Sequence[Number], optional): absolute tolerance. Defaults to None (TOL).
+        dt_max (T | None, optional): Max step size. Defaults to None.
+        jac ((T, Y, Any) -> Number | Matrix | List[List[Number]], optional): the Jacobian df/dy.
+            Defaults to None, i.e. forward differences (see `Differentiation.jacobian`).
+        jac_sparsity (Matrix | List[List[Any]], optional): the sparsity pattern of df/dy
+            for the finite differences. Defaults to None.
+        t_eval (Sequence[T], optional): if given, the solution is returned at these points (in the bounds)
+            instead of at the steps, interpolated within the steps. Defaults to None.
+        dense_output (bool, optional): if True, return the continuous solution as a `DenseOutput`,
+            and t_eval is ignored. Defaults to False.
+        events (Events | Sequence[(T, Y, Any) -> Number], optional): event functions g(t, y, *args), 
+            whose zeros are located within the steps (the integration stops at the first zero of a terminal one), 
+            see `Events`. Defaults to None.
+
+    Raises:
+        Warning: raised when the step size underflows.
+
+    Returns:
+        Tuple[List[T], List[Y]] | DenseOutput: (ts, ys), or the continuous solution if dense_output, 
+            and with events: (ts, ys, t_events, y_events) with the zeros of each event function 
+            (the attributes t_events and y_events of the continuous solution)
+    """
+    recorder = _recorder(bounds[0], y0, t_eval, dense_output)
+    events = _as_events(events)
+    return _collect(_iter_Rosenbrock(f, y0, bounds, args, dt, TOL, atol, dt_max, jac, jac_sparsity, recorder, events), 
+        y0, recorder, events)
+
+def _iter_Rosenbrock(
+    f: Func[T, Y], y0: Y, bounds: Tuple[T, T], args: Tuple[Any] = (),
+    dt: Optional[T] = None, TOL: Y = 1e-3, atol: Union[None, Y, Sequence[Number]] = None,
+    dt_max: Optional[T] = None,
+    jac: Optional[Callable[..., Any]] = None, jac_sparsity: Any = None,
+    recorder: Optional["_StepRecorder"] = None, events: Optional["Events"] = None
+    ) -> Iterator[Tuple[T, Y]]:
+    """The steps (t, y) of `solve_IVP_Rosenbrock`, one at a time"""
+    F, F_args, y, scalar, atol, J_of, _ = _implicit_setup(f, y0, args, TOL, atol, jac, jac_sparsity)
+    n = len(y)
+    d, e32 = _ROSENBROCK_D, _ROSENBROCK_E32
+    t, t_end = bounds
+    yield t, y0
+    if events is not None:
+        events._start(t, y, args, scalar)
+    accepted = 0
+    f_0 = F(t, y, *F_args)
+    if dt is None:
+        dt = _initial_dt(F, F_args, t, y, f_0, 2, TOL, atol)
+    J = None
+    step_rejected = False
+    rejected = 0
+    while t < t_end:
+        if recorder is not None:
+            recorder.begin(t, y, None)
+        if J is None:
+            J = J_of(t, y, f_0)
+            delta = _EPS ** 0.5 * max(1., abs(t))
+            f_t = [(f1_k - f0_k) / delta for f0_k, f1_k in zip(f_0, F(t + delta, y, *F_args))]
+        if dt_max is not None:
+            dt = min(dt, dt_max)
+        last = t + dt >= t_end
+        if last:
+            dt = t_end - t
+        if t + dt == t:
+            raise Warning(f"Step size underflow at t = {t}")
+        LU = lu_factor(_shifted(J, 1., d * dt))
+        dt_d_f_t = [d * dt * f_t_k for f_t_k in f_t]
+        k1 = lu_solve(LU, [f_k + v_k for f_k, v_k in zip(f_0, dt_d_f_t)])
+        f_1 = F(t + 0.5 * dt, [y_k + 0.5 * dt * k1_k for y_k, k1_k in zip(y, k1)], *F_args)
+        k2 = [v_k + k1_k for v_k, k1_k in zip(lu_solve(LU, [f1_k - k1_k for f1_k, k1_k in zip(f_1, k1)]), k1)]
+        y_next = [y_k + dt * k2_k for y_k, k2_k in zip(y, k2)]
+        f_2 = F(t + dt, y_next, *F_args)
+        k3 = lu_solve(LU, [f2_k - e32 * (k2_k - f1_k) - 2 * (k1_k - f0_k) + v_k
+            for f0_k, f1_k, f2_k, k1_k, k2_k, v_k in zip(f_0, f_1, f_2, k1, k2, dt_d_f_t)])
+        error = [dt / 6 * (k1_k - 2 * k2_k + k3_k) for k1_k, k2_k, k3_k in zip(k1, k2, k3)]
+        error_norm = _error_norm(error, y, y_next, atol, TOL)
+
+        if error_norm > 1:
+            rejected += 1
+            step_rejected = True
+            dt *= max(0.2, 0.9 * error_norm ** (-1 / 3))
+            continue
+        t_next = t_end if last else t + dt
+        accepted += 1
+        if events is not None:
+            stop = events._step(t, y, t_next, y_next, lambda: (_Rosenbrock_segment, (k1, k2)))
+            if stop is not None:
+                t_e, y_e = stop
+                yield t_e, y_e[0] if scalar else y_e
+                if recorder is not None:
+                    recorder.end_at(t_e, y_e, t_next, y_next, _Rosenbrock_segment, (k1, k2))
+                break
+        yield t_next, y_next[0] if scalar else y_next
+        if recorder is not None:
+            recorder.end(t_next, y_next, _Rosenbrock_segment, (k1, k2))
+        t = t_next
+        y = y_next
+        f_0 = f_2
+        J = None
+        factor = 5. if error_norm == 0 else min(5., 0.9 * error_norm ** (-1 / 3))
+        if step_rejected:
+            factor = min(factor, 1.)
+        dt *= factor
+        step_rejected = False
+
+    record("solve_IVP_Rosenbrock", accepted=accepted, rejected=rejected, matrix_size=(n, n))
+    if recorder is not None:
+        recorder.finish(F, F_args, events is not None and events.terminated is not None)
+
+class EnsembleResult(NamedTuple):
+    """Result of `solve_IVP_ensemble`: the states of all the members at the output times ts,
+        in the flat array ys with ys[(i * len(ts) + k) * n + j] the component j at ts[k] of the member i,
+        for shape = (members, len(ts), n)
+    """
+    ts: array
+    ys: array
+    shape: Tuple[int, int, int]
+
+    def trajectory(self, i: int) -> List[List[float]]:
+        """The states of the member i at ts"""
+        _, K, n = self.shape
+        start = i * K * n
+        return [self.ys[start + k * n: start + (k + 1) * n].tolist() for k in range(K)]
+
+def _ensemble_stages(F: Callable, ts: List[T], dts: List[T], ys: List[List[Number]], s_0s: List[List[Number]],
+        ps: List[tuple], a_terms: List[List[Tuple[int, Number]]], c: List[Number]
+        ) -> Tuple[List[List[List[Number]]], List[List[Number]]]:
+    """The stages of an explicit Runge-Kutta step of each member, with a single call of F per stage.
+    Returns (the stages of each member, the state of the last stage of each member)
+    """
+    s = [[s_0] for s_0 in s_0s]
+    y_stages = ys
+    for a_i, c_i in zip(a_terms, c):
+        y_stages = [_combine(y, dt, a_i, s_m) for y, dt, s_m in zip(ys, dts, s)]
+        for s_m, s_i in zip(s, F([t + c_i * dt for t, dt in zip(ts, dts)], y_stages, ps)):
+            s_m.append(s_i)
+    return s, y_stages
+
+def _ensemble_output(ys_output: array, i: int, n: int, t_output: List[T], k_output: List[int],
+        t_0: T, t_1: T, y_0: List[Number], y_1: List[Number],
+        interpolant: Optional[Callable[..., List[Number]]], data: tuple) -> None:
+    """Write the outputs of the member i within its step [t_0, t_1]"""
+    K = len(t_output)
+    k = k_output[i]
+    dt = t_1 - t_0
+    while k < K and t_output[k] <= t_1:
+        t = t_output[k]
+        y = y_1 if t == t_1 else interpolant((t - t_0) / dt, dt, y_0, y_1, *data)
+        start = (i * K + k) * n
+        ys_output[start: start + n] = array("d", y)
+        k += 1
+    k_output[i] = k
+
+def _solve_ensemble_shard(task: tuple) -> Tuple[array, int, int]:
+    """Integrate a part of an ensemble, see `solve_IVP_ensemble`
+        (at the top level of the module to be sent to a process pool).
+    Returns (ys, accepted steps, rejected steps)
+    """
+    f, vectorized, scalar, y0s, params, bounds, tableau, N, dt, TOL, atol, dt_max, t_output = task
+    if vectorized and scalar:
+        def F(ts, ys, ps):
+            return [[y] for y in f(ts, [y[0] for y in ys], ps)]
+    elif vectorized:
+        F = f
+    elif scalar:
+        def F(ts, ys, ps):
+            return [[f(t, y[0], *p)] for t, y, p in zip(ts, ys, ps)]
+    else:
+        def F(ts, ys, ps):
+            return [f(t, y, *p) for t, y, p in zip(ts, ys, ps)]
+    ys = [[y0] for y0 in y0s] if scalar else [list(y0) for y0 in y0s]
+    m, n, K = len(ys), len(ys[0]), len(t_output)
+    a, b, c, e, order, error_order, fsal, dense = tableau
+    a_terms = [[(j, a_ij) for j, a_ij in enumerate(a_i) if a_ij] for a_i in a]
+    b_terms = [(j, b_j) for j, b_j in enumerate(b) if b_j]
+    d_terms = None if dense is None else [(j, d_j) for j, d_j in enumerate(dense) if d_j]
+
+    t_0, t_end = bounds
+    ys_output = array("d", bytes(8 * m * K * n))
+    k_0 = 0
+    while k_0 < K and t_output[k_0] == t_0:
+        k_0 += 1
+    for i, y in enumerate(ys):
+        for k in range(k_0):
+            ys_output[(i * K + k) * n: (i * K + k + 1) * n] = array("d", y)
+    k_output = [k_0] * m
+    s_0s = F([t_0] * m, ys, params)
+
+    if e is None:   # constant steps, shared by all the members
+        dt = (t_end - t_0) / N
+        for step in range(N):
+            t = t_0 + step * dt
+            t_next = t_end if step == N - 1 else t + dt
+            dt_step = t_next - t
+            s, _ = _ensemble_stages(F, [t] * m, [dt_step] * m, ys, s_0s, params, a_terms, c)
+            ys_next = [_combine(y, dt_step, b_terms, s_m) for y, s_m in zip(ys, s)]
+            # f at the end of the step, for the next step and the cubic Hermite interpolant
+            if step < N - 1 or k_output[0] < K and t_output[k_output[0]] < t_next:
+                s_0s = F([t_next] * m, ys_next, params)
+            for i in range(m):
+                if k_output[i] < K and t_output[k_output[i]] <= t_next:
+                    _ensemble_output(ys_output, i, n, t_output, k_output, t, t_next, ys[i], ys_next[i],
+                        _Hermite_segment, (s[i][0], s_0s[i]))
+            ys = ys_next
+        return ys_output, N * m, 0
+
+    e_terms = [(j, e_j) for j, e_j in enumerate(e) if e_j]
+    exponent = -1 / (error_order + 1)
+    # without a native continuous extension, the steps are also limited 
+    # by the error of the cubic Hermite interpolant (from the second step), as in `_iter_embedded`
+    hermite_control = d_terms is None and any(t_0 < t < t_end for t in t_output)
+    previous = [None] * m   # (dt, y) of the last step of each member
+    ts = [t_0] * m
+    if dt is None:
+        dts = _initial_dts(lambda ts, ys: F(ts, ys, params), ts, ys, s_0s, order, TOL, atol)
+    else:
+        dts = [dt] * m
+    step_rejected = [False] * m
+    accepted = rejected = 0
+    active = list(range(m)) if t_0 < t_end else []
+    while active:
+        ts_a, dts_a, last_a = [], [], []
+        for i in active:
+            t, dt = ts[i], dts[i]
+            if dt_max is not None:
+                dt = min(dt, dt_max)
+            last = t + dt >= t_end
+            if last:
+                dt = t_end - t
+            if t + dt == t:
+                raise Warning(f"Step size underflow at t = {t} for the member {i}")
+            ts_a.append(t)
+            dts_a.append(dt)
+            last_a.append(last)
+        ys_a = [ys[i] for i in active]
+        s, y_stages = _ensemble_stages(F, ts_a, dts_a, ys_a, [s_0s[i] for i in active],
+            [params[i] for i in active], a_terms, c)
+        candidates = []     # the steps within the tolerance
+        for i, t, dt, last, y, s_m, y_stage in zip(active, ts_a, dts_a, last_a, ys_a, s, y_stages):
+            y_next = y_stage if fsal else _combine(y, dt, b_terms, s_m)
+            error_norm = _error_norm(_combine([0.] * n, dt, e_terms, s_m), y, y_next, atol, TOL)
+            if error_norm > 1:
+                rejected += 1
+                step_rejected[i] = True
+                dts[i] = dt * max(0.2, 0.9 * error_norm**exponent)
+                continue
+            candidates.append((i, t, dt, t_end if last else t + dt, last, y, s_m, y_next, error_norm))
+        if hermite_control and candidates:
+            if fsal:
+                f_1s = [s_m[-1] for *_, s_m, _, _ in candidates]
             else:
-                if retry:
-                    dt /= 2
+                f_1s = F([t_next for _, _, _, t_next, *_ in candidates], [y_next for *_, y_next, _ in candidates], 
+                    [params[i] for i, *_ in candidates])
+        pending = []    # the accepted steps waiting for f at their end
+        for candidate, (i, t, dt, t_next, last, y, s_m, y_next, error_norm) in enumerate(candidates):
+            factor = 5. if error_norm == 0 else min(5., 0.9 * error_norm**exponent)
+            if hermite_control:
+                f_1 = f_1s[candidate]
+                interpolation_norm = 0. if previous[i] is None else _error_norm(
+                    _Hermite_error(dt, y, y_next, s_m[0], f_1, *previous[i]), y, y_next, atol, TOL)
+                if interpolation_norm > 1:
+                    rejected += 1
+                    step_rejected[i] = True
+                    dts[i] = dt * max(0.2, 0.9 * interpolation_norm**-0.25)
+                    continue
+                if interpolation_norm > 0:
+                    factor = min(factor, 0.9 * interpolation_norm**-0.25)
+            accepted += 1
+            if step_rejected[i]:   # no growth right after a rejection
+                factor = min(factor, 1.)
+            dts[i] = dt * factor
+            step_rejected[i] = False
+            ts[i] = t_next
+            ys[i] = y_next
+            s_0s[i] = s_m[-1] if fsal else None
+            if hermite_control:
+                previous[i] = (dt, y)
+                s_0s[i] = f_1
+                if k_output[i] < K and t_output[k_output[i]] <= t_next:
+                    _ensemble_output(ys_output, i, n, t_output, k_output, t, t_next, y, y_next,
+                        _Hermite_segment, (s_m[0], f_1))
+                continue
+            k = k_output[i]
+            if k < K and t_output[k] <= t_next:
+                if d_terms is not None:
+                    difference = [y1_k - y0_k for y0_k, y1_k in zip(y, y_next)]
+                    r3 = [dt * s_k - d_k for s_k, d_k in zip(s_m[0], difference)]
+                    r4 = [d_k - dt * s_k - r3_k for d_k, s_k, r3_k in zip(difference, s_m[-1], r3)]
+                    _ensemble_output(ys_output, i, n, t_output, k_output, t, t_next, y, y_next,
+                        _Dormand_Prince_segment, (r3, r4, _combine([0.] * n, dt, d_terms, s_m)))
+                elif fsal or t_output[k] == t_next:
+                    _ensemble_output(ys_output, i, n, t_output, k_output, t, t_next, y, y_next,
+                        _Hermite_segment, (s_m[0], s_m[-1] if fsal else None))
                 else:
-                    dt = _next_dt(dt, error_y_rel, 4, TOL, dt_max)
-                    retry = True
-        
-    return t_output, y_output
+                    pending.append((i, t, y, s_m[0]))
+                    continue
+            if not fsal and not last:
+                pending.append((i, None, None, None))
+        if pending:
+            f_1s = F([ts[i] for i, *_ in pending], [ys[i] for i, *_ in pending], [params[i] for i, *_ in pending])
+            for (i, t, y, f_0), f_1 in zip(pending, f_1s):
+                s_0s[i] = f_1
+                if t is not None:
+                    _ensemble_output(ys_output, i, n, t_output, k_output, t, ts[i], y, ys[i],
+                        _Hermite_segment, (f_0, f_1))
+        active = [i for i in active if ts[i] < t_end]
+    return ys_output, accepted, rejected
+
+def solve_IVP_ensemble(
+    f: Callable[..., Any], y0s: Sequence[Y], params: Optional[Sequence[Any]] = None,
+    bounds: Tuple[T, T] = (0, 1), method: Union[str, EmbeddedRK] = "DP54", vectorized: bool = False,
+    dt: Optional[T] = None, TOL: Number = 1e-6, atol: Union[None, Number, Sequence[Number]] = None,
+    dt_max: Optional[T] = None, N: int = 100, t_eval: Optional[Sequence[T]] = None,
+    workers: Optional[int] = None, chunk_size: Optional[int] = None
+    ) -> EnsembleResult:
+    """Solve the IVP ODE problem y' = f(t, y, *p) for an ensemble of initial values y0 and parametres p,
+        advancing all the members together: each stage of a step is one call of f on the whole batch
+        when vectorized.
 
-def _next_dt(dt: T, error_rel: Y, p: int, TOL: Y, dt_max: Optional[T] = None) -> T:
-    """Generate next dt in RK embedded pair
+    With an adaptive method, each member has its own step size and error control,
+    and the members which reached the end of bounds are left out of the batch.
+    With a constant step method ("Euler", "Midpoint", "Trapezoid", "RK4"), the N steps are shared.
+    The states within the steps are interpolated at t_eval
+    (with the native continuous extension of "DP54" and "Tsit5", else the cubic Hermite interpolant, 
+    whose error then also limits the steps, see `EmbeddedRK`).
 
+    TypeVars:
+        T = TypeVar("T", bound=Number)
+        Y = TypeVar("Y", Number, List[Number])
     Args:
-        dt (T): The last dt
-        error_rel (Y): estimated relative error
-        p (int): the order of the solver
-        TOL (T): tolerance
+        f (Callable): f(t, y, *p) -> y' (the f of `solve_IVP_explicit`),
+            or f(ts, ys, ps) -> [f(t, y, *p) for t, y, p in zip(ts, ys, ps)] if vectorized.
+        y0s (Sequence[Y]): the initial value of each member,
+            or a single one [y0] for all the members (given by params).
+        params (Sequence[Any], optional): the args of each member (a tuple, else a single arg),
+            or a single one for all the members. Defaults to None (no args).
+        bounds (Tuple[T, T], optional): The range of parametres of the system. Defaults to (0, 1).
+        method (str | EmbeddedRK, optional): one of SUPPORTED_TABLEAUS, SUPPORTED_CONST_STEP_METHODS,
+            or an `EmbeddedRK`. Defaults to "DP54".
+        vectorized (bool, optional): whether f is called on the batch. Defaults to False.
+        dt (T, optional): Initial step size of the adaptive methods. Defaults to None (estimated for each member).
+        TOL (Number, optional): relative tolerance. Defaults to 1e-6.
+        atol (Number | Sequence[Number], optional): absolute tolerance. Defaults to None (TOL).
+        dt_max (T, optional): Max step size. Defaults to None.
+        N (int, optional): The number of steps of the constant step methods. Defaults to 100.
+        t_eval (Sequence[T], optional): the output times, in bounds. Defaults to None (the end of bounds).
+        workers (int, optional): the number of processes the ensemble is shared between,
+            None or 1 to integrate in this process. f and params must be picklable then. Defaults to None.
+        chunk_size (int, optional): the number of members per task of the process pool.
+            Defaults to None (4 tasks per process).
+
+    Raises:
+        ValueError: raised when the numbers of y0s and params differ, when the method is unknown,
+            or when t_eval is not in bounds.
+        Warning: raised when the step size of a member underflows.
 
     Returns:
-        T: next dt
+        EnsembleResult: (ts, ys, shape) with the states in a flat array, see `EnsembleResult`
     """
-    if error_rel:
-        K = 0.8 * (TOL /error_rel)**(1/(p + 1))
+    y0s = list(y0s)
+    params = [()] if params is None else [p if isinstance(p, tuple) else (p,) for p in params]
+    m = max(len(y0s), len(params))
+    if len(y0s) == 1:
+        y0s *= m
+    if len(params) == 1:
+        params *= m
+    if len(y0s) != m or len(params) != m:
+        raise ValueError("y0s and params should be of same length (or of length 1).")
+    if isinstance(method, str):
+        tableau = _TABLEAUS.get(method.lower()) or _CONST_STEP_TABLEAUS.get(method.lower())
+        if tableau is None:
+            raise ValueError(f"method {method} not supported. Should be one of "
+                f"{list(SUPPORTED_TABLEAUS.keys()) + sorted(SUPPORTED_CONST_STEP_METHODS)}")
     else:
-        K = 2
-    if dt_max is None:
-        return K * dt
+        tableau = method
+    t_0, t_end = bounds
+    t_output = [t_end] if t_eval is None else sorted(t_eval)
+    if t_output and not t_0 <= t_output[0] <= t_output[-1] <= t_end:
+        raise ValueError("t_eval should be in the integration interval.")
+    scalar = isinstance(y0s[0], Number) if m else True
+    n = 1 if scalar or not m else len(y0s[0])
+    if atol is None:
+        atol = TOL
+    atol = [atol] * n if isinstance(atol, Number) else list(atol)
+
+    def task(start, stop):
+        return (f, vectorized, scalar, y0s[start:stop], params[start:stop], bounds, tableau, N, dt, TOL, atol,
+            dt_max, t_output)
+
+    ys = array("d")
+    accepted = rejected = 0
+    if m and workers is not None and workers > 1:
+        if chunk_size is None:
+            chunk_size = -(-m // (4 * workers))
+        with ProcessPoolExecutor(workers) as executor:
+            for ys_part, accepted_part, rejected_part in executor.map(
+                    _solve_ensemble_shard, [task(start, min(start + chunk_size, m)) for start in range(0, m, chunk_size)]):
+                ys.extend(ys_part)
+                accepted += accepted_part
+                rejected += rejected_part
+    elif m:
+        ys, accepted, rejected = _solve_ensemble_shard(task(0, m))
+    record("solve_IVP_ensemble", accepted=accepted, rejected=rejected)
+    return EnsembleResult(array("d", t_output), ys, (m, len(t_output), n))
+
+def iter_IVP(
+    f: Func[T, Y], y0: Y = 0, bounds: Tuple[T, T] = (0, 1),
+    method: Union[str, Callable[[Func[T, Y], T, T, Y, Any], Y]] = "RKF45",
+    args: Tuple[Any] = (),
+    stride: int = 1, callback: Optional[Callable[[T, Y], Any]] = None,
+    **kwargs) -> Iterator[Tuple[T, Y]]:
+    """Solve the IVP ODE problem y' = f(t, y) with initial condition y(t_0) = y_0 as `solve_IVP_explicit`,
+        but yield the steps (t, y) as they are computed instead of returning them all,
+        so that the memory does not grow with the number of steps.
+
+        for t, y in iter_IVP(f, y0, (0, 1e4), method="RK4", N=10**8, stride=1000):
+            ...
+
+    TypeVars:
+        T = TypeVar("T", bound=Number)
+        Y = TypeVar("Y", Number, List[Number])
+        Func[T, Y] = (T, Y, Any) -> Y
+    Args:
+        f (Func[T, Y], Y]): The function f in y' = f(t, y),
+            with first parametre one be the parametre of the system
+            and the second be a number or a list of number representing the function value.
+        y0 (Y, optional): Initial value y(t_0). Defaults to 0.
+        bounds (Tuple[T, T], optional): The range of parametres of the system. Defaults to (0, 1).
+        method (str | (Func[T, Y], T, T, Y, Any) -> Y], optional): The method, see `solve_IVP_explicit`.
+            Defaults to "RKF45".
+        args (Tuple[Any], optional): Additional args to be passed to `f`. Defaults to ().
+        stride (int, optional): yield every stride-th step (from the initial value), and the last one.
+            Defaults to 1.
+        callback ((T, Y) -> Any, optional): called on every step (t, y), before the striding.
+            The integration stops after the step (which is yielded) when it returns a true value.
+            Defaults to None.
+        **kwargs: keyword arguments to be passed to the method, see `solve_IVP_explicit`
+            (except t_eval and dense_output). With events, the last step is the terminal event, if any, 
+            and the zeros are found in the `Events` when it is given as such.
+
+    Raises:
+        ValueError: raised when the method is unknown or stride < 1.
+        TypeError: raised when a keyword argument is not expected by the method.
+
+    Returns:
+        Iterator[Tuple[T, Y]]: the steps (t, y)
+    """
+    if stride < 1:
+        raise ValueError("stride should be a positive integer.")
+    if "events" in kwargs:
+        kwargs["events"] = _as_events(kwargs["events"])
+    if isinstance(method, str) and method.lower() in _SUPPORTED_IVP_STEP_ITERATORS:
+        steps = _SUPPORTED_IVP_STEP_ITERATORS[method.lower()](f, y0, bounds, args, **kwargs)
     else:
-        return min((dt_max, K * dt))
+        steps = _iter_const_step(f, y0, bounds, args, _const_step_method(method), **kwargs)
+    return _strided(steps, stride, callback)
+
+def _strided(steps: Iterator[Tuple[T, Y]], stride: int, callback: Optional[Callable[[T, Y], Any]]
+        ) -> Iterator[Tuple[T, Y]]:
+    """Every stride-th step and the last one, until the callback returns a true value"""
+    pending = None
+    for k, step in enumerate(steps):
+        stop = callback is not None and callback(*step)
+        if k % stride == 0 or stop:
+            pending = None
+            yield step
+        else:
+            pending = step
+        if stop:
+            steps.close()
+            return
+    if pending is not None:
+        yield pending
+
+class BinarySink:
+    """Writes the steps (t, y) of a solver to a binary file as they come,
+        as rows (t, y_0, ..., y_{n-1}) of doubles (in the native byte order), written by chunks of rows:
+
+        with BinarySink("run.bin") as sink:
+            for t, y in iter_IVP(f, y0, bounds, stride=100):
+                sink(t, y)
+        ts, ys = read_binary_sink("run.bin", len(y0))
+
+    It can also be given as the callback of `iter_IVP`, to write every step.
+
+    Attributes:
+        rows (int): the number of rows written so far (including the buffered ones)
+    """
+    def __init__(self, file: Union[str, BinaryIO], chunk_size: int = 4096):
+        """
+        Args:
+            file (str | BinaryIO): the path of the file (overwritten), or a binary file object (left open)
+            chunk_size (int, optional): the number of rows written at once. Defaults to 4096.
+        """
+        self._owned = isinstance(file, str)
+        self._file = open(file, "wb") if self._owned else file
+        self._chunk_size = chunk_size
+        self._buffer = array("d")
+        self._width = None
+        self.rows = 0
+
+    def __call__(self, t: T, y: Y) -> None:
+        """Add the row (t, y)
+
+        Raises:
+            ValueError: raised when y is not of the size of the first one.
+        """
+        width = 2 if isinstance(y, Number) else len(y) + 1
+        if self._width is None:
+            self._width = width
+        elif width != self._width:
+            raise ValueError("The states should be of same size.")
+        self._buffer.append(t)
+        if width == 2:
+            self._buffer.append(y)
+        else:
+            self._buffer.extend(y)
+        self.rows += 1
+        if self.rows % self._chunk_size == 0:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write the buffered rows"""
+        self._file.write(self._buffer.tobytes())
+        del self._buffer[:]
+
+    def close(self) -> None:
+        """Write the buffered rows and close the file if opened by the sink"""
+        self.flush()
+        if self._owned:
+            self._file.close()
+
+    def __enter__(self) -> "BinarySink":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+def read_binary_sink(file: str, n: int) -> Tuple[array, array]:
+    """Read the file written by a `BinarySink` with states of size n (1 for numbers).
+
+    Raises:
+        ValueError: raised when the file does not hold rows of n + 1 doubles.
+
+    Returns:
+        Tuple[array, array]: (ts, ys) where ys is flat, ys[k * n + j] being the component j at ts[k]
+    """
+    data = array("d")
+    with open(file, "rb") as fp:
+        data.frombytes(fp.read())
+    if len(data) % (n + 1):
+        raise ValueError(f"The file does not hold rows of {n + 1} doubles.")
+    ts = data[::n + 1]
+    del data[::n + 1]
+    return ts, data
+
+class SymplecticMethod(NamedTuple):
+    """Splitting method of the separable Hamiltonian systems dq/dt = dH/dp, dp/dt = -dH/dq 
+        with H(t, q, p) = T(p) + V(t, q): each step is a sequence of stages i, 
+        a drift q += a_i dt dq/dt then a kick p += b_i dt dp/dt (the zero coefficients being skipped).
+    Such a method is symplectic, so that the energy error stays bounded over long runs instead of drifting.
+
+    Attributes:
+        a (Tuple[float, ...]): the drift coefficients
+        b (Tuple[float, ...]): the kick coefficients
+        order (int): the order of the method
+    """
+    a: Tuple[float, ...]
+    b: Tuple[float, ...]
+    order: int
+
+    @classmethod
+    def from_composition(cls, weights: List[Number], order: int) -> "SymplecticMethod":
+        """Create the composition of velocity Verlet steps of sizes w_0 dt, w_1 dt, ... (Yoshida), 
+            the consecutive kicks being merged"""
+        a = (0.,) + tuple(weights)
+        b = tuple((w_0 + w_1) / 2 for w_0, w_1 in zip(a, tuple(weights) + (0.,)))
+        return cls(a, b, order)
+
+# kick then drift
+SymplecticEuler = SymplecticMethod((0., 1.), (1., 0.), 1)
+
+# velocity Verlet: kick, drift, kick
+Verlet = SymplecticMethod.from_composition([1.], 2)
+
+# position Verlet: drift, kick, drift
+Leapfrog = SymplecticMethod((1/2, 1/2), (1., 0.), 2)
+
+# the triple jump of Forest and Ruth, in the position Verlet form
+_TRIPLE_JUMP = 1 / (2 - 2 ** (1/3))
+ForestRuth = SymplecticMethod(
+    a=(_TRIPLE_JUMP / 2, (1 - _TRIPLE_JUMP) / 2, (1 - _TRIPLE_JUMP) / 2, _TRIPLE_JUMP / 2), 
+    b=(_TRIPLE_JUMP, 1 - 2 * _TRIPLE_JUMP, _TRIPLE_JUMP, 0.), 
+    order=4)
+
+# the triple jump in the velocity Verlet form
+Yoshida4 = SymplecticMethod.from_composition([_TRIPLE_JUMP, 1 - 2 * _TRIPLE_JUMP, _TRIPLE_JUMP], 4)
+
+# the solution A of Yoshida (1990), 7 velocity Verlet steps
+_YOSHIDA6_W = [0.784513610477557263819, 0.235573213359358133684, -1.17767998417887100695]
+Yoshida6 = SymplecticMethod.from_composition(
+    _YOSHIDA6_W + [1 - 2 * sum(_YOSHIDA6_W)] + _YOSHIDA6_W[::-1], 6)
+
+SUPPORTED_SYMPLECTIC_METHODS: Dict[str, SymplecticMethod] = {
+    "SymplecticEuler": SymplecticEuler,
+    "Verlet": Verlet,
+    "Leapfrog": Leapfrog,
+    "ForestRuth": ForestRuth,
+    "Yoshida4": Yoshida4,
+    "Yoshida6": Yoshida6
+}
+
+@instrumented
+def solve_IVP_symplectic(
+    dq: Func[T, Y], dp: Func[T, Y], q0: Y = 0, p0: Y = 0, bounds: Tuple[T, T] = (0, 1), 
+    args: Tuple[Any] = (), method: Union[str, SymplecticMethod] = "Verlet", 
+    N: int = 100, endpoint: bool = True, stride: int = 1) -> Tuple[List[T], List[Y], List[Y]]:
+    """Solve the separable Hamiltonian system dq/dt = dq(t, p), dp/dt = dp(t, q) 
+        with initial condition (q(t_0), p(t_0)) = (q_0, p_0) 
+        using a symplectic splitting method with constant step (b - a)/N.
+
+    The positions and momenta are updated in place in two buffers, and copied only for the output.
+    The force dp(t, q) is reused when no drift happened since its evaluation, 
+    e.g. "Verlet" takes 1 evaluation of dp per step (and 1 of dq), "Yoshida4" 3 and "Yoshida6" 7.
+
+    TypeVars:
+        T = TypeVar("T", bound=Number)
+        Y = TypeVar("Y", Number, List[Number])
+        Func = (T, Y, Any) -> Y
+    Args:
+        dq (Func[T, Y]): dq/dt = dH/dp as a function of (t, p), e.g. p / m
+        dp (Func[T, Y]): dp/dt = -dH/dq as a function of (t, q), i.e. the force
+        q0 (Y, optional): Initial position q(t_0). Defaults to 0.
+        p0 (Y, optional): Initial momentum p(t_0). Defaults to 0.
+        bounds (Tuple[T, T], optional): The range of parametres of the system. Defaults to (0, 1).
+        args (Tuple[Any], optional): Additional args to be passed to dq and dp. Defaults to ().
+        method (str | SymplecticMethod, optional): one of SUPPORTED_SYMPLECTIC_METHODS 
+            ("SymplecticEuler", "Verlet", "Leapfrog", "ForestRuth", "Yoshida4", "Yoshida6"), 
+            or a `SymplecticMethod`. Defaults to "Verlet".
+        N (int, optional): The number of steps in the given bounds. Defaults to 100.
+        endpoint (bool, optional): whether include the end point of bounds or not. defaults to True.
+        stride (int, optional): return every stride-th step (from the initial value), and the last one. 
+            Defaults to 1.
+
+    Raises:
+        ValueError: raised when the method is unknown or stride < 1.
+
+    Returns:
+        Tuple[List[T], List[Y], List[Y]]: (ts, qs, ps)
+    """
+    ts = []
+    qs = []
+    ps = []
+    for t, q, p in iter_IVP_symplectic(dq, dp, q0, p0, bounds, args, method, N, endpoint, stride):
+        ts.append(t)
+        qs.append(q)
+        ps.append(p)
+    return ts, qs, ps
+
+def iter_IVP_symplectic(
+    dq: Func[T, Y], dp: Func[T, Y], q0: Y = 0, p0: Y = 0, bounds: Tuple[T, T] = (0, 1), 
+    args: Tuple[Any] = (), method: Union[str, SymplecticMethod] = "Verlet", 
+    N: int = 100, endpoint: bool = True, stride: int = 1) -> Iterator[Tuple[T, Y, Y]]:
+    """`solve_IVP_symplectic`, yielding the steps (t, q, p) as they are computed, see `iter_IVP`.
+
+    Raises:
+        ValueError: raised when the method is unknown or stride < 1.
+
+    Returns:
+        Iterator[Tuple[T, Y, Y]]: the steps (t, q, p)
+    """
+    if isinstance(method, str):
+        scheme = _SYMPLECTIC_METHODS.get(method.lower())
+        if scheme is None:
+            raise ValueError(
+                f"method {method} not supported. Should be one of {list(SUPPORTED_SYMPLECTIC_METHODS.keys())}")
+    else:
+        scheme = method
+    if stride < 1:
+        raise ValueError("stride should be a positive integer.")
+    return _iter_symplectic(dq, dp, q0, p0, bounds, args, scheme, N, endpoint, stride)
+
+def _iter_symplectic(
+    dq: Func[T, Y], dp: Func[T, Y], q0: Y, p0: Y, bounds: Tuple[T, T], args: Tuple[Any], 
+    method: SymplecticMethod, N: int, endpoint: bool, stride: int) -> Iterator[Tuple[T, Y, Y]]:
+    """The steps (t, q, p) of `solve_IVP_symplectic`, one at a time"""
+    scalar = isinstance(q0, Number)
+    if scalar:
+        def velocity(t, p):
+            return [dq(t, p[0], *args)]
+        def force(t, q):
+            return [dp(t, q[0], *args)]
+        q = [q0]
+        p = [p0]
+    else:
+        def velocity(t, p):
+            return dq(t, p, *args)
+        def force(t, q):
+            return dp(t, q, *args)
+        q = list(q0)
+        p = list(p0)
+    stages = list(zip(method.a, method.b))
+    t_0, t_N = bounds
+    dt: T = (t_N - t_0) / N
+    n_steps = N if endpoint else N - 1
+
+    yield t_0, q0, p0
+    F = None    # the force at the current q, if evaluated
+    for i in range(1, n_steps + 1):
+        t: T = (i - 1) * dt + t_0
+        for a_j, b_j in stages:
+            if a_j:
+                h = a_j * dt
+                q[:] = [q_k + h * v_k for q_k, v_k in zip(q, velocity(t, p))]
+                t += h
+                F = None
+            if b_j:
+                if F is None:
+                    F = force(t, q)
+                h = b_j * dt
+                p[:] = [p_k + h * F_k for p_k, F_k in zip(p, F)]
+        if i % stride == 0 or i == n_steps:
+            t = i * dt + t_0
+            yield (t, q[0], p[0]) if scalar else (t, list(q), list(p))
+    record("solve_IVP_symplectic", accepted=n_steps)
 
 SUPPORTED_METHODS = {
     "Euler",
@@ -516,7 +2384,20 @@ SUPPORTED_METHODS = {
     "Trapezoid",
     "RK4",
     "RK23",
-    "RKF45"
+    "RKF45",
+    "DP54",
+    "BS32",
+    "Tsit5",
+    "PD87",
+    "BDF",
+    "Radau",
+    "Rosenbrock"
+}
+
+SUPPORTED_IMPLICIT_METHODS = {
+    "BDF",
+    "Radau",
+    "Rosenbrock"
 }
 
 SUPPORTED_CONST_STEP_METHODS = {
@@ -528,7 +2409,14 @@ SUPPORTED_CONST_STEP_METHODS = {
 
 SUPPORTED_VAR_STEP_METHODS = {
     "RK23",
-    "RKF45"
+    "RKF45",
+    "DP54",
+    "BS32",
+    "Tsit5",
+    "PD87",
+    "BDF",
+    "Radau",
+    "Rosenbrock"
 }
 
 _SUPPORTED_IVP_CONST_STEP_METHODS: Dict[str, Callable[[Func[T, Y], T, T, Y, Any], Y]] = {
@@ -553,6 +2441,64 @@ _SUPPORTED_IVP_VAR_STEP_METHODS: Dict[
     "rk4/5": solve_IVP_RKF45,
     "rkf4/5": solve_IVP_RKF45,
     "rk23": solve_IVP_RK23,
-    "rk2/3": solve_IVP_RK23
+    "rk2/3": solve_IVP_RK23,
+    "dp54": partial(solve_IVP_adaptive, method=DP54),
+    "dopri5": partial(solve_IVP_adaptive, method=DP54),
+    "rk45": partial(solve_IVP_adaptive, method=DP54),
+    "bs32": partial(solve_IVP_adaptive, method=BS32),
+    "tsit5": partial(solve_IVP_adaptive, method=Tsit5),
+    "pd87": partial(solve_IVP_adaptive, method=PD87),
+    "rk87": partial(solve_IVP_adaptive, method=PD87),
+    "bdf": solve_IVP_BDF,
+    "radau": solve_IVP_Radau,
+    "radau5": solve_IVP_Radau,
+    "radauiia": solve_IVP_Radau,
+    "rosenbrock": solve_IVP_Rosenbrock,
+    "rosenbrock-w": solve_IVP_Rosenbrock,
+    "ode23s": solve_IVP_Rosenbrock
 }
 
+_TABLEAUS: Dict[str, EmbeddedRK] = {name.lower(): tableau for name, tableau in SUPPORTED_TABLEAUS.items()}
+
+_SYMPLECTIC_METHODS: Dict[str, SymplecticMethod] = {
+    **{name.lower(): method for name, method in SUPPORTED_SYMPLECTIC_METHODS.items()}, 
+    "symplectic-euler": SymplecticEuler,
+    "velocity-verlet": Verlet,
+    "position-verlet": Leapfrog,
+    "forest-ruth": ForestRuth
+}
+
+_SUPPORTED_IVP_IMPLICIT_METHODS = {
+    name for name, solver in _SUPPORTED_IVP_VAR_STEP_METHODS.items()
+    if solver in (solve_IVP_BDF, solve_IVP_Radau, solve_IVP_Rosenbrock)}
+
+# the constant step methods as Butcher tableaus, for `solve_IVP_ensemble`
+_EULER = EmbeddedRK([], [1.], [], None, 1, 1)
+_MIDPOINT = EmbeddedRK([[1/2]], [0., 1.], [1/2], None, 2, 2)
+_TRAPEZOID = EmbeddedRK([[1.]], [1/2, 1/2], [1.], None, 2, 2)
+_RK4 = EmbeddedRK([[1/2], [0., 1/2], [0., 0., 1.]], [1/6, 1/3, 1/3, 1/6], [1/2, 1/2, 1.], None, 4, 4)
+_CONST_STEP_TABLEAUS: Dict[str, EmbeddedRK] = {
+    name: {_next_y_Euler: _EULER, _next_y_midpoint: _MIDPOINT, _next_y_trapezoid: _TRAPEZOID, _next_y_RK4: _RK4}[next_y]
+    for name, next_y in _SUPPORTED_IVP_CONST_STEP_METHODS.items()}
+
+_SUPPORTED_IVP_STEP_ITERATORS: Dict[str, Callable[..., Iterator[Tuple[T, Y]]]] = {
+    "rkf45": partial(_iter_embedded, tableau=RKF45, dt=1e-3, name="solve_IVP_RKF45"),
+    "rk4/5": partial(_iter_embedded, tableau=RKF45, dt=1e-3, name="solve_IVP_RKF45"),
+    "rkf4/5": partial(_iter_embedded, tableau=RKF45, dt=1e-3, name="solve_IVP_RKF45"),
+    "rk23": partial(_iter_embedded, tableau=RK23, dt=1e-3, name="solve_IVP_RK23"),
+    "rk2/3": partial(_iter_embedded, tableau=RK23, dt=1e-3, name="solve_IVP_RK23"),
+    "dp54": partial(_iter_embedded, tableau=DP54),
+    "dopri5": partial(_iter_embedded, tableau=DP54),
+    "rk45": partial(_iter_embedded, tableau=DP54),
+    "bs32": partial(_iter_embedded, tableau=BS32),
+    "tsit5": partial(_iter_embedded, tableau=Tsit5),
+    "pd87": partial(_iter_embedded, tableau=PD87),
+    "rk87": partial(_iter_embedded, tableau=PD87),
+    "bdf": _iter_BDF,
+    "radau": _iter_Radau,
+    "radau5": _iter_Radau,
+    "radauiia": _iter_Radau,
+    "rosenbrock": _iter_Rosenbrock,
+    "rosenbrock-w": _iter_Rosenbrock,
+    "ode23s": _iter_Rosenbrock
+}
@@ -1,7 +1,10 @@
 from numbers import Number
 from typing import Callable, Optional, TypeVar
 
+from .AutoDiff import Dual
 from .Differentiation import diff_f
+from ._const import _EPS
+from .Profiling import instrumented, record
 
 
 X = TypeVar("X", bound=Number)
@@ -76,6 +79,7 @@ def solve_iter(
             raise Warning(f"Max number of steps {Nmax} reached")
     return x_next
 
+@instrumented
 def solve_Newton(
     f: Callable[[X], Y], x: X = 0, 
     f_diff: Optional[Callable[[X], Y]] = None,
@@ -88,7 +92,9 @@ def solve_Newton(
         f (Callable[[X], Y]): The function to be solved
         x (X, optional): Where to start iteration. Defaults to 0.
         f_diff (Callable[[X], Y], optional): the derivative function of f. 
-            If None (default), then a numerical method is applied to calculate it (very costly).
+            If None (default), the exact derivative is computed along with f by automatic differentiation 
+            (see `AutoDiff`) when f supports dual numbers, 
+            else a numerical method is applied to calculate it (very costly).
             Note that `args` are not passed to f_diff if given.
         p (int, optional): used when the complexity of the root is p > 1.
         error (float, optional): Tolerent error of |dx|/|x|. Defaults to 0.
@@ -101,22 +107,34 @@ def solve_Newton(
     Returns:
         X: Numerical solution
     """
+    use_AD = False
     if f_diff is None:
-        f_diff = diff_f(f, 1e-6, args=args)
+        try:
+            use_AD = isinstance(f(Dual(x, 1.), *args), Dual)
+        except TypeError:   # f is not written for dual numbers, e.g. it calls math.sin
+            pass
+        if not use_AD:
+            f_diff = diff_f(f, 1e-6, args=args)
     
     def g(x):
+        if use_AD:
+            y = f(Dual(x, 1.), *args)
+            return x - p * y.value / y.grad[0]
         return x - p * f(x, *args)/f_diff(x)
 
-    for _ in range(Nmax):
+    for iteration in range(1, Nmax + 1):
         x_next = g(x)
         if abs((x_next - x) / x) <= TOL:
             break
         x = x_next
     else:
         if TOL:
+            record("solve_Newton", iterations=Nmax)
             raise Warning(f"Max number of steps {Nmax} reached")
+    record("solve_Newton", iterations=iteration)
     return x_next
 
+@instrumented
 def solve_secant(
     f: Callable[[X], Y], x0: X = 0, x1: X = 1,
     p: int = 1,
@@ -142,7 +160,7 @@ def solve_secant(
     def g(x0, x1):
         return x1 - p * (x1 - x0) * f(x1, *args) / (f(x1, *args) - f(x0, *args))
 
-    for _ in range(Nmax):
+    for iteration in range(1, Nmax + 1):
         try:
             x2 = g(x0, x1)
         except ZeroDivisionError:
@@ -152,7 +170,9 @@ def solve_secant(
                 break
     else:
         if TOL:
+            record("solve_secant", iterations=Nmax)
             raise Warning(f"Max number of steps {Nmax} reached")
+    record("solve_secant", iterations=iteration)
     return x2
 
 def solve_regula_falsi(
@@ -192,4 +212,72 @@ def solve_regula_falsi(
 
     return c
 
-# TODO: Muller, IQI and Brent
\ No newline at end of file
+@instrumented
+def solve_Brent(
+    f: Callable[[X], Y], a: X = 0, b: X = 1,
+    TOL: float = 0, Nmax: int = 100,
+    *args) -> X:
+    """Solve f(x) = 0 in [a, b] with Brent's method: inverse quadratic interpolation or secant steps,
+        falling back to bisection whenever they do not shrink the bracket fast enough,
+        so that it converges at least as surely as the bisection, and superlinearly near a simple root.
+
+    Args:
+        f (Callable[[X], Y]): The function to be solved
+        a, b (X, optional): The interval, with f(a) and f(b) of opposite signs. Defaults to 0 and 1.
+        TOL (float, optional): Tolerent error of x, added to 2 EPS |x|. Defaults to 0.
+        Nmax (int, optional): Max step. Defaults to 100.
+        *args: args to be passed to f
+
+    Raises:
+        ValueError: If f(a) and f(b) have the same sign
+        Warning: If Nmax reached
+
+    Returns:
+        X: Numerical solution
+    """
+    fa, fb = f(a, *args), f(b, *args)
+    if fa == 0:
+        return a
+    if fb == 0:
+        return b
+    if (fa > 0) == (fb > 0):
+        raise ValueError(f"f(a) and f(b) must have opposite signs, but f({a}) = {fa} and f({b}) = {fb}")
+    c, fc = b, fb
+    for iteration in range(1, Nmax + 1):
+        if (fb > 0) == (fc > 0):    # c is the other end of the bracket [b, c]
+            c, fc = a, fa
+            d = e = b - a
+        if abs(fc) < abs(fb):       # b is the best estimate
+            a, b, c = b, c, b
+            fa, fb, fc = fb, fc, fb
+        tol = 2 * _EPS * abs(b) + TOL / 2
+        m = (c - b) / 2
+        if abs(m) <= tol or fb == 0:
+            record("solve_Brent", iterations=iteration)
+            return b
+        if abs(e) >= tol and abs(fa) > abs(fb):
+            s = fb / fa
+            if a == c:  # secant
+                p = 2 * m * s
+                q = 1 - s
+            else:       # inverse quadratic interpolation
+                q = fa / fc
+                r = fb / fc
+                p = s * (2 * m * q * (q - r) - (b - a) * (r - 1))
+                q = (q - 1) * (r - 1) * (s - 1)
+            if p > 0:
+                q = -q
+            p = abs(p)
+            if 2 * p < min(3 * m * q - abs(tol * q), abs(e * q)):
+                e, d = d, p / q
+            else:
+                d = e = m
+        else:
+            d = e = m
+        a, fa = b, fb
+        b += d if abs(d) > tol else (tol if m > 0 else -tol)
+        fb = f(b, *args)
+    record("solve_Brent", iterations=Nmax)
+    raise Warning(f"Max number of steps {Nmax} reached")
+
+# TODO: Muller and IQI
\ No newline at end of file
@@ -0,0 +1,185 @@
+"""Instrumentation of the solvers: evaluation counts and timing of the user functions,
+and per-solver statistics (accepted/rejected steps, iterations, matrix sizes, peak memory).
+
+It is disabled by default, and an instrumented solver then only costs a single check per call.
+The statistics are collected within a `Profile` context:
+
+    with Profile(memory=True) as profile:
+        quad(f, 0, 1)
+        solve_IVP_RKF45(g, 1., (0, 10))
+    print(profile.summary())
+    profile["solve_IVP_RKF45"].rejected
+"""
+from functools import wraps
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import tracemalloc
+
+_active: Optional["Profile"] = None
+
+class SolverStats:
+    """Statistics of a solver within a `Profile`.
+
+    Attributes:
+        calls (int): the number of calls of the solver
+        time (float): the total time spent in the solver, in seconds
+        n_evals (int): the number of calls of the user function (the first argument of the solver).
+            A vectorized call counts once. Note that a function returned by the solver (e.g. `diff_f`)
+            keeps counting its evaluations here.
+        eval_time (float): the total time spent in the user function, in seconds
+        accepted (int): the number of accepted steps
+        rejected (int): the number of rejected steps
+        iterations (int): the number of iterations
+        matrix_sizes (List[Tuple[int, int]]): the distinct sizes of the matrices (or tableaux) involved
+        peak_memory (int): the max peak of the memory allocated during a call, in bytes (with `memory` only)
+    """
+    __slots__ = ("calls", "time", "n_evals", "eval_time", "accepted", "rejected", "iterations",
+                 "matrix_sizes", "peak_memory")
+
+    def __init__(self):
+        self.calls = 0
+        self.time = 0.
+        self.n_evals = 0
+        self.eval_time = 0.
+        self.accepted = 0
+        self.rejected = 0
+        self.iterations = 0
+        self.matrix_sizes = []
+        self.peak_memory = 0
+
+    def __repr__(self) -> str:
+        return "SolverStats({})".format(", ".join(
+            "{}={!r}".format(key, getattr(self, key)) for key in self.__slots__))
+
+class Profile:
+    """Context in which the instrumented solvers collect their statistics,
+        which are then available as profile[solver name] (or profile.solvers).
+    Nested profiles are independent: only the innermost one collects.
+
+    Attributes:
+        solvers (Dict[str, SolverStats]): the statistics of each solver called, by name
+        memory (bool): whether the peak memory is traced (with tracemalloc, which slows down the allocations)
+        time (float): the total time of the context, in seconds
+    """
+    def __init__(self, memory: bool = False):
+        self.solvers: Dict[str, SolverStats] = {}
+        self.memory = memory
+        self.time = 0.
+        self._previous = None
+        self._frames = []   # [baseline, peak] of the running solvers when tracing the memory
+        self._started_tracing = False
+
+    def __getitem__(self, name: str) -> SolverStats:
+        return self.solvers[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.solvers
+
+    def __enter__(self) -> "Profile":
+        global _active
+        self._previous = _active
+        _active = self
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        self._start = perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        global _active
+        self.time += perf_counter() - self._start
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+        _active = self._previous
+        self._previous = None
+
+    def summary(self) -> str:
+        """A table of the statistics, one row per solver"""
+        header = ("solver", "calls", "time", "n_evals", "eval_time", "accepted", "rejected", "iterations",
+                  "peak_memory")
+        rows = [header]
+        for name, stats in self.solvers.items():
+            rows.append((name, str(stats.calls), "{:.3g}".format(stats.time), str(stats.n_evals),
+                         "{:.3g}".format(stats.eval_time), str(stats.accepted), str(stats.rejected),
+                         str(stats.iterations), str(stats.peak_memory)))
+        widths = [max(len(row[i]) for row in rows) for i in range(len(header))]
+        return "\n".join("  ".join(cell.ljust(width) for cell, width in zip(row, widths)) for row in rows)
+
+    def _counted(self, f: Callable, stats: SolverStats) -> Callable:
+        def counted_f(*args, **kwargs):
+            stats.n_evals += 1
+            start = perf_counter()
+            try:
+                return f(*args, **kwargs)
+            finally:
+                stats.eval_time += perf_counter() - start
+        return counted_f
+
+    def _fold_peak(self) -> int:
+        """Update the peaks of the running solvers with the traced peak, which is then reset"""
+        peak = tracemalloc.get_traced_memory()[1]
+        for frame in self._frames:
+            frame[1] = max(frame[1], peak)
+        tracemalloc.reset_peak()
+        return peak
+
+    def _run(self, name: str, solver: Callable, args: tuple, kwargs: dict) -> Any:
+        stats = self.solvers.get(name)
+        if stats is None:
+            stats = self.solvers[name] = SolverStats()
+        stats.calls += 1
+        if args and callable(args[0]):
+            args = (self._counted(args[0], stats),) + args[1:]
+        elif callable(kwargs.get("f")):
+            kwargs["f"] = self._counted(kwargs["f"], stats)
+        tracing = self.memory and tracemalloc.is_tracing()
+        if tracing:
+            self._fold_peak()
+            self._frames.append([tracemalloc.get_traced_memory()[0], 0])
+        start = perf_counter()
+        try:
+            return solver(*args, **kwargs)
+        finally:
+            stats.time += perf_counter() - start
+            if tracing:
+                self._fold_peak()
+                baseline, peak = self._frames.pop()
+                stats.peak_memory = max(stats.peak_memory, peak - baseline)
+
+def instrumented(solver: Callable) -> Callable:
+    """Decorator of the solvers, collecting their statistics (named by the solver) in the active `Profile`.
+    Its first argument (or keyword argument f) is counted and timed if it is callable.
+    """
+    name = solver.__name__
+
+    @wraps(solver)
+    def instrumented_solver(*args, **kwargs):
+        profile = _active
+        if profile is None:
+            return solver(*args, **kwargs)
+        return profile._run(name, solver, args, kwargs)
+    return instrumented_solver
+
+def record(name: str, accepted: int = 0, rejected: int = 0, iterations: int = 0,
+        matrix_size: Optional[Tuple[int, int]] = None) -> None:
+    """Add statistics of a solver to the active `Profile`, if any.
+
+    Args:
+        name (str): the name of the solver
+        accepted (int, optional): the number of accepted steps. Defaults to 0.
+        rejected (int, optional): the number of rejected steps. Defaults to 0.
+        iterations (int, optional): the number of iterations. Defaults to 0.
+        matrix_size (Tuple[int, int], optional): the size of a matrix involved. Defaults to None.
+    """
+    profile = _active
+    if profile is None:
+        return
+    stats = profile.solvers.get(name)
+    if stats is None:
+        stats = profile.solvers[name] = SolverStats()
+    stats.accepted += accepted
+    stats.rejected += rejected
+    stats.iterations += iterations
+    if matrix_size is not None and tuple(matrix_size) not in stats.matrix_sizes:
+        stats.matrix_sizes.append(tuple(matrix_size))
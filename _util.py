@@ -1,4 +1,4 @@
-from typing import List, TypeVar
+from typing import List, Sequence, TypeVar
 
 T = TypeVar("T")
 
@@ -9,4 +9,17 @@ def _flatten(a: List[List[T]]) -> List[T]:
             a_flatten += sublist
         except TypeError:
             a_flatten.append(sublist)
-    return a_flatten
\ No newline at end of file
+    return a_flatten
+
+def _pairwise_sum(a: Sequence[T], start: int = 0, stop: int = None) -> T:
+    """Pairwise (cascade) summation of a[start:stop], with O(log n) error growth instead of O(n)"""
+    if stop is None:
+        stop = len(a)
+    n = stop - start
+    if n <= 8:
+        total = 0.
+        for i in range(start, stop):
+            total += a[i]
+        return total
+    mid = start + n // 2
+    return _pairwise_sum(a, start, mid) + _pairwise_sum(a, mid, stop)